@@ -0,0 +1,78 @@
+"""Helpers shared by the benchmarks."""
+
+import tempfile
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from src.api.dependencies import get_session
+from src.api.main import app
+from src.core.database import begin_sqlite_transactions, engine_options
+from src.models import table_registry
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the `pct` percentile of `samples` in milliseconds."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index] * 1000
+
+
+@asynccontextmanager
+async def bench_engine(
+    database_url: Optional[str] = None,
+) -> AsyncIterator[AsyncEngine]:
+    """
+    Yield an engine on a freshly created schema.
+
+    Without `database_url` a temporary SQLite file is used. A given
+    database is treated as scratch: its tables are dropped before and
+    after the run.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url = database_url or f'sqlite+aiosqlite:///{Path(tmp) / "bench.db"}'
+        engine = create_async_engine(url, **engine_options(url))
+        begin_sqlite_transactions(engine)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(table_registry.metadata.drop_all)
+            await conn.run_sync(table_registry.metadata.create_all)
+
+        try:
+            yield engine
+        finally:
+            if database_url:
+                async with engine.begin() as conn:
+                    await conn.run_sync(table_registry.metadata.drop_all)
+            await engine.dispose()
+
+
+@contextmanager
+def serve_with(engine: AsyncEngine) -> Iterator[None]:
+    """Make the app open its request sessions on `engine`."""
+
+    async def get_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+
+
+def bench_client() -> AsyncClient:
+    """Client driving the app in-process through its ASGI interface."""
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url='http://bench',
+        follow_redirects=True,
+    )
@@ -0,0 +1,139 @@
+"""
+Measure `GET /users/me` latency while a login storm is running.
+
+Each login runs an argon2 verification. With `--blocking` the verification
+runs on the event loop (the old behaviour) so both modes can be compared.
+
+Usage:
+    python -m benchmarks.login_storm --logins 200 --reads 300
+    python -m benchmarks.login_storm --logins 200 --reads 300 --blocking
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from unittest import mock
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from benchmarks.common import percentile
+from src.api.dependencies import get_session
+from src.api.main import app
+from src.models import User, table_registry
+from src.security import get_password_hash, verify_password
+from src.utils.tenants import scope_to_default_tenant
+
+EMAIL = 'bench@bench.com'
+PASSWORD = 'bench-password'
+
+
+async def _blocking_verify(clean_password: str, hashed_password: str):
+    return verify_password(clean_password, hashed_password)
+
+
+async def _login(client: AsyncClient) -> str:
+    response = await client.post(
+        '/token', data={'username': EMAIL, 'password': PASSWORD}
+    )
+    return response.json()['access_token']
+
+
+async def _login_storm(client, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_login():
+        async with semaphore:
+            await _login(client)
+
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+
+
+async def _read_me(client, token: str, reads: int) -> list[float]:
+    latencies = []
+    for _ in range(reads):
+        start = perf_counter()
+        await client.get(
+            '/users/me', headers={'Authorization': f'Bearer {token}'}
+        )
+        latencies.append(perf_counter() - start)
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Seed a user, then time reads with and without a login storm."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f'sqlite+aiosqlite:///{Path(tmp) / "bench.db"}'
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(table_registry.metadata.create_all)
+
+        async with AsyncSession(engine) as session:
+            await scope_to_default_tenant(session)
+            session.add(
+                User(email=EMAIL, password=get_password_hash(PASSWORD))
+            )
+            await session.commit()
+
+        async def get_session_override():
+            async with AsyncSession(engine, expire_on_commit=False) as s:
+                yield s
+
+        app.dependency_overrides[get_session] = get_session_override
+        patcher = mock.patch(
+            'src.api.routes.login.verify_password_async', _blocking_verify
+        )
+        if args.blocking:
+            patcher.start()
+
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport,
+                base_url='http://bench',
+                follow_redirects=True,
+            ) as client:
+                token = await _login(client)
+                idle = await _read_me(client, token, args.reads)
+
+                storm = asyncio.create_task(
+                    _login_storm(client, args.logins, args.concurrency)
+                )
+                loaded = await _read_me(client, token, args.reads)
+                await storm
+        finally:
+            if args.blocking:
+                patcher.stop()
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+    mode = 'blocking' if args.blocking else 'offloaded'
+    print(f'/users/me latency with {mode} password hashing (ms)')
+    for label, samples in (('idle', idle), ('login storm', loaded)):
+        print(
+            f'  {label:<12} p50={percentile(samples, 50):8.2f} '
+            f'p99={percentile(samples, 99):8.2f} '
+            f'mean={statistics.mean(samples) * 1000:8.2f}'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--reads', type=int, default=300)
+    parser.add_argument(
+        '--blocking',
+        action='store_true',
+        help='verify passwords on the event loop, as before',
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Show query plans and timings of the main access paths before and after
+the access-path indexes (revision b5d20e6f8a17, led by tenant_id since
+revision 2c7a4f9e0b18).
+
+The database is seeded with synthetic projects and tasks, every query is
+explained and timed without the indexes, then again with them.
+
+Usage:
+    python -m benchmarks.query_plans --projects 200 --tasks-per-project 100
+    python -m benchmarks.query_plans --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import tempfile
+import uuid
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import Index, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.models import Category, Project, Task, Tenant, User, table_registry
+
+BATCH_SIZE = 5000
+ACCESS_PATH_INDEXES = [
+    'ix_tasks_tenant_id_project_id_created_at_id',
+    'ix_tasks_category_id',
+    'ix_projects_category_id',
+    'ix_categories_active_tenant_id_created_at_id',
+]
+
+
+async def seed(conn: AsyncConnection, projects: int, tasks: int) -> dict:
+    """Insert synthetic rows and return ids used by the sample queries."""
+    tenant_id = uuid.uuid4()
+    await conn.execute(
+        insert(Tenant),
+        [{'id': tenant_id, 'name': 'bench', 'domain': 'bench'}],
+    )
+
+    user_id = uuid.uuid4()
+    await conn.execute(
+        insert(User),
+        [
+            {
+                'id': user_id,
+                'tenant_id': tenant_id,
+                'email': 'bench@bench.com',
+                'password': 'x',
+            }
+        ],
+    )
+
+    category_ids = [uuid.uuid4() for _ in range(20)]
+    await conn.execute(
+        insert(Category),
+        [
+            {
+                'id': cid,
+                'tenant_id': tenant_id,
+                'name': f'category-{i}',
+                'is_active': i % 4 != 0,
+            }
+            for i, cid in enumerate(category_ids)
+        ],
+    )
+
+    project_ids = [uuid.uuid4() for _ in range(projects)]
+    await conn.execute(
+        insert(Project),
+        [
+            {
+                'id': pid,
+                'tenant_id': tenant_id,
+                'name': f'project-{i}',
+                'created_by': user_id,
+                'category_id': category_ids[i % len(category_ids)],
+            }
+            for i, pid in enumerate(project_ids)
+        ],
+    )
+
+    rows = (
+        {
+            'id': uuid.uuid4(),
+            'tenant_id': tenant_id,
+            'title': f'task-{p}-{t}',
+            'project_id': pid,
+            'created_by': user_id,
+            'category_id': category_ids[t % len(category_ids)],
+            'is_active': t % 10 != 0,
+        }
+        for p, pid in enumerate(project_ids)
+        for t in range(tasks)
+    )
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            await conn.execute(insert(Task), batch)
+            batch = []
+    if batch:
+        await conn.execute(insert(Task), batch)
+
+    return {
+        'tenant_id': tenant_id,
+        'project_id': project_ids[0],
+        'category_id': category_ids[1],
+    }
+
+
+def sample_queries(ids: dict) -> dict:
+    """
+    Queries issued by the routes, keyed by a short description.
+
+    They run outside of a tenant-scoped session, so the tenant filter the
+    session would add is spelled out.
+    """
+    tenant_id = ids['tenant_id']
+    return {
+        'tasks by project (GET /tasks?project_id=)': select(Task)
+        .where(Task.tenant_id == tenant_id)
+        .where(Task.project_id == ids['project_id'])
+        .order_by(Task.created_at, Task.id)
+        .limit(100),
+        'tasks by category': select(Task)
+        .where(Task.tenant_id == tenant_id)
+        .where(Task.category_id == ids['category_id'])
+        .limit(100),
+        'projects by category': select(Project).where(
+            Project.tenant_id == tenant_id,
+            Project.category_id == ids['category_id'],
+        ),
+        'active categories (GET /categories)': select(Category)
+        .where(Category.tenant_id == tenant_id)
+        .where(Category.is_active == True)  # noqa: E712
+        .order_by(Category.created_at, Category.id)
+        .limit(100),
+        'login lookup': select(User).where(
+            User.tenant_id == tenant_id,
+            User.email == 'bench@bench.com',
+            User.is_active == True,  # noqa: E712
+        ),
+    }
+
+
+async def explain(conn: AsyncConnection, query) -> tuple[list[str], float]:
+    """Return the plan of `query` and the time it takes to run it."""
+    sql = str(
+        query.compile(
+            dialect=conn.dialect, compile_kwargs={'literal_binds': True}
+        )
+    )
+    prefix = (
+        'EXPLAIN QUERY PLAN'
+        if conn.dialect.name == 'sqlite'
+        else 'EXPLAIN (ANALYZE, BUFFERS)'
+    )
+    plan = await conn.execute(text(f'{prefix} {sql}'))
+    lines = [str(row[-1]) for row in plan]
+
+    start = perf_counter()
+    await conn.execute(query)
+    return lines, (perf_counter() - start) * 1000
+
+
+async def report(conn: AsyncConnection, queries: dict, label: str) -> None:
+    print(f'=== {label} ===')
+    for description, query in queries.items():
+        plan, elapsed = await explain(conn, query)
+        print(f'-- {description}: {elapsed:.2f} ms')
+        for line in plan:
+            print(f'   {line}')
+    print()
+
+
+def _indexes(names: list[str]) -> list[Index]:
+    indexes = {
+        index.name: index
+        for table in table_registry.metadata.tables.values()
+        for index in table.indexes
+    }
+    return [indexes[name] for name in names]
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = (
+            args.database_url
+            or f'sqlite+aiosqlite:///{Path(tmp) / "plans.db"}'
+        )
+        engine = create_async_engine(url)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(table_registry.metadata.drop_all)
+            await conn.run_sync(table_registry.metadata.create_all)
+            for index in _indexes(ACCESS_PATH_INDEXES):
+                await conn.run_sync(index.drop)
+            ids = await seed(conn, args.projects, args.tasks_per_project)
+
+        queries = sample_queries(ids)
+
+        async with engine.begin() as conn:
+            await conn.execute(text('ANALYZE'))
+            await report(conn, queries, 'without access-path indexes')
+
+            for index in _indexes(ACCESS_PATH_INDEXES):
+                await conn.run_sync(index.create)
+            await conn.execute(text('ANALYZE'))
+            await report(conn, queries, 'with access-path indexes')
+
+        if args.database_url:
+            async with engine.begin() as conn:
+                await conn.run_sync(table_registry.metadata.drop_all)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--tasks-per-project', type=int, default=100)
+    parser.add_argument(
+        '--database-url',
+        help='scratch database to use; its tables are dropped afterwards',
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+"""
+Measure throughput and latency of every router on a seeded database.
+
+Users, clients, categories, projects and tasks are generated by
+`src.utils.synthetic_data` in the volumes given on the command line, then
+each scenario issues `--requests` calls with `--concurrency` in flight
+through the in-process ASGI transport.
+Results can be saved as JSON and compared against a previous run.
+
+Usage:
+    python -m benchmarks.routes --output results/sqlite.json
+    python -m benchmarks.routes --database-url postgresql+asyncpg://... \\
+        --output results/postgres.json
+    python -m benchmarks.routes --compare results/sqlite.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from benchmarks.common import (
+    bench_client,
+    bench_engine,
+    percentile,
+    serve_with,
+)
+from src.models import User
+from src.security import get_password_hash
+from src.utils.synthetic_data import generate_data
+
+EMAIL = 'bench@bench.com'
+PASSWORD = 'bench-password'
+
+
+@dataclass
+class Scenario:
+    """One request shape, built from the seeded ids for each call."""
+
+    name: str
+    method: str
+    path: Callable[[dict, int], str]
+    body: Optional[Callable[[dict, int], dict]] = None
+    form: Optional[dict] = None
+    requests: Optional[int] = None
+
+
+async def seed(engine: AsyncEngine, args: argparse.Namespace) -> dict:
+    """Insert the benchmark dataset and return ids used by the scenarios."""
+    async with AsyncSession(engine) as session:
+        ids = await generate_data(
+            session,
+            {
+                'users': args.users,
+                'clients': args.clients,
+                'projects': args.projects,
+                'tasks': args.projects * args.tasks_per_project,
+            },
+        )
+        session.add(
+            User(
+                email=EMAIL,
+                password=get_password_hash(PASSWORD),
+                is_superuser=True,
+            )
+        )
+        await session.commit()
+
+    return ids
+
+
+def _pick(ids: list, i: int):
+    return ids[i % len(ids)]
+
+
+SCENARIOS = [
+    Scenario(
+        'POST /token',
+        'POST',
+        lambda ids, i: '/token/',
+        form={'username': EMAIL, 'password': PASSWORD},
+        requests=50,
+    ),
+    Scenario('GET /users/me', 'GET', lambda ids, i: '/users/me'),
+    Scenario('GET /clients', 'GET', lambda ids, i: '/clients/'),
+    Scenario(
+        'GET /clients/{id}',
+        'GET',
+        lambda ids, i: f'/clients/{_pick(ids["client_ids"], i)}',
+    ),
+    Scenario(
+        'POST /clients',
+        'POST',
+        lambda ids, i: '/clients/',
+        lambda ids, i: {
+            'name': f'new-client-{i}',
+            'client_type': 'company',
+            'type_identifier': 'cnpj',
+            'identifier': f'9{next(ids["sequence"]):013d}',
+        },
+    ),
+    Scenario('GET /projects', 'GET', lambda ids, i: '/projects/'),
+    Scenario(
+        'GET /projects/{id}',
+        'GET',
+        lambda ids, i: f'/projects/{_pick(ids["project_ids"], i)}',
+    ),
+    Scenario(
+        'POST /projects',
+        'POST',
+        lambda ids, i: '/projects/',
+        lambda ids, i: {'name': f'new-project-{i}', 'category_name': 'bench'},
+    ),
+    Scenario('GET /tasks', 'GET', lambda ids, i: '/tasks/'),
+    Scenario(
+        'GET /tasks?project_id=',
+        'GET',
+        lambda ids, i: f'/tasks/?project_id={_pick(ids["project_ids"], i)}',
+    ),
+    Scenario(
+        'GET /tasks/{id}',
+        'GET',
+        lambda ids, i: f'/tasks/{_pick(ids["task_ids"], i)}',
+    ),
+    Scenario(
+        'POST /tasks',
+        'POST',
+        lambda ids, i: '/tasks/',
+        lambda ids, i: {
+            'title': f'new-task-{i}',
+            'project_id': str(_pick(ids['project_ids'], i)),
+            'category_name': 'bench',
+        },
+    ),
+    Scenario('GET /categories', 'GET', lambda ids, i: '/categories/'),
+    Scenario('GET /superuser', 'GET', lambda ids, i: '/superuser/'),
+]
+
+
+async def run_scenario(
+    client: AsyncClient,
+    scenario: Scenario,
+    ids: dict,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """Issue the scenario's requests and summarize their latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one_request(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            kwargs = {}
+            if scenario.form:
+                kwargs['data'] = scenario.form
+            if scenario.body:
+                kwargs['json'] = scenario.body(ids, i)
+
+            start = perf_counter()
+            response = await client.request(
+                scenario.method, scenario.path(ids, i), **kwargs
+            )
+            latencies.append(perf_counter() - start)
+            errors += response.is_error
+
+    start = perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(requests)))
+    elapsed = perf_counter() - start
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'throughput_rps': round(requests / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Seed the database and run every scenario against it."""
+    async with bench_engine(args.database_url) as engine:
+        seed_start = perf_counter()
+        ids = await seed(engine, args)
+        seed_seconds = perf_counter() - seed_start
+        ids['sequence'] = count()
+
+        results = {}
+
+        with serve_with(engine):
+            async with bench_client() as client:
+                response = await client.post(
+                    '/token/', data={'username': EMAIL, 'password': PASSWORD}
+                )
+                token = response.json()['access_token']
+                client.headers['Authorization'] = f'Bearer {token}'
+
+                for scenario in SCENARIOS:
+                    if args.only and args.only not in scenario.name:
+                        continue
+                    results[scenario.name] = await run_scenario(
+                        client,
+                        scenario,
+                        ids,
+                        min(args.requests, scenario.requests or args.requests),
+                        args.concurrency,
+                    )
+                    _print_result(scenario.name, results[scenario.name])
+
+        dialect = engine.dialect.name
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'dialect': dialect,
+            'python': platform.python_version(),
+            'users': args.users,
+            'clients': args.clients,
+            'projects': args.projects,
+            'tasks_per_project': args.tasks_per_project,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed_seconds': round(seed_seconds, 2),
+        },
+        'results': results,
+    }
+
+
+def _print_result(name: str, result: dict) -> None:
+    print(
+        f'{name:<26} {result["throughput_rps"]:9.1f} req/s '
+        f'p50={result["p50_ms"]:8.2f} p95={result["p95_ms"]:8.2f} '
+        f'p99={result["p99_ms"]:8.2f} ms errors={result["errors"]}'
+    )
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Print the change of each scenario against `baseline`.
+
+    Returns:
+        The scenarios whose p95 latency grew by more than `threshold`
+        percent
+    """
+    regressions = []
+    print(f'\nCompared with run of {baseline["meta"]["timestamp"]}')
+
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if not previous:
+            continue
+
+        p95_change = (result['p95_ms'] / previous['p95_ms'] - 1) * 100
+        rps_change = (
+            result['throughput_rps'] / previous['throughput_rps'] - 1
+        ) * 100
+        regressed = p95_change > threshold
+        if regressed:
+            regressions.append(name)
+
+        print(
+            f'{name:<26} p95 {p95_change:+7.1f}%  '
+            f'throughput {rps_change:+7.1f}%'
+            f'{"  REGRESSION" if regressed else ""}'
+        )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--tasks-per-project', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--only', help='run scenarios containing this text')
+    parser.add_argument(
+        '--database-url',
+        help='scratch database to use; its tables are dropped',
+    )
+    parser.add_argument('--output', type=Path, help='save results as JSON')
+    parser.add_argument(
+        '--compare', type=Path, help='JSON results of a previous run'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=10.0,
+        help='p95 growth, in percent, reported as a regression',
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Compare the serialization of list pages before and after the Core row
+fast path (`src.utils.serialization`).
+
+For every list schema a page of `--rows` rows is built both ways:
+
+- old: ORM objects validated against the list schema by FastAPI's
+  `serialize_response` and encoded by `JSONResponse`
+- new: Core rows of the schema's columns dumped to bytes by the
+  schema's `PageSerializer`, unchecked as with
+  `FAST_LIST_SERIALIZATION=true`
+
+Each is timed with and without the database fetch, and both must
+produce the same JSON.
+
+Usage:
+    python -m benchmarks.serialization --rows 1000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+from statistics import median
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from benchmarks.common import bench_engine
+from src.api.routes.categories import category_pages
+from src.api.routes.clients import client_pages
+from src.api.routes.projects import project_pages
+from src.api.routes.superuser import user_pages
+from src.api.routes.tasks import task_pages
+from src.schemas.categories import CategoryList
+from src.schemas.clients import ClientListRequest
+from src.schemas.projects import ProjectRequestGetList
+from src.schemas.tasks import TaskRequestGetList
+from src.schemas.users import UserList
+from src.utils.synthetic_data import generate_data
+
+# Route path, list schema and page serializer of every list endpoint
+PAGES = {
+    '/tasks/': (TaskRequestGetList, task_pages),
+    '/projects/': (ProjectRequestGetList, project_pages),
+    '/clients/': (ClientListRequest, client_pages),
+    '/categories/': (CategoryList, category_pages),
+    '/superuser/': (UserList, user_pages),
+}
+
+
+async def _time(
+    repeat: int, work: Callable[[], Awaitable[bytes]]
+) -> tuple[float, bytes]:
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        body = await work()
+        samples.append(perf_counter() - start)
+    return median(samples) * 1000, body
+
+
+async def compare(
+    session: AsyncSession, path: str, rows: int, repeat: int
+) -> dict:
+    """Time both paths for one list schema, in milliseconds."""
+    schema, pages = PAGES[path]
+    field = create_model_field('response', schema)
+    objects_query = select(pages.model).options(undefer('*')).limit(rows)
+    rows_query = pages.select().limit(rows)
+
+    objects = (await session.scalars(objects_query)).all()
+    core_rows = (await session.execute(rows_query)).all()
+
+    async def old_serialize(objects=objects):
+        content = await serialize_response(
+            field=field,
+            response_content={pages.key: objects, 'next_cursor': None},
+        )
+        return JSONResponse(content).body
+
+    async def new_serialize(core_rows=core_rows):
+        return pages.dump(core_rows, None, validate=False)
+
+    async def old_fetch():
+        return await old_serialize(
+            (await session.scalars(objects_query)).all()
+        )
+
+    async def new_fetch():
+        return await new_serialize((await session.execute(rows_query)).all())
+
+    old_ms, old_body = await _time(repeat, old_serialize)
+    new_ms, new_body = await _time(repeat, new_serialize)
+    old_total_ms, _ = await _time(repeat, old_fetch)
+    new_total_ms, _ = await _time(repeat, new_fetch)
+
+    if json.loads(old_body) != json.loads(new_body):
+        raise AssertionError(f'{path}: the two paths disagree')
+
+    return {
+        'rows': len(objects),
+        'old': old_ms,
+        'new': new_ms,
+        'old_total': old_total_ms,
+        'new_total': new_total_ms,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with bench_engine(args.database_url) as engine:
+        async with AsyncSession(engine) as session:
+            await generate_data(
+                session,
+                {
+                    'users': args.rows,
+                    'clients': args.rows,
+                    'projects': args.rows,
+                    'tasks': args.rows,
+                },
+            )
+
+        print(
+            f'{"schema":<14}{"rows":>6}{"old ms":>10}{"new ms":>10}'
+            f'{"speedup":>9}{"old+db":>10}{"new+db":>10}{"speedup":>9}'
+        )
+        for path in PAGES:
+            # A fresh session per schema keeps the identity map small
+            async with AsyncSession(engine) as session:
+                result = await compare(session, path, args.rows, args.repeat)
+            print(
+                f'{path:<14}{result["rows"]:>6}'
+                f'{result["old"]:>10.2f}{result["new"]:>10.2f}'
+                f'{result["old"] / result["new"]:>8.1f}x'
+                f'{result["old_total"]:>10.2f}{result["new_total"]:>10.2f}'
+                f'{result["old_total"] / result["new_total"]:>8.1f}x'
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument(
+        '--database-url',
+        help='scratch database to use; its tables are dropped afterwards',
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""add tenants
+
+Revision ID: 2c7a4f9e0b18
+Revises: 6e1b0d9c4a75
+Create Date: 2026-10-18 20:14:36.482107
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c7a4f9e0b18'
+down_revision: Union[str, None] = '6e1b0d9c4a75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing rows move to the tenant of DEFAULT_TENANT_DOMAIN
+DEFAULT_DOMAIN = 'default'
+
+# Scoped tables and the column each one was unique on, now unique per
+# tenant
+UNIQUE_COLUMNS = {
+    'users': 'email',
+    'clients': 'identifier',
+    'categories': 'name',
+    'projects': 'name',
+    'tasks': None,
+}
+
+# UUID columns of each scoped table. SQLite does not reflect the UUID
+# type, and recreating its columns as NUMERIC would change the affinity
+# of the stored ids
+UUID_COLUMNS = {
+    'users': ['id'],
+    'clients': ['id'],
+    'categories': ['id'],
+    'projects': ['id', 'created_by', 'category_id', 'updated_by'],
+    'tasks': ['id', 'project_id', 'created_by', 'category_id', 'updated_by'],
+}
+
+# Postgres' names of unnamed constraints, also given to the constraints
+# SQLite reflects during batch operations
+NAMING_CONVENTION = {
+    'uq': '%(table_name)s_%(column_0_N_name)s_key',
+    'fk': '%(table_name)s_%(column_0_name)s_fkey',
+}
+
+# (old name, new name, table, columns, partial index predicates per
+# dialect). The new indexes lead with tenant_id, so a tenant's queries
+# only read that tenant's entries.
+ACTIVE = {
+    'postgresql_where': sa.text('is_active'),
+    'sqlite_where': sa.text('is_active = 1'),
+}
+INDEXES = [
+    ('ix_users_created_at_id', 'ix_users_tenant_id_created_at_id', 'users',
+     ['created_at', 'id'], {}),
+    ('ix_clients_created_at_id', 'ix_clients_tenant_id_created_at_id',
+     'clients', ['created_at', 'id'], {}),
+    ('ix_categories_created_at_id', 'ix_categories_tenant_id_created_at_id',
+     'categories', ['created_at', 'id'], {}),
+    ('ix_categories_active_created_at_id',
+     'ix_categories_active_tenant_id_created_at_id', 'categories',
+     ['created_at', 'id'], ACTIVE),
+    ('ix_projects_created_at_id', 'ix_projects_tenant_id_created_at_id',
+     'projects', ['created_at', 'id'], {}),
+    ('ix_tasks_created_at_id', 'ix_tasks_tenant_id_created_at_id', 'tasks',
+     ['created_at', 'id'], {}),
+    ('ix_tasks_project_id_created_at_id',
+     'ix_tasks_tenant_id_project_id_created_at_id', 'tasks',
+     ['project_id', 'created_at', 'id'], {}),
+    ('ix_tasks_status_created_at_id',
+     'ix_tasks_tenant_id_status_created_at_id', 'tasks',
+     ['status', 'created_at', 'id'], {}),
+    ('ix_tasks_due_date_id', 'ix_tasks_tenant_id_due_date_id', 'tasks',
+     ['due_date', 'id'], {}),
+    ('ix_tasks_created_by', 'ix_tasks_tenant_id_created_by', 'tasks',
+     ['created_by'], {}),
+]
+
+# Same objects as src.models._search_ddl, dropped with their table when
+# SQLite recreates it
+SEARCH_COLUMNS = {'tasks': ('title', 'description'), 'projects': ('name',)}
+
+STATS_COLUMNS = [
+    'group_key',
+    'category_id',
+    'status_state',
+    'target_month',
+    'project_count',
+    'value_count',
+    'value_total',
+]
+
+
+def _reflect_uuid(inspector, table, column_info):
+    if column_info['name'] in [*UUID_COLUMNS[table.name], 'tenant_id']:
+        column_info['type'] = sa.UUID()
+
+
+def _create_search_triggers(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.rowid, {old});"
+    )
+    insert_new = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new});'
+
+    op.execute(
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert_new} END'
+    )
+    op.execute(
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete_old} END'
+    )
+    op.execute(
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} '
+        f'ON {table} BEGIN {delete_old} {insert_new} END'
+    )
+    # The copied rows got new rowids, index them again
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _swap_indexes(old_position, new_position):
+    # Each replacement is built before the old index goes, so queries
+    # always have one of them
+    with op.get_context().autocommit_block():
+        for *names, table, columns, where in INDEXES:
+            op.create_index(
+                names[new_position],
+                table,
+                ['tenant_id', *columns] if new_position else columns,
+                unique=False,
+                postgresql_concurrently=True,
+                **where,
+            )
+            op.drop_index(
+                names[old_position],
+                table_name=table,
+                postgresql_concurrently=True,
+            )
+
+
+def _recreate_project_stats(tenant_id):
+    connection = op.get_bind()
+    old = sa.table(
+        'project_stats', *(sa.column(name) for name in STATS_COLUMNS)
+    )
+    rows = [row._asdict() for row in connection.execute(sa.select(old))]
+    op.drop_table('project_stats')
+
+    columns = [
+        sa.Column('group_key', sa.String(), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=True),
+        sa.Column('status_state', sa.String(), nullable=True),
+        sa.Column('target_month', sa.Date(), nullable=True),
+        sa.Column('project_count', sa.Integer(), nullable=False),
+        sa.Column('value_count', sa.Integer(), nullable=False),
+        sa.Column('value_total', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    ]
+    if tenant_id:
+        project_stats = op.create_table('project_stats',
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        *columns,
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('tenant_id', 'group_key')
+        )
+        rows = [{**row, 'tenant_id': tenant_id} for row in rows]
+    else:
+        project_stats = op.create_table('project_stats',
+        *columns,
+        sa.PrimaryKeyConstraint('group_key')
+        )
+
+    if rows:
+        op.bulk_insert(project_stats, rows)
+
+
+def upgrade() -> None:
+    tenants = op.create_table('tenants',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('domain', sa.String(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('domain')
+    )
+    tenant_id = uuid.uuid4()
+    op.bulk_insert(tenants, [{
+        'id': tenant_id,
+        'name': DEFAULT_DOMAIN,
+        'domain': DEFAULT_DOMAIN,
+        'is_active': True,
+    }])
+
+    for table, column in UNIQUE_COLUMNS.items():
+        op.add_column(table, sa.Column('tenant_id', sa.UUID(), nullable=True))
+        # Rewrites every row, schedule it in a maintenance window on big
+        # tables
+        op.execute(
+            sa.table(table, sa.column('tenant_id', sa.UUID()))
+            .update()
+            .values(tenant_id=tenant_id)
+        )
+
+        # SQLite recreates the table to change its constraints
+        with op.batch_alter_table(
+            table,
+            naming_convention=NAMING_CONVENTION,
+            reflect_kwargs={'listeners': [('column_reflect', _reflect_uuid)]},
+        ) as batch_op:
+            batch_op.alter_column(
+                'tenant_id', existing_type=sa.UUID(), nullable=False
+            )
+            batch_op.create_foreign_key(
+                f'{table}_tenant_id_fkey', 'tenants', ['tenant_id'], ['id']
+            )
+            if column:
+                batch_op.drop_constraint(f'{table}_{column}_key', type_='unique')
+                batch_op.create_unique_constraint(
+                    f'{table}_tenant_id_{column}_key', ['tenant_id', column]
+                )
+
+    if op.get_bind().dialect.name == 'sqlite':
+        for table, columns in SEARCH_COLUMNS.items():
+            _create_search_triggers(table, columns)
+
+    _recreate_project_stats(tenant_id)
+    _swap_indexes(0, 1)
+
+
+def downgrade() -> None:
+    # Rows of other tenants must be removed first, the old unique
+    # constraints span every tenant
+    _swap_indexes(1, 0)
+    _recreate_project_stats(None)
+
+    for table, column in reversed(UNIQUE_COLUMNS.items()):
+        with op.batch_alter_table(
+            table,
+            naming_convention=NAMING_CONVENTION,
+            reflect_kwargs={'listeners': [('column_reflect', _reflect_uuid)]},
+        ) as batch_op:
+            if column:
+                batch_op.drop_constraint(
+                    f'{table}_tenant_id_{column}_key', type_='unique'
+                )
+                batch_op.create_unique_constraint(
+                    f'{table}_{column}_key', [column]
+                )
+            batch_op.drop_constraint(
+                f'{table}_tenant_id_fkey', type_='foreignkey'
+            )
+            batch_op.drop_column('tenant_id')
+
+    if op.get_bind().dialect.name == 'sqlite':
+        for table, columns in SEARCH_COLUMNS.items():
+            _create_search_triggers(table, columns)
+
+    op.drop_table('tenants')
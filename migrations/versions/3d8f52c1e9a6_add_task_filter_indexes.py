@@ -0,0 +1,43 @@
+"""add task filter indexes
+
+Revision ID: 3d8f52c1e9a6
+Revises: b5d20e6f8a17
+Create Date: 2026-10-18 16:41:09.207315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8f52c1e9a6'
+down_revision: Union[str, None] = 'b5d20e6f8a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) backing the filters and sorts of GET /tasks/
+INDEXES = [
+    ('ix_tasks_status_created_at_id', 'tasks', ['status', 'created_at', 'id']),
+    ('ix_tasks_due_date_id', 'tasks', ['due_date', 'id']),
+    ('ix_tasks_created_by', 'tasks', ['created_by']),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so writes to tasks are not locked on Postgres
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
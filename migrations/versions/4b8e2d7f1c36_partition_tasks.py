@@ -0,0 +1,271 @@
+"""partition tasks
+
+Revision ID: 4b8e2d7f1c36
+Revises: 2c7a4f9e0b18
+Create Date: 2026-10-18 22:41:09.317254
+
+Partitions tasks on Postgres by TASKS_PARTITION_BY, read from
+`-x tasks_partition_by=...` or the environment; a no-op when it is
+'none' and on other databases. Run it with the same setting the
+application uses:
+
+    alembic -x tasks_partition_by=project_id upgrade head
+
+The copy runs online: the partitioned table is filled in small
+batches while a trigger mirrors concurrent writes, and the tables only
+swap names under a short lock at the end. Requires Postgres 12 or
+later.
+
+"""
+import os
+import re
+import uuid
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2d7f1c36'
+down_revision: Union[str, None] = '2c7a4f9e0b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same methods as src.models.TASK_PARTITION_METHODS
+PARTITION_METHODS = {
+    'project_id': 'HASH (project_id)',
+    'created_at': 'RANGE (created_at)',
+}
+
+
+def _option(name, default):
+    arguments = context.get_x_argument(as_dictionary=True)
+    return arguments.get(name.lower(), os.environ.get(name, default))
+
+
+def _is_partitioned(connection):
+    return bool(
+        connection.scalar(
+            sa.text(
+                "SELECT count(*) FROM pg_partitioned_table "
+                "WHERE partrelid = 'tasks'::regclass"
+            )
+        )
+    )
+
+
+def _columns(connection):
+    # The generated search_vector is computed by the copy itself
+    return connection.scalars(
+        sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'tasks' "
+            "AND is_generated = 'NEVER' ORDER BY ordinal_position"
+        )
+    ).all()
+
+
+def _month_partitions(connection, months_ahead):
+    # A month per partition, from the oldest task through months_ahead
+    # months from now, and a default partition for anything outside
+    oldest = connection.scalar(sa.text('SELECT min(created_at) FROM tasks'))
+    month = (oldest.date() if oldest else date.today()).replace(day=1)
+    last = date.today().replace(day=1)
+    for _ in range(months_ahead):
+        last = (last + timedelta(days=31)).replace(day=1)
+
+    statements = []
+    while month <= last:
+        following = (month + timedelta(days=31)).replace(day=1)
+        statements.append(
+            f'CREATE TABLE tasks_{month:%Y_%m} PARTITION OF tasks_partitioned '
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    statements.append(
+        'CREATE TABLE tasks_default PARTITION OF tasks_partitioned DEFAULT'
+    )
+    return statements
+
+
+def _create_copy(connection, name, partition_by):
+    """
+    Create `name` shaped like tasks, with its foreign keys and indexes.
+    The indexes get a `_new` suffix until the copy replaces tasks.
+    """
+    partition = (
+        f' PARTITION BY {PARTITION_METHODS[partition_by]}'
+        if partition_by
+        else ''
+    )
+    op.execute(
+        f'CREATE TABLE {name} (LIKE tasks INCLUDING DEFAULTS '
+        f'INCLUDING GENERATED){partition}'
+    )
+    key = ', '.join(['id', partition_by] if partition_by else ['id'])
+    op.execute(
+        f'ALTER TABLE {name} ADD CONSTRAINT {name}_pkey PRIMARY KEY ({key})'
+    )
+
+    inspector = sa.inspect(connection)
+    for foreign_key in inspector.get_foreign_keys('tasks'):
+        columns = ', '.join(foreign_key['constrained_columns'])
+        referred = ', '.join(foreign_key['referred_columns'])
+        op.execute(
+            f'ALTER TABLE {name} ADD CONSTRAINT {foreign_key["name"]} '
+            f'FOREIGN KEY ({columns}) '
+            f'REFERENCES {foreign_key["referred_table"]} ({referred})'
+        )
+
+    primary_key = inspector.get_pk_constraint('tasks')['name']
+    indexes = connection.execute(
+        sa.text(
+            'SELECT indexname, indexdef FROM pg_indexes '
+            "WHERE schemaname = current_schema() AND tablename = 'tasks' "
+            'AND indexname <> :primary_key'
+        ),
+        {'primary_key': primary_key},
+    ).all()
+    for index, definition in indexes:
+        # Indexes of partitioned tables read `ON ONLY tasks`
+        op.execute(
+            re.sub(
+                r'INDEX \S+ ON (ONLY )?\S+ ',
+                f'INDEX {index}_new ON {name} ',
+                definition,
+                count=1,
+            )
+        )
+
+    return [index for index, _ in indexes]
+
+
+def _replace_tasks(name, indexes):
+    op.execute('DROP TABLE tasks')
+    op.execute(f'ALTER TABLE {name} RENAME TO tasks')
+    op.execute(f'ALTER TABLE tasks RENAME CONSTRAINT {name}_pkey TO tasks_pkey')
+    for index in indexes:
+        op.execute(f'ALTER INDEX {index}_new RENAME TO {index}')
+
+
+def _sync_trigger(columns, partition_by):
+    names = ', '.join(columns)
+    new = ', '.join(f'NEW.{column}' for column in columns)
+    assignments = ', '.join(
+        f'{column} = EXCLUDED.{column}' for column in columns
+    )
+    op.execute(f"""
+        CREATE FUNCTION tasks_sync_partitioned() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM tasks_partitioned WHERE id = OLD.id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            INSERT INTO tasks_partitioned ({names}) VALUES ({new})
+            ON CONFLICT (id, {partition_by}) DO UPDATE SET {assignments};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(
+        'CREATE TRIGGER tasks_sync_partitioned '
+        'AFTER INSERT OR UPDATE OR DELETE ON tasks '
+        'FOR EACH ROW EXECUTE FUNCTION tasks_sync_partitioned()'
+    )
+
+
+def _backfill(connection, columns, batch_size):
+    # One transaction per batch of ids. FOR SHARE makes concurrent
+    # writes to a batch wait for its copy, so their trigger sees it.
+    names = ', '.join(columns)
+    last_id = uuid.UUID(int=0)
+    with op.get_context().autocommit_block():
+        while True:
+            bound = connection.scalar(
+                sa.text(
+                    'SELECT id FROM tasks WHERE id > :last_id ORDER BY id '
+                    'OFFSET :offset LIMIT 1'
+                ),
+                {'last_id': last_id, 'offset': batch_size - 1},
+            )
+            parameters = {'last_id': last_id}
+            upper = ''
+            if bound is not None:
+                parameters['bound'] = bound
+                upper = 'AND id <= :bound '
+            connection.execute(
+                sa.text(
+                    f'WITH batch AS (SELECT {names} FROM tasks '
+                    f'WHERE id > :last_id {upper}FOR SHARE) '
+                    f'INSERT INTO tasks_partitioned ({names}) '
+                    f'SELECT {names} FROM batch ON CONFLICT DO NOTHING'
+                ),
+                parameters,
+            )
+            if bound is None:
+                break
+            last_id = bound
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    partition_by = _option('TASKS_PARTITION_BY', 'none')
+    if (
+        connection.dialect.name != 'postgresql'
+        or partition_by not in PARTITION_METHODS
+        or _is_partitioned(connection)
+    ):
+        return
+
+    columns = _columns(connection)
+    indexes = _create_copy(connection, 'tasks_partitioned', partition_by)
+    if partition_by == 'project_id':
+        partitions = int(_option('TASKS_HASH_PARTITIONS', 16))
+        for remainder in range(partitions):
+            op.execute(
+                f'CREATE TABLE tasks_p{remainder} PARTITION OF '
+                f'tasks_partitioned FOR VALUES WITH '
+                f'(MODULUS {partitions}, REMAINDER {remainder})'
+            )
+    else:
+        months_ahead = int(_option('TASKS_PARTITION_MONTHS_AHEAD', 3))
+        for statement in _month_partitions(connection, months_ahead):
+            op.execute(statement)
+    _sync_trigger(columns, partition_by)
+
+    # Commits the above, so the trigger runs while the copy does
+    _backfill(
+        connection, columns, int(_option('TASKS_PARTITION_BATCH_SIZE', 5000))
+    )
+
+    # Writes wait for the swap only; the trigger kept the copy current
+    op.execute('LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE')
+    op.execute('DROP TRIGGER tasks_sync_partitioned ON tasks')
+    op.execute('DROP FUNCTION tasks_sync_partitioned()')
+    _replace_tasks('tasks_partitioned', indexes)
+
+    with op.get_context().autocommit_block():
+        op.execute('ANALYZE tasks')
+
+
+def downgrade() -> None:
+    # Copies every task while holding the table, schedule it in a
+    # maintenance window on big tables
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql' or not _is_partitioned(
+        connection
+    ):
+        return
+
+    columns = ', '.join(_columns(connection))
+    op.execute('LOCK TABLE tasks IN EXCLUSIVE MODE')
+    indexes = _create_copy(connection, 'tasks_unpartitioned', None)
+    op.execute(
+        f'INSERT INTO tasks_unpartitioned ({columns}) '
+        f'SELECT {columns} FROM tasks'
+    )
+    _replace_tasks('tasks_unpartitioned', indexes)
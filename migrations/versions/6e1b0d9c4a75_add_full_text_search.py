@@ -0,0 +1,95 @@
+"""add full text search
+
+Revision ID: 6e1b0d9c4a75
+Revises: 9a4c7e2b1f03
+Create Date: 2026-10-18 19:05:47.318820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1b0d9c4a75'
+down_revision: Union[str, None] = '9a4c7e2b1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same objects as src.models._search_ddl
+CONFIG = 'portuguese'
+COLUMNS = {'tasks': ('title', 'description'), 'projects': ('name',)}
+
+
+def _postgres_upgrade(table, columns):
+    weighted = ' || '.join(
+        f"setweight(to_tsvector('{CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(columns, 'ABCD')
+    )
+    # Adding a stored generated column rewrites the table under an
+    # exclusive lock, schedule it in a maintenance window on big tables
+    op.execute(
+        f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+        f'GENERATED ALWAYS AS ({weighted}) STORED'
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY ix_{table}_search_vector '
+            f'ON {table} USING gin (search_vector)'
+        )
+
+
+def _sqlite_upgrade(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.rowid, {old});"
+    )
+    insert_new = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new});'
+
+    op.execute(
+        f'CREATE VIRTUAL TABLE {fts} USING fts5({names}, '
+        f"content='{table}', content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert_new} END'
+    )
+    op.execute(
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete_old} END'
+    )
+    op.execute(
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete_old} {insert_new} END'
+    )
+    # Index the existing rows
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns in COLUMNS.items():
+        if dialect == 'postgresql':
+            _postgres_upgrade(table, columns)
+        elif dialect == 'sqlite':
+            _sqlite_upgrade(table, columns)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in reversed(COLUMNS):
+        if dialect == 'postgresql':
+            with op.get_context().autocommit_block():
+                op.execute(
+                    f'DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search_vector'
+                )
+            op.execute(f'ALTER TABLE {table} DROP COLUMN search_vector')
+        elif dialect == 'sqlite':
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{trigger}')
+            op.execute(f'DROP TABLE IF EXISTS {table}_fts')
@@ -0,0 +1,165 @@
+"""add archive tables
+
+Revision ID: 7d1e5a3c9b42
+Revises: 4b8e2d7f1c36
+Create Date: 2026-10-19 09:12:47.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d1e5a3c9b42'
+down_revision: Union[str, None] = '4b8e2d7f1c36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Hot table and the column holding when its rows were deactivated
+DEACTIVATED_AT = {
+    'tasks': 'updated_at',
+    'projects': 'updated_at',
+    'categories': 'updated_at',
+    'clients': 'update_at',
+    'users': 'updated_at',
+}
+
+
+def _columns(table):
+    # Same columns as the hot tables, see src.models._archive_table
+    tenant = [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+    ]
+    timestamps = [
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+    return {
+        'tasks': [
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('project_id', sa.UUID(), nullable=False),
+            sa.Column('created_by', sa.UUID(), nullable=False),
+            *tenant,
+            sa.Column('category_id', sa.UUID(), nullable=True),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('priority', sa.String(), nullable=False),
+            sa.Column('due_date', sa.Date(), nullable=True),
+            sa.Column('updated_by', sa.UUID(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            *timestamps,
+        ],
+        'projects': [
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('created_by', sa.UUID(), nullable=False),
+            *tenant,
+            sa.Column('category_id', sa.UUID(), nullable=True),
+            sa.Column('status_state', sa.String(), nullable=True),
+            sa.Column('project_value', sa.Float(), nullable=True),
+            sa.Column('target_date', sa.Date(), nullable=True),
+            sa.Column('updated_by', sa.UUID(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            *timestamps,
+        ],
+        'categories': [
+            sa.Column('name', sa.String(), nullable=False),
+            *tenant,
+            *timestamps,
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+        ],
+        'clients': [
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('client_type', sa.String(), nullable=False),
+            sa.Column(
+                'type_identifier',
+                postgresql.ENUM(
+                    'cpf', 'cnpj', name='identifiertype', create_type=False
+                ),
+                nullable=False,
+            ),
+            sa.Column('identifier', sa.String(), nullable=False),
+            *tenant,
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('update_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_by', sa.DateTime(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+        ],
+        'users': [
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('password', sa.String(), nullable=False),
+            *tenant,
+            sa.Column('full_name', sa.String(), nullable=True),
+            sa.Column('is_superuser', sa.Boolean(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            sa.Column('token_version', sa.Integer(), nullable=False),
+            *timestamps,
+        ],
+    }[table]
+
+
+def _tasks_partitioned():
+    connection = op.get_bind()
+    return connection.dialect.name == 'postgresql' and bool(
+        connection.scalar(
+            sa.text(
+                'SELECT count(*) FROM pg_partitioned_table '
+                "WHERE partrelid = 'tasks'::regclass"
+            )
+        )
+    )
+
+
+def upgrade() -> None:
+    for table in DEACTIVATED_AT:
+        op.create_table(f'{table}_archive',
+        *_columns(table),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(
+            f'ix_{table}_archive_tenant_id_archived_at',
+            f'{table}_archive',
+            ['tenant_id', 'archived_at'],
+            unique=False,
+        )
+
+    # Partitioned tables can't be indexed concurrently
+    tasks_partitioned = _tasks_partitioned()
+    with op.get_context().autocommit_block():
+        for table, deactivated_at in DEACTIVATED_AT.items():
+            op.create_index(
+                f'ix_{table}_inactive_{deactivated_at}',
+                table,
+                [deactivated_at],
+                unique=False,
+                postgresql_concurrently=not (
+                    table == 'tasks' and tasks_partitioned
+                ),
+                postgresql_where=sa.text('NOT is_active'),
+                sqlite_where=sa.text('is_active = 0'),
+            )
+
+
+def downgrade() -> None:
+    # Archived rows are dropped with their tables, restore them first
+    tasks_partitioned = _tasks_partitioned()
+    with op.get_context().autocommit_block():
+        for table, deactivated_at in DEACTIVATED_AT.items():
+            op.drop_index(
+                f'ix_{table}_inactive_{deactivated_at}',
+                table_name=table,
+                postgresql_concurrently=not (
+                    table == 'tasks' and tasks_partitioned
+                ),
+            )
+
+    for table in reversed(DEACTIVATED_AT):
+        op.drop_index(
+            f'ix_{table}_archive_tenant_id_archived_at',
+            table_name=f'{table}_archive',
+        )
+        op.drop_table(f'{table}_archive')
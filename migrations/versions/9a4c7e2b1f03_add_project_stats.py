@@ -0,0 +1,86 @@
+"""add project stats
+
+Revision ID: 9a4c7e2b1f03
+Revises: 3d8f52c1e9a6
+Create Date: 2026-10-18 17:52:31.604218
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c7e2b1f03'
+down_revision: Union[str, None] = '3d8f52c1e9a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    project_stats = op.create_table('project_stats',
+    sa.Column('group_key', sa.String(), nullable=False),
+    sa.Column('category_id', sa.UUID(), nullable=True),
+    sa.Column('status_state', sa.String(), nullable=True),
+    sa.Column('target_month', sa.Date(), nullable=True),
+    sa.Column('project_count', sa.Integer(), nullable=False),
+    sa.Column('value_count', sa.Integer(), nullable=False),
+    sa.Column('value_total', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.PrimaryKeyConstraint('group_key')
+    )
+
+    # Backfill from the existing projects, same grouping as
+    # src.utils.project_stats.rebuild_project_stats
+    projects = sa.table(
+        'projects',
+        sa.column('category_id', sa.UUID()),
+        sa.column('status_state', sa.String()),
+        sa.column('target_date', sa.Date()),
+        sa.column('project_value', sa.Float()),
+        sa.column('is_active', sa.Boolean()),
+    )
+    rows = op.get_bind().execute(
+        sa.select(
+            projects.c.category_id,
+            projects.c.status_state,
+            projects.c.target_date,
+            sa.func.count(),
+            sa.func.count(projects.c.project_value),
+            sa.func.coalesce(sa.func.sum(projects.c.project_value), 0.0),
+        )
+        .where(projects.c.is_active)
+        .group_by(
+            projects.c.category_id,
+            projects.c.status_state,
+            projects.c.target_date,
+        )
+    )
+
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for category_id, status_state, target_date, *sums in rows:
+        month = target_date.replace(day=1) if target_date else None
+        for i, value in enumerate(sums):
+            totals[category_id, status_state, month][i] += value
+
+    if totals:
+        op.bulk_insert(project_stats, [
+            {
+                'group_key': '|'.join(
+                    '' if part is None else str(part) for part in group
+                ),
+                'category_id': group[0],
+                'status_state': group[1],
+                'target_month': group[2],
+                'project_count': count,
+                'value_count': value_count,
+                'value_total': value_total,
+            }
+            for group, (count, value_count, value_total) in totals.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('project_stats')
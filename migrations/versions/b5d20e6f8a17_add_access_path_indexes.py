@@ -0,0 +1,50 @@
+"""add access path indexes
+
+Revision ID: b5d20e6f8a17
+Revises: 7c3e91a0d4b2
+Create Date: 2026-10-18 13:26:53.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d20e6f8a17'
+down_revision: Union[str, None] = '7c3e91a0d4b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicates per dialect)
+INDEXES = [
+    ('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id'], {}),
+    ('ix_tasks_category_id', 'tasks', ['category_id'], {}),
+    ('ix_projects_category_id', 'projects', ['category_id'], {}),
+    # SQLite only uses a partial index when the query repeats its predicate
+    # verbatim, and booleans are compared as `is_active = 1` there.
+    ('ix_categories_active_created_at_id', 'categories', ['created_at', 'id'],
+     {'postgresql_where': sa.text('is_active'), 'sqlite_where': sa.text('is_active = 1')}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and
+    # avoids locking writes on Postgres while the indexes are built.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                **where,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -2,32 +2,139 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Header, Request, Response
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
-from src.core.database import engine
+from src.core.cache import TTLCache
+from src.core.database import (
+    SAFE_METHODS,
+    has_replica,
+    open_session,
+    primary_until,
+)
 from src.core.settings import settings
-from src.models import User
+from src.models import TENANT_KEY, User, session_tenant_id
+from src.schemas.token import TokenIdentity
+from src.utils.tenants import get_tenant_id
 
+# Holds the time until which the client's reads stay on the primary
+PRIMARY_COOKIE = 'read_primary_until'
 
-async def get_session():  # pragma: no cover
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+
+async def get_session(request: Request, response: Response):
+    if request.method not in SAFE_METHODS and has_replica():
+        # Replicas lag behind, let the client read its own writes
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            primary_until(),
+            max_age=max(1, round(settings.READ_YOUR_WRITES_SECONDS)),
+            httponly=True,
+            samesite='lax',
+        )
+
+    session = await open_session(
+        request.method, request.cookies.get(PRIMARY_COOKIE)
+    )
+    async with session:
         yield session
 
 
-T_Session = Annotated[AsyncSession, Depends(get_session)]
+async def get_current_tenant_id(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    x_tenant_domain: Annotated[str | None, Header()] = None,
+) -> UUID:
+    """
+    Resolve the tenant of `X-Tenant-Domain`.
+
+    Requests without the header act on the tenant of
+    `DEFAULT_TENANT_DOMAIN`.
+    """
+    tenant_id = await get_tenant_id(
+        session, x_tenant_domain or settings.DEFAULT_TENANT_DOMAIN
+    )
+
+    if tenant_id is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Tenant not found'
+        )
+
+    return tenant_id
+
+
+async def get_tenant_session(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    tenant_id: UUID = Depends(get_current_tenant_id),
+) -> AsyncSession:
+    """
+    Scope the request session to the request's tenant.
+
+    Every query of the session is then filtered to the tenant, see
+    `src.models.TenantScoped`.
+    """
+    session.info[TENANT_KEY] = tenant_id
+    return session
+
+
+T_Session = Annotated[AsyncSession, Depends(get_tenant_session)]
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='token')
 
+# Authenticated users keyed by tenant id and token subject (email)
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
-async def get_current_user(
-    session: T_Session,
-    token: str = Depends(oauth2_scheme),
-) -> User:
+# Latest token version per user id changed on this worker. Entries only
+# need to outlive the stateless tokens they revoke.
+token_versions = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.STATELESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def _detached_copy(user: User) -> User:
+    """
+    Copy the column values of `user` into a new detached instance.
+
+    The copy is what gets cached, so requests never share (or mutate)
+    the instance attached to another request's session.
+    """
+    mapper = inspect(User)
+    user_copy = mapper.class_manager.new_instance()
+
+    for attr in mapper.column_attrs:
+        setattr(user_copy, attr.key, getattr(user, attr.key))
+
+    make_transient_to_detached(user_copy)
+
+    return user_copy
+
+
+def bump_token_version(user: User) -> None:
+    """Revoke every token issued to `user` so far. Commit afterwards."""
+    user.token_version += 1
+
+
+def invalidate_cached_user(user: User, *previous_emails: str) -> None:
+    """
+    Forget what this worker knows about `user` after a committed change.
+
+    Drops the cached user (under its current and previous emails) and
+    records its token version, so revoked stateless tokens are rejected
+    here right away and on other workers once they expire.
+    """
+    for email in (user.email, *previous_emails):
+        user_cache.invalidate((user.tenant_id, email))
+
+    token_versions.set(user.id, user.token_version)
+
+
+def _decode_token(token: str) -> dict:
     credentials_exception = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
@@ -38,9 +145,7 @@ async def get_current_user(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
 
-        subject_email = payload.get('sub')
-
-        if not subject_email:
+        if not payload.get('sub'):
             raise credentials_exception
 
     except DecodeError:
@@ -49,13 +154,44 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user_db = await session.scalar(
-        select(User).where(
-            (User.email == subject_email) & (User.is_active == True)  # noqa: E712
-        )
+    return payload
+
+
+async def get_current_user(
+    session: T_Session,
+    token: str = Depends(oauth2_scheme),
+) -> User:
+    credentials_exception = HTTPException(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        detail='Could not validate credentials',
+        headers={'WWW-Authenticate': 'Bearer'},
     )
+    payload = _decode_token(token)
+    subject_email = payload['sub']
+    tenant_id = session_tenant_id(session)
 
-    if not user_db:
+    # A token is only valid on the tenant it was issued for, tokens
+    # without one are valid nowhere
+    if payload.get('tenant') != str(tenant_id):
+        raise credentials_exception
+
+    user_db = user_cache.get((tenant_id, subject_email))
+
+    if user_db:
+        user_db = await session.merge(user_db, load=False)
+    else:
+        user_db = await session.scalar(
+            select(User).where(
+                (User.email == subject_email) & (User.is_active == True)  # noqa: E712
+            )
+        )
+
+        if not user_db:
+            raise credentials_exception
+
+        user_cache.set((tenant_id, subject_email), _detached_copy(user_db))
+
+    if payload.get('ver', user_db.token_version) < user_db.token_version:
         raise credentials_exception
 
     return user_db
@@ -64,6 +200,50 @@ async def get_current_user(
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def get_current_identity(
+    session: T_Session,
+    token: str = Depends(oauth2_scheme),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+) -> TokenIdentity:
+    """
+    Resolve who is calling, for routes that only need the identity.
+
+    With `STATELESS_AUTH` enabled the identity is read from the token
+    claims, without touching the database. Otherwise (or for tokens
+    issued without those claims) it falls back to `get_current_user`.
+    """
+    payload = _decode_token(token)
+
+    if not settings.STATELESS_AUTH or 'uid' not in payload:
+        return TokenIdentity.model_validate(
+            await get_current_user(session, token)
+        )
+
+    user_id = UUID(payload['uid'])
+    latest_version = token_versions.get(user_id)
+
+    if (
+        not payload.get('active')
+        or payload.get('tenant') != str(tenant_id)
+        or (latest_version is not None and payload['ver'] < latest_version)
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Could not validate credentials',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+    return TokenIdentity(
+        id=user_id,
+        email=payload['sub'],
+        is_superuser=payload.get('is_superuser', False),
+        token_version=payload['ver'],
+    )
+
+
+CurrentIdentity = Annotated[TokenIdentity, Depends(get_current_identity)]
+
+
 def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
@@ -0,0 +1,166 @@
+"""Request metrics recorded around every API route."""
+
+from http import HTTPStatus
+from time import perf_counter
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from loguru import logger
+
+from src.api.dependencies import token_versions, user_cache
+from src.core.database import QueryStats, query_stats
+from src.core.metrics import Counter, Gauge, Histogram, registry
+from src.core.settings import settings
+from src.utils.category_utils import category_cache
+from src.utils.tenants import tenant_cache
+
+REQUESTS_TOTAL = Counter(
+    'http_requests_total',
+    'Requests handled, by route template and status code.',
+    ('method', 'route', 'status'),
+)
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Time to handle a request, including sending the response body.',
+    ('method', 'route'),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    'Requests currently being handled.',
+    ('method', 'route'),
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database statements executed per request.',
+    ('method', 'route'),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+REQUEST_DB_SECONDS = Histogram(
+    'http_request_db_seconds',
+    'Time spent executing database statements per request.',
+    ('method', 'route'),
+)
+QUERY_BUDGET_EXCEEDED_TOTAL = Counter(
+    'http_query_budget_exceeded_total',
+    'Requests that executed more statements than `QUERY_BUDGET`.',
+    ('method', 'route'),
+)
+REPEATED_QUERIES_TOTAL = Counter(
+    'http_repeated_queries_total',
+    'Requests that repeated one statement, a likely N+1 pattern.',
+    ('method', 'route'),
+)
+CACHE_ENTRIES = Gauge(
+    'cache_entries', 'Entries held by an in-process cache.', ('cache',)
+)
+CACHE_HITS_TOTAL = Counter(
+    'cache_hits_total', 'Lookups answered by an in-process cache.', ('cache',)
+)
+CACHE_MISSES_TOTAL = Counter(
+    'cache_misses_total', 'Lookups missed by an in-process cache.', ('cache',)
+)
+
+CACHES = {
+    'users': user_cache,
+    'token_versions': token_versions,
+    'categories': category_cache,
+    'tenants': tenant_cache,
+}
+
+
+def check_queries(key: tuple[str, str], queries: QueryStats) -> None:
+    """
+    Warn when a request exceeded the query budget or repeated a statement.
+
+    A statement executed `QUERY_REPEAT_THRESHOLD` times with different
+    parameters is usually a relationship lazy loaded inside a loop.
+    """
+    method, route = key
+
+    if settings.QUERY_BUDGET and queries.count > settings.QUERY_BUDGET:
+        QUERY_BUDGET_EXCEEDED_TOTAL.inc(labels=key)
+        logger.warning(
+            'Query budget exceeded on {} {}: {} statements (budget {})',
+            method,
+            route,
+            queries.count,
+            settings.QUERY_BUDGET,
+        )
+
+    if not settings.QUERY_REPEAT_THRESHOLD:
+        return
+
+    repeated = queries.repeated(settings.QUERY_REPEAT_THRESHOLD)
+    if repeated:
+        REPEATED_QUERIES_TOTAL.inc(labels=key)
+    for statement, count in repeated:
+        logger.warning(
+            'Possible N+1 on {} {}: statement executed {} times: {}',
+            method,
+            route,
+            count,
+            ' '.join(statement.split()),
+        )
+
+
+def instrument_route(route: APIRoute) -> None:
+    """
+    Wrap the ASGI app of `route` to record its request metrics.
+
+    Metrics are labelled with the route template (`/tasks/{task_id}`),
+    never the raw path, so their cardinality stays bounded. Statements
+    run by the request are checked against the query budget.
+    """
+    app = route.app
+    labels = {method: (method, route.path) for method in route.methods}
+
+    async def instrumented_app(scope, receive, send):
+        key = labels.get(scope['method'], (scope['method'], route.path))
+        status = HTTPStatus.INTERNAL_SERVER_ERROR.value
+
+        async def send_and_record_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        queries = QueryStats()
+        token = query_stats.set(queries)
+        REQUESTS_IN_FLIGHT.inc(labels=key)
+        start = perf_counter()
+
+        try:
+            await app(scope, receive, send_and_record_status)
+        finally:
+            REQUEST_SECONDS.observe(perf_counter() - start, key)
+            REQUESTS_IN_FLIGHT.dec(labels=key)
+            REQUESTS_TOTAL.inc(labels=(*key, status))
+            REQUEST_QUERIES.observe(queries.count, key)
+            REQUEST_DB_SECONDS.observe(queries.seconds, key)
+            query_stats.reset(token)
+            check_queries(key, queries)
+
+    route.app = instrumented_app
+
+
+def instrument_app(app: FastAPI) -> None:
+    """Instrument every route registered on `app` so far."""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            instrument_route(route)
+
+
+def _collect_cache_stats() -> None:
+    for name, cache in CACHES.items():
+        stats = cache.stats()
+        labels = (name,)
+        CACHE_ENTRIES.set(stats['size'], labels)
+        CACHE_HITS_TOTAL.inc(
+            stats['hits'] - CACHE_HITS_TOTAL.values[labels], labels
+        )
+        CACHE_MISSES_TOTAL.inc(
+            stats['misses'] - CACHE_MISSES_TOTAL.values[labels], labels
+        )
+
+
+registry.add_collector(_collect_cache_stats)
@@ -1,15 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.instrumentation import instrument_app
 from src.api.routes import (
+    archive,
     categories,
     clients,
     login,
+    metrics,
     projects,
+    search,
     superuser,
     tasks,
     users,
 )
+from src.core.settings import settings
 
 app = FastAPI()
 
@@ -37,3 +42,11 @@ app.include_router(
     categories.router, prefix='/categories', tags=['categories']
 )
 app.include_router(superuser.router, prefix='/superuser', tags=['superuser'])
+app.include_router(search.router, prefix='/search', tags=['search'])
+app.include_router(archive.router, prefix='/archive', tags=['archive'])
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=['metrics'])
+
+# Also enforces the query budget, so it applies with metrics disabled
+instrument_app(app)
@@ -4,7 +4,9 @@ from src.api.routes import (
     categories,
     clients,
     login,
+    metrics,
     projects,
+    search,
     superuser,
     tasks,
     users,
@@ -14,7 +16,9 @@ __all__ = [
     'categories',
     'clients',
     'login',
+    'metrics',
     'projects',
+    'search',
     'superuser',
     'tasks',
     'users',
@@ -0,0 +1,30 @@
+from http import HTTPStatus
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+
+from src.api.dependencies import T_Session, get_current_active_superuser
+from src.schemas.base import Message
+from src.utils.archive import ARCHIVED_MODELS, restore_archived
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.post(
+    '/{table}/{row_id}/restore',
+    status_code=HTTPStatus.OK,
+    response_model=Message,
+)
+async def restore_row(
+    table: Literal['tasks', 'projects', 'categories', 'clients', 'users'],
+    row_id: UUID,
+    session: T_Session,
+):
+    """
+    Move a row archived by `python -m src.archive_inactive` back to its
+    table, active again. Rows it references must be restored first.
+    """
+    await restore_archived(session, ARCHIVED_MODELS[table], row_id)
+
+    return {'message': 'Row restored'}
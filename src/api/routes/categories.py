@@ -1,12 +1,13 @@
 """API routes for categories."""
 
 from http import HTTPStatus
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from sqlalchemy import select
 
-from src.api.dependencies import CurrentUser, T_Session
+from src.api.dependencies import CurrentIdentity, T_Session
 from src.models import Category
 from src.schemas.base import Message
 from src.schemas.categories import (
@@ -14,9 +15,19 @@ from src.schemas.categories import (
     CategoryList,
     CategoryResponse,
 )
+from src.utils.category_utils import category_cache
+from src.utils.etag import not_modified, row_etag
+from src.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    paginate,
+)
+from src.utils.serialization import PageSerializer, RawJSONResponse
 
 router = APIRouter()
 
+category_pages = PageSerializer(Category, CategoryResponse, 'categories')
+
 
 @router.post(
     path='/',
@@ -26,7 +37,7 @@ router = APIRouter()
 async def create_category(
     session: T_Session,
     category: CategoryCreate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ) -> Category:
     """Create a new category."""
     # Check if category exists with the same name
@@ -50,6 +61,10 @@ async def create_category(
     await session.commit()
     await session.refresh(category_db)
 
+    category_cache.set(
+        (category_db.tenant_id, category_db.name), category_db.id
+    )
+
     return category_db
 
 
@@ -61,11 +76,19 @@ async def create_category(
 async def read_category_by_id(
     session: T_Session,
     category_id: UUID,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> Category:
     """
     Get a specific category.
+    Answers 304 when `If-None-Match` holds the current ETag.
     """
+    if cached := await not_modified(
+        session, Category, category_id, if_none_match
+    ):
+        return cached
+
     query = select(Category).where(Category.id == category_id)
 
     category_db = await session.scalar(query)
@@ -75,6 +98,7 @@ async def read_category_by_id(
             detail="Category doesn't exist", status_code=HTTPStatus.NOT_FOUND
         )
 
+    response.headers['ETag'] = row_etag(category_db)
     return category_db
 
 
@@ -85,18 +109,22 @@ async def read_category_by_id(
 )
 async def read_all_categories(
     session: T_Session,
-    current_user: CurrentUser,
-) -> dict:
+    current_user: CurrentIdentity,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+) -> RawJSONResponse:
     """
-    Get all categories.
+    Get a page of active categories ordered by creation.
     """
-    query = select(Category).where(
+    query = category_pages.select().where(
         Category.is_active == True,  # noqa: E712
     )
 
-    categories_db = await session.scalars(query)
+    rows, next_cursor = await paginate(
+        session, query, Category, limit=limit, cursor=cursor
+    )
 
-    return {'categories': categories_db.all()}
+    return category_pages.response(rows, next_cursor)
 
 
 @router.delete(
@@ -107,7 +135,7 @@ async def read_all_categories(
 async def delete_category(
     session: T_Session,
     category_id: UUID,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ) -> dict:
     """
     Delete (deactivate) a category.
@@ -126,4 +154,6 @@ async def delete_category(
     session.add(category_db)
     await session.commit()
 
+    category_cache.invalidate((category_db.tenant_id, category_db.name))
+
     return {'message': 'Category deleted'}
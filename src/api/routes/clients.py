@@ -1,28 +1,41 @@
+import io
 from http import HTTPStatus
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response, UploadFile
 from fastapi.exceptions import HTTPException
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from src.api.dependencies import (
-    CurrentUser,
+    CurrentIdentity,
     T_Session,
     get_current_active_superuser,
 )
 from src.models import Client
 from src.schemas.base import Message
 from src.schemas.clients import (
+    ClientImportReport,
     ClientListRequest,
     ClientRequestCreate,
     ClientRequestUpdate,
     ClientResponse,
 )
+from src.utils.client_import import import_clients
+from src.utils.etag import check_if_match, not_modified, row_etag
+from src.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    paginate,
+)
+from src.utils.serialization import PageSerializer
 
 # Only superusers can access client management
 router = APIRouter()
 
+client_pages = PageSerializer(Client, ClientResponse, 'clients')
+
 
 @router.post(
     path='/',
@@ -32,7 +45,7 @@ router = APIRouter()
 async def create_client(
     session: T_Session,
     client_schema: ClientRequestCreate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ):
     """Create a new client."""
     # Check if client with same identifier exists
@@ -57,6 +70,27 @@ async def create_client(
     return db_client
 
 
+@router.post(
+    path='/import',
+    status_code=HTTPStatus.OK,
+    response_model=ClientImportReport,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def import_clients_csv(session: T_Session, file: UploadFile):
+    """
+    Import clients from a CSV file.
+    Valid rows are loaded in batches; rejected rows are reported.
+    """
+    csv_file = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+
+    try:
+        return await import_clients(session, csv_file)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(exc)
+        )
+
+
 @router.delete(
     path='/{client_id}',
     status_code=HTTPStatus.OK,
@@ -90,22 +124,32 @@ async def delete_client(
     status_code=HTTPStatus.OK,
     response_model=ClientResponse,
 )
-async def update_client(
+async def update_client(  # noqa: PLR0913, PLR0917
     session: T_Session,
     client_id: UUID,
     client: ClientRequestUpdate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
 ):
-    """Update a client."""
-    db_client = await session.scalar(
-        select(Client).where(Client.id == client_id)
-    )
+    """
+    Update a client.
+    With `If-Match`, answers 412 unless it holds the current ETag.
+    """
+    query = select(Client).where(Client.id == client_id)
+    if if_match:
+        # Keep concurrent updates out until this one commits
+        query = query.with_for_update()
+
+    db_client = await session.scalar(query)
 
     if not db_client:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Client not found'
         )
 
+    check_if_match(if_match, db_client)
+
     try:
         for key, value in client.model_dump(exclude_unset=True).items():
             setattr(db_client, key, value)
@@ -119,6 +163,7 @@ async def update_client(
             status_code=HTTPStatus.CONFLICT, detail='Client already exists'
         )
 
+    response.headers['ETag'] = row_etag(db_client)
     return db_client
 
 
@@ -130,11 +175,17 @@ async def update_client(
 async def get_client_by_id(
     session: T_Session,
     client_id: UUID,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """
     Get a specific client.
+    Answers 304 when `If-None-Match` holds the current ETag.
     """
+    if cached := await not_modified(session, Client, client_id, if_none_match):
+        return cached
+
     query = select(Client).where(Client.id == client_id)
 
     db_client = await session.scalar(query)
@@ -144,6 +195,7 @@ async def get_client_by_id(
             status_code=HTTPStatus.NOT_FOUND, detail='Client not found'
         )
 
+    response.headers['ETag'] = row_etag(db_client)
     return db_client
 
 
@@ -152,13 +204,26 @@ async def get_client_by_id(
 )
 async def read_all_clients(
     session: T_Session,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = Query(
+        default=None,
+        description=(
+            'Comma separated fields to return, every field by default: '
+            f'{", ".join(ClientResponse.model_fields)}'
+        ),
+    ),
 ):
     """
-    Get all clients.
+    Get a page of clients ordered by creation.
+    `fields` narrows the returned fields.
     """
-    query = select(Client)
+    fields = client_pages.parse_fields(fields)
+    query = client_pages.select('created_at', fields=fields)
 
-    clients = await session.scalars(query)
+    rows, next_cursor = await paginate(
+        session, query, Client, limit=limit, cursor=cursor
+    )
 
-    return {'clients': clients.all()}
+    return client_pages.response(rows, next_cursor, fields)
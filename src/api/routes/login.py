@@ -8,7 +8,11 @@ from sqlalchemy import select
 from src.api.dependencies import CurrentUser, T_Session
 from src.models import User
 from src.schemas.token import Token
-from src.security import create_access_token, verify_password
+from src.security import (
+    create_access_token,
+    user_token_claims,
+    verify_password_async,
+)
 
 router = APIRouter()
 
@@ -31,30 +35,24 @@ async def login_for_access_token(
             detail='Incorrect email or password',
         )
 
-    if not verify_password(form_data.password, user_db.password):
+    # Release the connection while argon2 runs so slow logins do not hold
+    # pool slots that other requests are waiting for.
+    await session.close()
+
+    if not await verify_password_async(form_data.password, user_db.password):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Incorrect email or password',
         )
 
     # Create access token
-    access_token = create_access_token(
-        data={
-            'sub': user_db.email,
-            'is_superuser': user_db.is_superuser,
-        }
-    )
+    access_token = create_access_token(data=user_token_claims(user_db))
 
     return {'access_token': access_token, 'token_type': 'bearer'}
 
 
 @router.post('/refresh_token', response_model=Token)
 async def refresh_access_token(user: CurrentUser):
-    new_access_token = create_access_token(
-        data={
-            'sub': user.email,
-            'is_superuser': user.is_superuser,
-        }
-    )
+    new_access_token = create_access_token(data=user_token_claims(user))
 
     return {'access_token': new_access_token, 'token_type': 'bearer'}
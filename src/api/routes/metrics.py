@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from src.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter()
+
+
+@router.get(path='/metrics', include_in_schema=False)
+async def read_metrics() -> Response:
+    """
+    Expose this worker's metrics in Prometheus text format.
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,28 +1,120 @@
+from collections import defaultdict
 from http import HTTPStatus
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.api.dependencies import (
-    CurrentUser,
+    CurrentIdentity,
     T_Session,
     get_current_active_superuser,
 )
-from src.models import Project
+from src.models import Project, Task
 from src.schemas.base import Message
 from src.schemas.projects import (
+    ProjectAnalytics,
     ProjectRequestCreate,
     ProjectRequestGet,
-    ProjectRequestGetList,
     ProjectResponse,
     ProjectResquestUpdate,
 )
-from src.utils.category_utils import get_or_create_category
+from src.schemas.relations import (
+    ProjectWithRelations,
+    ProjectWithRelationsList,
+)
+from src.utils.category_utils import (
+    cached_category_id,
+    category_is_active,
+    get_or_create_category_id,
+)
+from src.utils.etag import check_if_match, not_modified, row_etag
+from src.utils.export import NDJSON_MEDIA_TYPE, stream_ndjson
+from src.utils.includes import Includes
+from src.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    paginate,
+)
+from src.utils.project_stats import (
+    get_project_analytics,
+    project_snapshot,
+    update_project_stats,
+)
+from src.utils.serialization import PageSerializer, RawJSONResponse
 
 router = APIRouter()
 
+project_pages = PageSerializer(Project, ProjectRequestGet, 'projects')
+project_includes = Includes(
+    ProjectWithRelations,
+    'projects',
+    {
+        # Routes load tasks with _load_latest_tasks instead, bounded
+        'tasks': selectinload(Project.tasks).undefer(Task.description),
+        'category': joinedload(Project.category),
+    },
+)
+INCLUDE_DESCRIPTION = (
+    f'Comma separated relations to embed: {", ".join(project_includes.names)}'
+)
+
+# Tasks embedded per project by include=tasks: the latest active ones,
+# so responses stay bounded; GET /tasks/?project_id= pages through all
+INCLUDED_TASKS = 20
+
+
+def _include_options(include: list[str]) -> list:
+    # Loader options of the included relations but tasks
+    return project_includes.options(
+        name for name in include if name != 'tasks'
+    )
+
+
+async def _load_latest_tasks(
+    session: AsyncSession, projects: list[Project]
+) -> None:
+    # One statement for all `projects`, ranking each project's tasks
+    if not projects:
+        return
+
+    ranked = (
+        select(
+            *Task.__table__.columns,
+            func
+            .row_number()
+            .over(
+                partition_by=Task.project_id,
+                order_by=(Task.created_at.desc(), Task.id.desc()),
+            )
+            .label('rank'),
+        )
+        .where(
+            Task.project_id.in_([project.id for project in projects]),
+            Task.is_active,
+        )
+        .subquery()
+    )
+    latest = aliased(Task, ranked)
+    query = (
+        select(latest)
+        .options(undefer(latest.description))
+        .where(ranked.c.rank <= INCLUDED_TASKS)
+        .order_by(ranked.c.rank)
+    )
+
+    tasks = defaultdict(list)
+    for task in await session.scalars(query):
+        tasks[task.project_id].append(task)
+    for project in projects:
+        set_committed_value(project, 'tasks', tasks[project.id])
+
 
 @router.post(
     path='/',
@@ -32,15 +124,25 @@ router = APIRouter()
 async def create_project(
     session: T_Session,
     project: ProjectRequestCreate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ) -> Project:
     """Create a new project."""
-    # Check if project exists
-    project_db = await session.scalar(
-        select(Project).where(Project.name == project.name)
-    )
+    # Check if project exists, and if the cached id of the category is
+    # still active
+    project_exists, category_active = (
+        await session.execute(
+            select(
+                select(Project.id)
+                .where(Project.name == project.name)
+                .exists(),
+                category_is_active(
+                    cached_category_id(session, project.category_name)
+                ),
+            )
+        )
+    ).one()
 
-    if project_db:
+    if project_exists:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST, detail='Project already exists'
         )
@@ -50,11 +152,9 @@ async def create_project(
     # Handle category_name if provided
     category_name = project_data.pop('category_name', None)
     if category_name:
-        category = await get_or_create_category(
-            db=session, category_name=category_name
+        project_data['category_id'] = await get_or_create_category_id(
+            db=session, category_name=category_name, active=category_active
         )
-        if category:
-            project_data['category_id'] = category.id
 
     # Set the fields from the request
     project_data['created_by'] = current_user.id
@@ -63,26 +163,83 @@ async def create_project(
     project_db = Project(**project_data)
 
     session.add(project_db)
+    await update_project_stats(session, None, project_snapshot(project_db))
     await session.commit()
     await session.refresh(project_db)
 
     return project_db
 
 
+@router.get(
+    path='/export',
+    status_code=HTTPStatus.OK,
+    response_class=StreamingResponse,
+)
+async def export_projects(
+    session: T_Session,
+    current_user: CurrentIdentity,
+) -> StreamingResponse:
+    """
+    Stream every project as newline-delimited JSON.
+    """
+    query = select(Project).order_by(Project.created_at, Project.id)
+
+    return StreamingResponse(
+        stream_ndjson(session, query, ProjectRequestGet),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.get(
+    path='/analytics',
+    status_code=HTTPStatus.OK,
+    response_model=ProjectAnalytics,
+)
+async def read_project_analytics(
+    session: T_Session,
+    current_user: CurrentIdentity,
+) -> dict:
+    """
+    Get the count, total and average value of active projects,
+    grouped by category, status and target month.
+    """
+    return await get_project_analytics(session)
+
+
 @router.get(
     path='/{project_id}',
     status_code=HTTPStatus.OK,
-    response_model=ProjectRequestGet,
+    response_model=ProjectWithRelations,
+    response_model_exclude_unset=True,
 )
-async def read_project_by_id(
+async def read_project_by_id(  # noqa: PLR0913, PLR0917
     session: T_Session,
     project_id: UUID,
-    current_user: CurrentUser,
-) -> Project:
+    current_user: CurrentIdentity,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    include: str | None = Query(default=None, description=INCLUDE_DESCRIPTION),
+) -> dict:
     """
-    Get a specific project.
+    Get a specific project, with its category and latest
+    `INCLUDED_TASKS` active tasks if included.
+    Answers 304 when `If-None-Match` holds the current ETag; the ETag
+    covers the project only, so it is not used with `include`.
     """
-    query = select(Project).where(Project.id == project_id)
+    include = project_includes.parse(include)
+
+    if not include and (
+        cached := await not_modified(
+            session, Project, project_id, if_none_match
+        )
+    ):
+        return cached
+
+    query = (
+        select(Project)
+        .options(*_include_options(include))
+        .where(Project.id == project_id)
+    )
 
     project_db = await session.scalar(query)
 
@@ -91,26 +248,56 @@ async def read_project_by_id(
             detail="Project doesn't exist", status_code=HTTPStatus.NOT_FOUND
         )
 
-    return project_db
+    if 'tasks' in include:
+        await _load_latest_tasks(session, [project_db])
+
+    if not include:
+        response.headers['ETag'] = row_etag(project_db)
+    return project_includes.embed(project_db, include)
 
 
 @router.get(
     path='/',
     status_code=HTTPStatus.OK,
-    response_model=ProjectRequestGetList,
+    response_model=ProjectWithRelationsList,
+    response_model_exclude_unset=True,
 )
-async def read_all_projects(
+async def read_all_projects(  # noqa: PLR0913, PLR0917
     session: T_Session,
-    current_user: CurrentUser,
-) -> list[Project]:
+    current_user: CurrentIdentity,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = Query(
+        default=None,
+        description=(
+            'Comma separated fields to return, every field by default: '
+            f'{", ".join(ProjectRequestGet.model_fields)}'
+        ),
+    ),
+    include: str | None = Query(default=None, description=INCLUDE_DESCRIPTION),
+) -> RawJSONResponse:
     """
-    Get all projects.
+    Get a page of projects ordered by creation.
+    `fields` narrows the returned fields, `include` embeds the category
+    and the latest `INCLUDED_TASKS` active tasks of each project.
     """
-    query = select(Project)
+    fields = project_pages.parse_fields(fields)
+    include = project_includes.parse(include)
+
+    if include:
+        query = select(Project).options(*_include_options(include))
+    else:
+        query = project_pages.select('created_at', fields=fields)
 
-    projects_db = await session.scalars(query)
+    rows, next_cursor = await paginate(
+        session, query, Project, limit=limit, cursor=cursor
+    )
 
-    return {'projects': projects_db.all()}
+    if 'tasks' in include:
+        await _load_latest_tasks(session, rows)
+    if include:
+        return project_includes.response(rows, next_cursor, include, fields)
+    return project_pages.response(rows, next_cursor, fields)
 
 
 @router.delete(
@@ -122,7 +309,7 @@ async def read_all_projects(
 async def delete_project(
     session: T_Session,
     project_id: UUID,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ) -> dict:
     """
     Delete (deactivate) a project.
@@ -136,10 +323,12 @@ async def delete_project(
             detail="Project doesn't exist", status_code=HTTPStatus.NOT_FOUND
         )
 
+    before = project_snapshot(project_db)
     project_db.is_active = False
     project_db.updated_by = current_user.id
 
     session.add(project_db)
+    await update_project_stats(session, before, None)
     await session.commit()
 
     return {'message': 'Project deleted'}
@@ -150,16 +339,33 @@ async def delete_project(
     status_code=HTTPStatus.OK,
     response_model=ProjectRequestGet,
 )
-async def update_project(
+async def update_project(  # noqa: PLR0913, PLR0917
     session: T_Session,
     project_id: UUID,
     project: ProjectResquestUpdate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
 ) -> Project:
-    """Update a project."""
-    project_db = await session.scalar(
-        select(Project).where(Project.id == project_id)
-    )
+    """
+    Update a project.
+    With `If-Match`, answers 412 unless it holds the current ETag.
+    """
+    project_data = project.model_dump(exclude_unset=True)
+
+    # Along with whether the cached id of the category is still active
+    query = select(
+        Project,
+        category_is_active(
+            cached_category_id(session, project_data.get('category_name'))
+        ),
+    ).where(Project.id == project_id)
+    if if_match:
+        # Keep concurrent updates out until this one commits
+        query = query.with_for_update()
+
+    row = (await session.execute(query)).first()
+    project_db, category_active = row or (None, None)
 
     try:
         if not project_db:
@@ -168,26 +374,31 @@ async def update_project(
                 status_code=HTTPStatus.NOT_FOUND,
             )
 
-        project_data = project.model_dump(exclude_unset=True)
+        check_if_match(if_match, project_db)
 
         # Handle category_name if provided
         category_name = project_data.pop('category_name', None)
         if category_name:
-            category = await get_or_create_category(
-                db=session, category_name=category_name
+            project_data['category_id'] = await get_or_create_category_id(
+                db=session,
+                category_name=category_name,
+                active=category_active,
             )
-            if category:
-                project_data['category_id'] = category.id
 
         project_data['updated_by'] = current_user.id
+        before = project_snapshot(project_db)
 
         for key, value in project_data.items():
             setattr(project_db, key, value)
 
         session.add(project_db)
+        await update_project_stats(
+            session, before, project_snapshot(project_db)
+        )
         await session.commit()
         await session.refresh(project_db)
 
+        response.headers['ETag'] = row_etag(project_db)
         return project_db
 
     except IntegrityError:
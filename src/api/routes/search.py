@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Query
+
+from src.api.dependencies import CurrentIdentity, T_Session
+from src.schemas.search import SearchResponse
+from src.utils.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search
+
+router = APIRouter()
+
+SEARCH_QUERY_MAX_LENGTH = 200
+
+
+@router.get(
+    path='/',
+    status_code=HTTPStatus.OK,
+    response_model=SearchResponse,
+)
+async def search_tasks_and_projects(
+    session: T_Session,
+    current_user: CurrentIdentity,
+    q: str = Query(min_length=1, max_length=SEARCH_QUERY_MAX_LENGTH),
+    limit: int = Query(
+        default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT
+    ),
+) -> dict:
+    """
+    Search task titles and descriptions and project names.
+    Results are ranked, best matches first.
+    """
+    return {'results': await search(session, q, limit)}
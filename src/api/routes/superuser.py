@@ -1,21 +1,34 @@
 from http import HTTPStatus
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from src.api.dependencies import (
     T_Session,
+    bump_token_version,
     get_current_active_superuser,
+    invalidate_cached_user,
+    user_cache,
 )
 from src.models import User
-from src.schemas.base import Message
+from src.schemas.base import CacheStats, Message
 from src.schemas.users import UserList, UserPublic, UserSchema, UserUpdate
-from src.security import get_password_hash
+from src.security import get_password_hash_async
+from src.utils.etag import check_if_match, not_modified, row_etag
+from src.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    paginate,
+)
+from src.utils.serialization import PageSerializer
 
 router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
 
+user_pages = PageSerializer(User, UserPublic, 'users')
+
 
 @router.post(
     '/',
@@ -33,7 +46,7 @@ async def create_user(user: UserSchema, session: T_Session):
         )
 
     user_attrs = user.model_dump()
-    user_attrs['password'] = get_password_hash(user.password)
+    user_attrs['password'] = await get_password_hash_async(user.password)
 
     new_user = User(**user_attrs)
 
@@ -47,25 +60,45 @@ async def create_user(user: UserSchema, session: T_Session):
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
 async def read_users(
     session: T_Session,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
 ):
     """
-    Get all users.
+    Get a page of users ordered by creation.
     """
-    query = select(User)
+    query = user_pages.select('created_at')
+
+    rows, next_cursor = await paginate(
+        session, query, User, limit=limit, cursor=cursor
+    )
+
+    return user_pages.response(rows, next_cursor)
 
-    db_users = await session.scalars(query)
 
-    return {'users': db_users.all()}
+@router.get(
+    '/cache-stats', status_code=HTTPStatus.OK, response_model=CacheStats
+)
+async def read_user_cache_stats():
+    """
+    Get size and hit/miss counters of this worker's user cache.
+    """
+    return user_cache.stats()
 
 
 @router.get('/{user_id}', status_code=HTTPStatus.OK, response_model=UserPublic)
 async def read_user(
     user_id: UUID,
     session: T_Session,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """
     Get a specific user.
+    Answers 304 when `If-None-Match` holds the current ETag.
     """
+    if cached := await not_modified(session, User, user_id, if_none_match):
+        return cached
+
     query = select(User).where(User.id == user_id)
 
     db_user = await session.scalar(query)
@@ -75,6 +108,7 @@ async def read_user(
             status_code=HTTPStatus.NOT_FOUND, detail='User Not Found'
         )
 
+    response.headers['ETag'] = row_etag(db_user)
     return db_user
 
 
@@ -95,10 +129,13 @@ async def delete_user(
         )
 
     db_user.is_active = False
+    bump_token_version(db_user)
 
     session.add(db_user)
     await session.commit()
 
+    invalidate_cached_user(db_user)
+
     return {'message': 'User deleted'}
 
 
@@ -111,27 +148,49 @@ async def update_user(
     user_id: UUID,
     user: UserUpdate,
     session: T_Session,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
 ):
-    db_user = await session.scalar(select(User).where(User.id == user_id))
+    """
+    Update a user.
+    With `If-Match`, answers 412 unless it holds the current ETag.
+    """
+    query = select(User).where(User.id == user_id)
+    if if_match:
+        # Keep concurrent updates out until this one commits
+        query = query.with_for_update()
+
+    db_user = await session.scalar(query)
 
     if db_user is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='User Not Found'
         )
 
+    check_if_match(if_match, db_user)
+
+    previous_email = db_user.email
+
     try:
         user_data = user.model_dump(exclude_unset=True)
 
         if 'password' in user_data:
-            user_data['password'] = get_password_hash(user_data['password'])
+            user_data['password'] = await get_password_hash_async(
+                user_data['password']
+            )
 
         for key, value in user_data.items():
             setattr(db_user, key, value)
 
+        bump_token_version(db_user)
+
         session.add(db_user)
         await session.commit()
         await session.refresh(db_user)
 
+        invalidate_cached_user(db_user, previous_email)
+
+        response.headers['ETag'] = row_etag(db_user)
         return db_user
 
     except IntegrityError:
@@ -1,23 +1,74 @@
 from http import HTTPStatus
-from uuid import UUID
+from typing import Annotated
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, insert, select
+from sqlalchemy.orm import joinedload, undefer
 
-from src.api.dependencies import CurrentUser, T_Session
-from src.models import Project, Task
+from src.api.dependencies import CurrentIdentity, T_Session
+from src.models import Project, Task, session_tenant_id
 from src.schemas.base import Message
+from src.schemas.relations import TaskWithRelations, TaskWithRelationsList
 from src.schemas.tasks import (
+    TaskBulkResponse,
+    TaskFilterParams,
+    TaskListParams,
     TaskRequestCreate,
     TaskRequestGet,
-    TaskRequestGetList,
     TaskRequestUpdate,
     TaskResponse,
 )
-from src.utils.category_utils import get_or_create_category
+from src.utils.category_utils import (
+    cached_category_id,
+    category_is_active,
+    get_or_create_category_id,
+    get_or_create_category_ids,
+)
+from src.utils.etag import check_if_match, not_modified, row_etag
+from src.utils.export import NDJSON_MEDIA_TYPE, stream_ndjson
+from src.utils.includes import Includes
+from src.utils.pagination import paginate
+from src.utils.serialization import PageSerializer, RawJSONResponse
 
 router = APIRouter()
 
+TASK_BULK_MAX_ITEMS = 10_000
+TASK_BULK_CHUNK_SIZE = 1_000
+
+task_pages = PageSerializer(Task, TaskRequestGet, 'tasks')
+task_includes = Includes(
+    TaskWithRelations,
+    'tasks',
+    {
+        'project': joinedload(Task.project),
+        'category': joinedload(Task.category),
+    },
+)
+
+
+def _filter_tasks(query: Select, filters: TaskFilterParams) -> Select:
+    """Apply the filters of `filters` to a select over `Task`."""
+    if filters.project_id:
+        query = query.where(Task.project_id == filters.project_id)
+    if filters.category_id:
+        query = query.where(Task.category_id == filters.category_id)
+    if filters.created_by:
+        query = query.where(Task.created_by == filters.created_by)
+    if filters.status:
+        query = query.where(Task.status.in_(filters.status))
+    if filters.priority:
+        query = query.where(Task.priority.in_(filters.priority))
+    if filters.is_active is not None:
+        query = query.where(Task.is_active == filters.is_active)
+    if filters.due_after:
+        query = query.where(Task.due_date >= filters.due_after)
+    if filters.due_before:
+        query = query.where(Task.due_date <= filters.due_before)
+
+    return query
+
 
 @router.post(
     path='/',
@@ -27,13 +78,21 @@ router = APIRouter()
 async def create_task(
     session: T_Session,
     task: TaskRequestCreate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ) -> Task:
     """Create a new task."""
-    # Check if project exists
-    project_db = await session.scalar(
-        select(Project).where(Project.id == task.project_id)
-    )
+    # Check if project exists, and if the cached id of the category is
+    # still active
+    project_db, category_active = (
+        await session.execute(
+            select(
+                Project,
+                category_is_active(
+                    cached_category_id(session, task.category_name)
+                ),
+            ).where(Project.id == task.project_id)
+        )
+    ).first() or (None, None)
 
     if not project_db:
         raise HTTPException(
@@ -45,11 +104,9 @@ async def create_task(
     # Handle category_name if provided
     category_name = task_data.pop('category_name', None)
     if category_name:
-        category = await get_or_create_category(
-            db=session, category_name=category_name
+        task_data['category_id'] = await get_or_create_category_id(
+            db=session, category_name=category_name, active=category_active
         )
-        if category:
-            task_data['category_id'] = category.id
 
     task_data['created_by'] = current_user.id
 
@@ -60,25 +117,141 @@ async def create_task(
 
     session.add(task_db)
     await session.commit()
-    await session.refresh(task_db)
+    # Only the creation time comes from the database, a full refresh
+    # would also unload the deferred description
+    await session.refresh(task_db, ['created_at'])
 
     return task_db
 
 
+@router.post(
+    path='/bulk',
+    status_code=HTTPStatus.OK,
+    response_model=TaskBulkResponse,
+)
+async def create_tasks_bulk(
+    session: T_Session,
+    tasks: Annotated[
+        list[TaskRequestCreate], Body(max_length=TASK_BULK_MAX_ITEMS)
+    ],
+    current_user: CurrentIdentity,
+) -> dict:
+    """
+    Create many tasks at once.
+    Reports success or error for each item, in request order.
+    """
+    # Validate every referenced project with a single query
+    project_ids = set(
+        await session.scalars(
+            select(Project.id).where(
+                Project.id.in_({task.project_id for task in tasks})
+            )
+        )
+    )
+
+    category_ids = await get_or_create_category_ids(
+        session,
+        [
+            task.category_name
+            for task in tasks
+            if task.category_name and task.project_id in project_ids
+        ],
+    )
+
+    results = []
+    rows = []
+
+    for index, task in enumerate(tasks):
+        if task.project_id not in project_ids:
+            results.append({'index': index, 'error': "Project doesn't exist"})
+            continue
+
+        task_data = task.model_dump(exclude={'category_name'})
+        task_data['id'] = uuid4()
+        task_data['created_by'] = current_user.id
+        # Core inserts skip the flush that stamps the tenant
+        task_data['tenant_id'] = session_tenant_id(session)
+        task_data['category_id'] = category_ids.get(
+            (task.category_name or '').strip()
+        )
+
+        rows.append(task_data)
+        results.append({'index': index, 'id': task_data['id']})
+
+    # Optional fields left as None would otherwise split each chunk into
+    # one statement per combination of present keys
+    statement = insert(Task).execution_options(render_nulls=True)
+    for start in range(0, len(rows), TASK_BULK_CHUNK_SIZE):
+        await session.execute(
+            statement, rows[start : start + TASK_BULK_CHUNK_SIZE]
+        )
+
+    await session.commit()
+
+    return {'created': len(rows), 'results': results}
+
+
+@router.get(
+    path='/export',
+    status_code=HTTPStatus.OK,
+    response_class=StreamingResponse,
+)
+async def export_tasks(
+    session: T_Session,
+    current_user: CurrentIdentity,
+    filters: Annotated[TaskFilterParams, Query()],
+) -> StreamingResponse:
+    """
+    Stream every task as newline-delimited JSON.
+    Accepts the same filters as the task list, always in creation order.
+    """
+    query = _filter_tasks(
+        select(Task).options(undefer(Task.description)), filters
+    ).order_by(Task.created_at, Task.id)
+
+    return StreamingResponse(
+        stream_ndjson(session, query, TaskRequestGet),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.get(
     path='/{task_id}',
     status_code=HTTPStatus.OK,
-    response_model=TaskRequestGet,
+    response_model=TaskWithRelations,
+    response_model_exclude_unset=True,
 )
-async def read_task_by_id(
+async def read_task_by_id(  # noqa: PLR0913, PLR0917
     session: T_Session,
     task_id: UUID,
-    current_user: CurrentUser,
-) -> Task:
+    current_user: CurrentIdentity,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    include: str | None = Query(
+        default=None,
+        description=(
+            'Comma separated relations to embed: '
+            f'{", ".join(task_includes.names)}'
+        ),
+    ),
+) -> dict:
     """
-    Get a specific task.
+    Get a specific task, with its project and category if included.
+    Answers 304 when `If-None-Match` holds the current ETag; the ETag
+    covers the task only, so it is not used with `include`.
     """
-    query = select(Task).where(Task.id == task_id)
+    include = task_includes.parse(include)
+
+    if not include and (
+        cached := await not_modified(session, Task, task_id, if_none_match)
+    ):
+        return cached
+
+    query = (
+        select(Task)
+        .options(undefer(Task.description), *task_includes.options(include))
+        .where(Task.id == task_id)
+    )
 
     task_db = await session.scalar(query)
 
@@ -87,31 +260,51 @@ async def read_task_by_id(
             detail="Task doesn't exist", status_code=HTTPStatus.NOT_FOUND
         )
 
-    return task_db
+    if not include:
+        response.headers['ETag'] = row_etag(task_db)
+    return task_includes.embed(task_db, include)
 
 
 @router.get(
     path='/',
     status_code=HTTPStatus.OK,
-    response_model=TaskRequestGetList,
+    response_model=TaskWithRelationsList,
+    response_model_exclude_unset=True,
 )
 async def read_all_tasks(
     session: T_Session,
-    current_user: CurrentUser,
-    project_id: UUID | None = None,
-) -> dict:
+    current_user: CurrentIdentity,
+    params: Annotated[TaskListParams, Query()],
+) -> RawJSONResponse:
     """
-    Get all tasks.
-    Optionally filter by project_id.
+    Get a page of tasks, ordered by creation unless `sort` is given.
+    Filter by project, category, creator, status, priority, active flag
+    and due date range. `fields` narrows the returned fields, `include`
+    embeds the project and category of each task.
     """
-    query = select(Task)
+    fields = task_pages.parse_fields(params.fields)
+    include = task_includes.parse(params.include)
+    sort_columns = [name for name, _ in params.order_by]
 
-    if project_id:
-        query = query.where(Task.project_id == project_id)
-
-    tasks_db = await session.scalars(query)
+    if include:
+        query = select(Task).options(
+            undefer(Task.description), *task_includes.options(include)
+        )
+    else:
+        query = task_pages.select(*sort_columns, fields=fields)
+
+    rows, next_cursor = await paginate(
+        session,
+        _filter_tasks(query, params),
+        Task,
+        limit=params.limit,
+        cursor=params.cursor,
+        order_by=params.order_by,
+    )
 
-    return {'tasks': tasks_db.all()}
+    if include:
+        return task_includes.response(rows, next_cursor, include, fields)
+    return task_pages.response(rows, next_cursor, fields)
 
 
 @router.delete(
@@ -122,7 +315,7 @@ async def read_all_tasks(
 async def delete_task(
     session: T_Session,
     task_id: UUID,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
 ) -> dict:
     """
     Delete (deactivate) a task.
@@ -148,14 +341,37 @@ async def delete_task(
     status_code=HTTPStatus.OK,
     response_model=TaskRequestGet,
 )
-async def update_task(
+async def update_task(  # noqa: PLR0913, PLR0917
     session: T_Session,
     task_id: UUID,
     task: TaskRequestUpdate,
-    current_user: CurrentUser,
+    current_user: CurrentIdentity,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
 ) -> Task:
-    """Update a task."""
-    task_db = await session.scalar(select(Task).where(Task.id == task_id))
+    """
+    Update a task.
+    With `If-Match`, answers 412 unless it holds the current ETag.
+    """
+    task_data = task.model_dump(exclude_unset=True)
+
+    # Along with whether the cached id of the category is still active
+    query = (
+        select(
+            Task,
+            category_is_active(
+                cached_category_id(session, task_data.get('category_name'))
+            ),
+        )
+        .options(undefer(Task.description))
+        .where(Task.id == task_id)
+    )
+    if if_match:
+        # Keep concurrent updates out until this one commits
+        query = query.with_for_update()
+
+    row = (await session.execute(query)).first()
+    task_db, category_active = row or (None, None)
 
     if not task_db:
         raise HTTPException(
@@ -163,16 +379,14 @@ async def update_task(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
-    task_data = task.model_dump(exclude_unset=True)
+    check_if_match(if_match, task_db)
 
     # Handle category_name if provided
     category_name = task_data.pop('category_name', None)
     if category_name:
-        category = await get_or_create_category(
-            db=session, category_name=category_name
+        task_data['category_id'] = await get_or_create_category_id(
+            db=session, category_name=category_name, active=category_active
         )
-        if category:
-            task_data['category_id'] = category.id
 
     # If project_id is provided, verify the project exists
     if task_data.get('project_id'):
@@ -199,6 +413,7 @@ async def update_task(
 
     session.add(task_db)
     await session.commit()
-    await session.refresh(task_db)
+    await session.refresh(task_db, ['updated_at'])
 
+    response.headers['ETag'] = row_etag(task_db)
     return task_db
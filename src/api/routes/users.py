@@ -3,10 +3,15 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException
 
-from src.api.dependencies import CurrentUser, T_Session
+from src.api.dependencies import (
+    CurrentUser,
+    T_Session,
+    bump_token_version,
+    invalidate_cached_user,
+)
 from src.schemas.base import Message
 from src.schemas.users import PasswordChange, UserPublic
-from src.security import get_password_hash
+from src.security import get_password_hash_async
 
 router = APIRouter()
 
@@ -34,11 +39,14 @@ async def update_password_me(
         )
 
     # Set the new password with hashing
-    current_user.password = get_password_hash(passwords.password)
+    current_user.password = await get_password_hash_async(passwords.password)
+    bump_token_version(current_user)
 
     session.add(current_user)
     await session.commit()
 
+    invalidate_cached_user(current_user)
+
     return {'message': 'Password has been changed!'}
 
 
@@ -51,8 +59,11 @@ async def delete_user_me(
     """
     # Soft delete - just mark as inactive
     current_user.is_active = False
+    bump_token_version(current_user)
 
     session.add(current_user)
     await session.commit()
 
+    invalidate_cached_user(current_user)
+
     return Message(message='User deleted.')
@@ -0,0 +1,44 @@
+import argparse
+from asyncio import run
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import engine
+from src.core.settings import settings
+from src.utils.archive import archive_inactive
+
+
+async def main(
+    retention_days: int, batch_size: int, pause_seconds: float
+) -> dict[str, int]:
+    logger.info(f'Archiving rows deleted over {retention_days} days ago')
+
+    # Not scoped to a tenant, the job covers all of them
+    async with AsyncSession(engine) as session:
+        archived = await archive_inactive(
+            session, retention_days, batch_size, pause_seconds
+        )
+
+    for table, count in archived.items():
+        logger.info(f'{count} {table} archived')
+
+    return archived
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Move soft-deleted rows to the archive tables'
+    )
+    parser.add_argument(
+        '--retention-days', type=int, default=settings.ARCHIVE_RETENTION_DAYS
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE
+    )
+    parser.add_argument(
+        '--pause-seconds', type=float, default=settings.ARCHIVE_PAUSE_SECONDS
+    )
+    args = parser.parse_args()
+
+    run(main(args.retention_days, args.batch_size, args.pause_seconds))
@@ -0,0 +1,63 @@
+"""In-process caches local to each API worker."""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after `ttl` seconds.
+
+    Hits and misses are counted so the cache can be monitored. A cache
+    built with `maxsize` or `ttl` equal to zero never stores anything.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None if absent/expired."""
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value`, evicting the least recently used entries."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop `key` from the cache if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return the current size and hit/miss counters."""
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -1,14 +1,347 @@
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter, time
+from typing import Iterator, Optional
 
+from loguru import logger
+from sqlalchemy import event, exc, make_url, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.metrics import Counter, Histogram
 from src.core.settings import settings
 from src.models import User
-from src.security import get_password_hash
+from src.security import get_password_hash_async
+from src.utils.tenants import scope_to_default_tenant
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    'db_pool_checkout_seconds',
+    'Time spent waiting for a pooled database connection.',
+)
+POOL_OVERFLOW_TOTAL = Counter(
+    'db_pool_overflow_total',
+    'Connections opened beyond the pool size.',
+)
+POOL_TIMEOUTS_TOTAL = Counter(
+    'db_pool_timeouts_total',
+    'Checkouts that gave up waiting for a connection.',
+)
+QUERIES_TOTAL = Counter(
+    'db_queries_total',
+    'Statements executed on the database.',
+)
+QUERY_SECONDS = Histogram(
+    'db_query_seconds',
+    'Time spent executing a single statement.',
+)
+SESSIONS_TOTAL = Counter(
+    'db_sessions_total',
+    'Request sessions opened, by engine and routing reason.',
+    ('engine', 'reason'),
+)
+REPLICA_FALLBACKS_TOTAL = Counter(
+    'db_replica_fallbacks_total',
+    'Read sessions moved to the primary because the replica failed.',
+)
+
+# Requests that may read from the replica, they never write
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class QueryStats:
+    """Statements executed while a `track_queries` block is active."""
+
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # SQL text -> executions. Bound parameters are not part of the
+        # text, so a lazy load repeated per row shows as one entry.
+        self.statements: dict[str, int] = {}
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Return the statements executed at least `threshold` times."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.items()
+            if count >= threshold
+        ]
+
+
+# Set per request by the route instrumentation. SQLAlchemy runs engine
+# events in a greenlet that shares the calling task's context.
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    'query_stats', default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed inside the block."""
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time and overflow events."""
+
+    def connect(self):
+        overflow = self._overflow
+        start = perf_counter()
+
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS_TOTAL.inc()
+            logger.warning(
+                'Database pool exhausted: size={} overflow={}',
+                self.size(),
+                self.overflow(),
+            )
+            raise
+
+        POOL_CHECKOUT_SECONDS.observe(perf_counter() - start)
+
+        if self._overflow > max(overflow, 0):
+            POOL_OVERFLOW_TOTAL.inc()
+
+        return connection
+
+
+def engine_options(database_url: str) -> dict:
+    """
+    Build `create_async_engine` keyword arguments for `database_url`.
+
+    Postgres drivers get a sized, instrumented pool plus driver tuning
+    (prepared statement cache, `statement_timeout`, `application_name`).
+    SQLite keeps SQLAlchemy's default pool and only gets a busy timeout.
+    """
+    url = make_url(database_url)
+
+    if url.get_backend_name() == 'sqlite':
+        return {
+            'connect_args': {'timeout': settings.SQLITE_BUSY_TIMEOUT_SECONDS}
+        }
+
+    options = {
+        'poolclass': InstrumentedAsyncPool,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+    if url.get_driver_name() == 'asyncpg':
+        server_settings = {'application_name': settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings['statement_timeout'] = str(
+                settings.DB_STATEMENT_TIMEOUT_MS
+            )
+        options['connect_args'] = {
+            'server_settings': server_settings,
+            'statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE,
+            'prepared_statement_cache_size': (
+                settings.DB_STATEMENT_CACHE_SIZE
+            ),
+        }
+
+    elif url.get_driver_name() == 'psycopg':
+        connect_args = {'application_name': settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args['options'] = (
+                f'-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}'
+            )
+        if not settings.DB_STATEMENT_CACHE_SIZE:
+            connect_args['prepare_threshold'] = None
+        options['connect_args'] = connect_args
+
+    return options
+
+
+def _before_cursor_execute(  # noqa: PLR0913, PLR0917
+    conn, cursor, statement, params, context, many
+):
+    context.query_start = perf_counter()
+
+
+def _after_cursor_execute(  # noqa: PLR0913, PLR0917
+    conn, cursor, statement, params, context, many
+):
+    elapsed = perf_counter() - context.query_start
+
+    QUERIES_TOTAL.inc()
+    QUERY_SECONDS.observe(elapsed)
+
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        # executemany batches legitimately reuse one statement
+        if not many:
+            stats.statements[statement] = (
+                stats.statements.get(statement, 0) + 1
+            )
+
 
-engine = create_async_engine(settings.DATABASE_URL)
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    """Record the count and duration of statements run on the engine."""
+    sync_engine = async_engine.sync_engine
+
+    if event.contains(
+        sync_engine, 'before_cursor_execute', _before_cursor_execute
+    ):
+        return
+
+    event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _begin_before_savepoint(conn, name):
+    if conn.connection.driver_connection.in_transaction:
+        return
+
+    # On the raw cursor, so it is not counted as a statement, like the
+    # BEGIN Postgres drivers emit themselves
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute('BEGIN')
+    finally:
+        cursor.close()
+
+
+def begin_sqlite_transactions(async_engine: AsyncEngine) -> None:
+    """
+    Make a SQLite savepoint part of the session's transaction.
+
+    The sqlite3 module only emits BEGIN before DML, so a SAVEPOINT taken
+    before any write would open the transaction itself, and releasing it
+    would commit. Reads still run outside transactions, so concurrent
+    writers don't deadlock upgrading their read locks.
+    """
+    sync_engine = async_engine.sync_engine
+
+    if sync_engine.dialect.name != 'sqlite' or event.contains(
+        sync_engine, 'savepoint', _begin_before_savepoint
+    ):
+        return
+
+    event.listen(sync_engine, 'savepoint', _begin_before_savepoint)
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)
+)
+instrument_engine(engine)
+begin_sqlite_transactions(engine)
+
+read_engine: Optional[AsyncEngine] = None
+if settings.READ_DATABASE_URL:
+    read_engine = create_async_engine(
+        settings.READ_DATABASE_URL,
+        **engine_options(settings.READ_DATABASE_URL),
+    )
+    instrument_engine(read_engine)
+    begin_sqlite_transactions(read_engine)
+
+
+def has_replica() -> bool:
+    """Tell if `READ_DATABASE_URL` configures a read replica."""
+    return read_engine is not None
+
+
+# Monotonic time before which the replica is not tried again
+_replica_down_until = 0.0
+
+
+def primary_until(now: Optional[float] = None) -> str:
+    """
+    Return the value of the read-your-writes cookie set after a write.
+
+    Until the wall clock time it holds, `READ_YOUR_WRITES_SECONDS` from
+    `now`, the client's reads go to the primary.
+    """
+    return f'{(now or time()) + settings.READ_YOUR_WRITES_SECONDS:.3f}'
+
+
+def route_session(method: str, sticky_until: Optional[str]) -> str:
+    """
+    Decide why a request gets a session on the replica or the primary.
+
+    Args:
+        method: HTTP method of the request
+        sticky_until: Read-your-writes cookie of the client, if any
+
+    Returns:
+        `read` for the replica; `no_replica`, `write`, `sticky` or
+        `replica_down` for the primary
+    """
+    if not has_replica():
+        return 'no_replica'
+    if method not in SAFE_METHODS:
+        return 'write'
+
+    try:
+        if sticky_until and float(sticky_until) > time():
+            return 'sticky'
+    except ValueError:
+        pass
+
+    if monotonic() < _replica_down_until:
+        return 'replica_down'
+    return 'read'
+
+
+async def open_session(
+    method: str, sticky_until: Optional[str]
+) -> AsyncSession:
+    """
+    Open the session of a request, on the replica when it is safe.
+
+    Reads go to `READ_DATABASE_URL` unless the client wrote within
+    `READ_YOUR_WRITES_SECONDS` (see `route_session`). When the replica
+    cannot be reached the read falls back to the primary, and the
+    replica is skipped for `REPLICA_RETRY_SECONDS`.
+    """
+    global _replica_down_until  # noqa: PLW0603
+
+    reason = route_session(method, sticky_until)
+
+    if reason == 'read':
+        session = AsyncSession(read_engine, expire_on_commit=False)
+        try:
+            await session.connection()
+        except (OSError, exc.DBAPIError) as error:
+            await session.close()
+            _replica_down_until = monotonic() + settings.REPLICA_RETRY_SECONDS
+            REPLICA_FALLBACKS_TOTAL.inc()
+            logger.warning(
+                'Read replica unavailable, using the primary for {}s: {}',
+                settings.REPLICA_RETRY_SECONDS,
+                error,
+            )
+            reason = 'replica_down'
+        else:
+            SESSIONS_TOTAL.inc(labels=('replica', reason))
+            return session
+
+    SESSIONS_TOTAL.inc(labels=('primary', reason))
+    return AsyncSession(engine, expire_on_commit=False)
 
 
 async def init_db(session: AsyncSession) -> None:
+    # The first superuser administers the default tenant
+    await scope_to_default_tenant(session)
+
     superuser_db = await session.scalar(
         select(User).where(User.email == settings.FIRST_SUPERUSER_EMAIL)
     )
@@ -18,7 +351,9 @@ async def init_db(session: AsyncSession) -> None:
         superuser_db = User(
             full_name='admin',
             email=settings.FIRST_SUPERUSER_EMAIL,
-            password=get_password_hash(settings.FIRST_SUPERUSER_PASSWORD),
+            password=await get_password_hash_async(
+                settings.FIRST_SUPERUSER_PASSWORD
+            ),
             is_superuser=True,
         )
 
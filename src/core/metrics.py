@@ -0,0 +1,146 @@
+"""In-process metrics collected by each API worker."""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Iterator
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Metric:
+    """Base class for metrics identified by a name and label names."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        registry.register(self)
+
+    def _labels(self, values: tuple, extra: tuple = ()) -> str:
+        pairs = [*zip(self.labelnames, values), *extra]
+        if not pairs:
+            return ''
+        return '{%s}' % ','.join(f'{k}="{_escape(v)}"' for k, v in pairs)
+
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's lines in Prometheus text format."""
+        for labels, value in list(self.values.items()):
+            yield f'{self.name}{self._labels(labels)} {value}'
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, labels: tuple = ()) -> None:
+        self.values[labels] += amount
+
+
+class Gauge(Metric):
+    """Value per label set that can go up and down."""
+
+    kind = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, labels: tuple = ()) -> None:
+        self.values[labels] += amount
+
+    def dec(self, amount: float = 1.0, labels: tuple = ()) -> None:
+        self.values[labels] -= amount
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, *args, buckets: tuple = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = buckets
+        # Per label set: non-cumulative bucket counts (+Inf last), sum
+        self.counts = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self.sums = defaultdict(float)
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        self.counts[labels][bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    def samples(self) -> Iterator[str]:
+        for labels, counts in list(self.counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                le = self._labels(labels, (('le', bound),))
+                yield f'{self.name}_bucket{le} {cumulative}'
+            yield f'{self.name}_sum{self._labels(labels)} {self.sums[labels]}'
+            yield f'{self.name}_count{self._labels(labels)} {cumulative}'
+
+
+class MetricsRegistry:
+    """Collection of every metric defined in the process."""
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} already registered')
+        self.metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run `collector` before each render to refresh derived metrics."""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        for collector in self.collectors:
+            collector()
+
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: object) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+registry = MetricsRegistry()
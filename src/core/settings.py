@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,11 +8,44 @@ class Settings(BaseSettings):
         env_file='.env', env_file_encoding='utf-8'
     )
     DATABASE_URL: str = 'sqlite+aiosqlite:///./dev.db'
+    READ_DATABASE_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5
+    REPLICA_RETRY_SECONDS: float = 30
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_APPLICATION_NAME: str = 'studio-caju'
+    SQLITE_BUSY_TIMEOUT_SECONDS: float = 5
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    STATELESS_AUTH: bool = False
+    STATELESS_TOKEN_EXPIRE_MINUTES: int = 5
     FIRST_SUPERUSER_PASSWORD: str
     FIRST_SUPERUSER_EMAIL: str
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASH_WORKERS: int = 4
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 30
+    CATEGORY_CACHE_MAX_SIZE: int = 1024
+    CATEGORY_CACHE_TTL_SECONDS: float = 300
+    DEFAULT_TENANT_DOMAIN: str = 'default'
+    TENANT_CACHE_MAX_SIZE: int = 1024
+    TENANT_CACHE_TTL_SECONDS: float = 300
+    TASKS_PARTITION_BY: Literal['none', 'project_id', 'created_at'] = 'none'
+    TASKS_HASH_PARTITIONS: int = 16
+    TASKS_PARTITION_MONTHS_AHEAD: int = 3
+    ARCHIVE_RETENTION_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_PAUSE_SECONDS: float = 0.1
+    FAST_LIST_SERIALIZATION: bool = False
+    METRICS_ENABLED: bool = True
+    QUERY_BUDGET: int = 20
+    QUERY_REPEAT_THRESHOLD: int = 5
 
 
 settings = Settings()
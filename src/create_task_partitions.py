@@ -0,0 +1,33 @@
+import argparse
+from asyncio import run
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import engine
+from src.core.settings import settings
+from src.utils.partitions import create_task_partitions
+
+
+async def main(months_ahead: int) -> None:
+    async with AsyncSession(engine) as session:
+        statements = await create_task_partitions(session, months_ahead)
+
+    if statements:
+        logger.info(f'Task partitions exist {months_ahead} months ahead')
+    else:
+        logger.info('Tasks are not partitioned by created_at, nothing to do')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Create the upcoming monthly partitions of tasks'
+    )
+    parser.add_argument(
+        '--months-ahead',
+        type=int,
+        default=settings.TASKS_PARTITION_MONTHS_AHEAD,
+    )
+    args = parser.parse_args()
+
+    run(main(args.months_ahead))
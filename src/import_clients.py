@@ -0,0 +1,62 @@
+import argparse
+from asyncio import run
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import engine
+from src.utils.client_import import (
+    CLIENT_IMPORT_BATCH_SIZE,
+    import_clients,
+    write_error_report,
+)
+from src.utils.tenants import scope_to_default_tenant
+
+
+async def main(
+    csv_path: Path,
+    report_path: Path,
+    batch_size: int = CLIENT_IMPORT_BATCH_SIZE,
+) -> dict:
+    logger.info(f'Importing clients from {csv_path}')
+
+    with csv_path.open(encoding='utf-8-sig', newline='') as csv_file:
+        async with AsyncSession(engine) as session:
+            await scope_to_default_tenant(session)
+            report = await import_clients(session, csv_file, batch_size)
+
+    logger.info(f'{report["imported"]} clients imported')
+
+    if report['errors']:
+        with report_path.open(
+            'w', encoding='utf-8', newline=''
+        ) as report_file:
+            write_error_report(report['errors'], report_file)
+        logger.warning(
+            f'{len(report["errors"])} rows rejected, see {report_path}'
+        )
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import clients from CSV')
+    parser.add_argument('csv_path', type=Path)
+    parser.add_argument(
+        '--errors',
+        type=Path,
+        help='Error report path (default: <csv_path>.errors.csv)',
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=CLIENT_IMPORT_BATCH_SIZE
+    )
+    args = parser.parse_args()
+
+    run(
+        main(
+            args.csv_path,
+            args.errors or args.csv_path.with_suffix('.errors.csv'),
+            args.batch_size,
+        )
+    )
@@ -1,9 +1,11 @@
+import argparse
 from asyncio import run
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import engine, init_db
+from src.utils.synthetic_data import generate_data, scale_volumes
 
 
 async def init() -> None:
@@ -11,11 +13,31 @@ async def init() -> None:
         await init_db(session)
 
 
-async def main() -> None:
+async def generate(scale: int, seed: int = 0) -> None:
+    async with AsyncSession(engine) as session:
+        await generate_data(session, scale_volumes(scale), seed)
+
+
+async def main(scale: int = 0, seed: int = 0) -> None:
     logger.info('Creating initial data')
     await init()
     logger.info('Initial data created')
 
+    if scale:
+        logger.info(f'Generating synthetic data at scale {scale}')
+        await generate(scale, seed)
+        logger.info('Synthetic data created')
+
 
 if __name__ == '__main__':
-    run(main())
+    parser = argparse.ArgumentParser(description='Create initial data')
+    parser.add_argument(
+        '--scale',
+        type=int,
+        default=0,
+        help='also generate synthetic data, 1000 tasks per unit',
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    run(main(args.scale, args.seed))
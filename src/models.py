@@ -1,36 +1,136 @@
 import uuid
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    PrimaryKeyConstraint,
+    Table,
+    UniqueConstraint,
+    event,
+    func,
+    make_url,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import (
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+    registry,
+    relationship,
+    with_loader_criteria,
+)
+from sqlalchemy.sql.expression import FunctionElement
+
+from src.core.settings import settings
 
 table_registry = registry()
 
 
+class precise_now(FunctionElement):  # noqa: N801
+    """
+    `now()`, keeping fractions of a second on SQLite too.
+
+    Update timestamps version rows for ETags, and SQLite's
+    `CURRENT_TIMESTAMP` would give two updates in one second the same
+    timestamp.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(precise_now)
+def _compile_precise_now(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(precise_now, 'sqlite')
+def _compile_precise_now_sqlite(element, compiler, **kw):
+    return compiler.process(func.strftime('%Y-%m-%d %H:%M:%f', 'now'), **kw)
+
+
 class IdentifierType(str, Enum):
     cpf = 'cpf'
     cnpj = 'cnpj'
 
 
 @table_registry.mapped_as_dataclass
-class Category:
+class Tenant:
+    __tablename__ = 'tenants'
+
+    # Fields without default values first
+    name: Mapped[str] = mapped_column(nullable=False)
+    # Resolved from the X-Tenant-Domain header of each request
+    domain: Mapped[str] = mapped_column(nullable=False, unique=True)
+
+    # Fields with defaults or init=False after
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), init=False, primary_key=True, default=uuid.uuid4
+    )
+    is_active: Mapped[bool] = mapped_column(default=True)
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False, onupdate=precise_now(), nullable=True
+    )
+
+
+class TenantScoped:
+    """
+    Marker of the models whose rows belong to a tenant.
+
+    Each of them declares its own `tenant_id`, and sessions scoped to a
+    tenant (see `TENANT_KEY`) only read, update and delete that tenant's
+    rows and stamp it on the rows they add.
+    """
+
+
+@table_registry.mapped_as_dataclass
+class Category(TenantScoped):
     __tablename__ = 'categories'
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'name'),
+        Index(
+            'ix_categories_tenant_id_created_at_id',
+            'tenant_id',
+            'created_at',
+            'id',
+        ),
+        Index(
+            'ix_categories_active_tenant_id_created_at_id',
+            'tenant_id',
+            'created_at',
+            'id',
+            postgresql_where=text('is_active'),
+            sqlite_where=text('is_active = 1'),
+        ),
+    )
 
     # Fields without default values first
-    name: Mapped[str] = mapped_column(nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(nullable=False)
 
     # Fields with defaults or init=False after
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), init=False, primary_key=True, default=uuid.uuid4
     )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('tenants.id'), init=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        init=False, onupdate=func.now(), nullable=True
+        init=False, onupdate=precise_now(), nullable=True
     )
     is_active: Mapped[bool] = mapped_column(default=True)
 
@@ -48,49 +148,71 @@ class Category:
 
 
 @table_registry.mapped_as_dataclass
-class User:
+class User(TenantScoped):
     __tablename__ = 'users'
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'email'),
+        Index(
+            'ix_users_tenant_id_created_at_id', 'tenant_id', 'created_at', 'id'
+        ),
+    )
 
     # Fields without default values first
-    email: Mapped[str] = mapped_column(nullable=False, unique=True)
+    email: Mapped[str] = mapped_column(nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
 
     # Fields with defaults after
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), init=False, primary_key=True, default=uuid.uuid4
     )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('tenants.id'), init=False
+    )
     full_name: Mapped[Optional[str]] = mapped_column(
         default=None, nullable=True
     )
     is_superuser: Mapped[bool] = mapped_column(default=False, nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
+    token_version: Mapped[int] = mapped_column(default=0, server_default='0')
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        init=False, onupdate=func.now(), nullable=True
+        init=False, onupdate=precise_now(), nullable=True
     )
 
 
 @table_registry.mapped_as_dataclass
-class Client:
+class Client(TenantScoped):
     __tablename__ = 'clients'
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'identifier'),
+        Index(
+            'ix_clients_tenant_id_created_at_id',
+            'tenant_id',
+            'created_at',
+            'id',
+        ),
+    )
 
     # Fields without default values first
     name: Mapped[str]
     client_type: Mapped[str]
     type_identifier: Mapped[IdentifierType]
-    identifier: Mapped[str] = mapped_column(unique=True)
+    identifier: Mapped[str]
 
     # Fields with defaults after
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), init=False, primary_key=True, default=uuid.uuid4
     )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('tenants.id'), init=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
     update_at: Mapped[datetime] = mapped_column(
-        init=False, onupdate=func.now(), nullable=True
+        init=False, onupdate=precise_now(), nullable=True
     )
     updated_by: Mapped[Optional[datetime]] = mapped_column(
         default=None, nullable=True
@@ -99,22 +221,35 @@ class Client:
 
 
 @table_registry.mapped_as_dataclass
-class Project:
+class Project(TenantScoped):
     __tablename__ = 'projects'
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'name'),
+        Index(
+            'ix_projects_tenant_id_created_at_id',
+            'tenant_id',
+            'created_at',
+            'id',
+        ),
+    )
 
     # Fields without default values must come first
-    name: Mapped[str] = mapped_column(unique=True)
+    name: Mapped[str]
     created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
 
     # Fields with defaults or init=False can come after
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), init=False, primary_key=True, default=uuid.uuid4
     )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('tenants.id'), init=False
+    )
     category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey('categories.id'),
         nullable=True,
         default=None,
+        index=True,
     )
     category: Mapped[Optional['Category']] = relationship(
         back_populates='projects', init=False
@@ -134,8 +269,10 @@ class Project:
     is_active: Mapped[bool] = mapped_column(default=True)
 
     # Relationships with default factory
+    # Load explicitly, a lazy load per project is an N+1
     tasks: Mapped[List['Task']] = relationship(
         back_populates='project',
+        lazy='raise_on_sql',
         cascade='all, delete-orphan',
         init=False,
         default_factory=list,
@@ -144,18 +281,75 @@ class Project:
         init=False, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        init=False, onupdate=func.now(), nullable=True
+        init=False, onupdate=precise_now(), nullable=True
     )
 
 
+# Postgres declarative partitioning of tasks. Postgres requires the
+# partition key in the primary key; in the mapper's too, the updates and
+# deletes of the ORM filter on it and touch a single partition. Migration
+# 4b8e2d7f1c36 partitions existing tables. Other databases keep the
+# plain key, whatever TASKS_PARTITION_BY says.
+TASK_PARTITION_BY = (
+    settings.TASKS_PARTITION_BY
+    if make_url(settings.DATABASE_URL).get_backend_name() == 'postgresql'
+    else 'none'
+)
+TASK_PARTITION_METHODS = {
+    'project_id': 'HASH (project_id)',
+    'created_at': 'RANGE (created_at)',
+}
+TASK_PRIMARY_KEY = (
+    ('id', TASK_PARTITION_BY)
+    if TASK_PARTITION_BY in TASK_PARTITION_METHODS
+    else ('id',)
+)
+
+
 @table_registry.mapped_as_dataclass
-class Task:
+class Task(TenantScoped):
+    """
+    Task of a project. On Postgres the table may be partitioned by
+    `TASKS_PARTITION_BY`, whose column then joins the primary key.
+    """
+
     __tablename__ = 'tasks'
+    __table_args__ = (
+        Index(
+            'ix_tasks_tenant_id_created_at_id', 'tenant_id', 'created_at', 'id'
+        ),
+        Index(
+            'ix_tasks_tenant_id_project_id_created_at_id',
+            'tenant_id',
+            'project_id',
+            'created_at',
+            'id',
+        ),
+        Index(
+            'ix_tasks_tenant_id_status_created_at_id',
+            'tenant_id',
+            'status',
+            'created_at',
+            'id',
+        ),
+        Index('ix_tasks_tenant_id_due_date_id', 'tenant_id', 'due_date', 'id'),
+        Index('ix_tasks_tenant_id_created_by', 'tenant_id', 'created_by'),
+        # Lookups by id alone still probe the index of each partition
+        PrimaryKeyConstraint(*TASK_PRIMARY_KEY),
+        {
+            'postgresql_partition_by': TASK_PARTITION_METHODS.get(
+                TASK_PARTITION_BY
+            )
+        },
+    )
 
     # Required fields without defaults
     title: Mapped[str] = mapped_column(nullable=False)
     project_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey('projects.id'), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey('projects.id'),
+        nullable=False,
+        primary_key='project_id' in TASK_PRIMARY_KEY,
     )
     created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
     project: Mapped['Project'] = relationship(
@@ -166,17 +360,23 @@ class Task:
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), init=False, primary_key=True, default=uuid.uuid4
     )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('tenants.id'), init=False
+    )
     category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey('categories.id'),
         nullable=True,
         default=None,
+        index=True,
     )
+    # Load explicitly, a lazy load per task is an N+1
     category: Mapped[Optional['Category']] = relationship(
-        back_populates='tasks', init=False
+        back_populates='tasks', init=False, lazy='raise_on_sql'
     )
+    # The largest column, left out of list loads; undefer it to read it
     description: Mapped[Optional[str]] = mapped_column(
-        nullable=True, default=None
+        nullable=True, default=None, deferred=True, deferred_raiseload=True
     )
     status: Mapped[str] = mapped_column(nullable=False, default='to_do')
     priority: Mapped[str] = mapped_column(nullable=False, default='medium')
@@ -188,8 +388,265 @@ class Task:
     )
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(
-        init=False, server_default=func.now()
+        init=False,
+        server_default=func.now(),
+        primary_key='created_at' in TASK_PRIMARY_KEY,
     )
     updated_at: Mapped[datetime] = mapped_column(
-        init=False, onupdate=func.now(), nullable=True
+        init=False, onupdate=precise_now(), nullable=True
     )
+
+
+@table_registry.mapped_as_dataclass
+class ProjectStats(TenantScoped):
+    """Running totals of active projects per category, status and month."""
+
+    __tablename__ = 'project_stats'
+
+    # One row per tenant and (category_id, status_state, target_month),
+    # nulls included, which a unique constraint over nullable columns
+    # can't key
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('tenants.id'), primary_key=True
+    )
+    group_key: Mapped[str] = mapped_column(primary_key=True)
+    category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('categories.id'), nullable=True
+    )
+    status_state: Mapped[Optional[str]] = mapped_column(nullable=True)
+    target_month: Mapped[Optional[date]] = mapped_column(nullable=True)
+    project_count: Mapped[int] = mapped_column(default=0)
+    # Projects having a value, the divisor of the average value
+    value_count: Mapped[int] = mapped_column(default=0)
+    value_total: Mapped[float] = mapped_column(default=0.0)
+
+
+def _archive_table(model: type, deactivated_at: str) -> Table:
+    table = model.__table__
+
+    # The inactive rows only, the candidates of the archival job
+    Index(
+        f'ix_{table.name}_inactive_{deactivated_at}',
+        table.c[deactivated_at],
+        postgresql_where=text('NOT is_active'),
+        sqlite_where=text('is_active = 0'),
+    )
+
+    # Without constraints besides the primary key, nor partitions: rows
+    # move in and out independently of the rows they reference
+    return Table(
+        f'{table.name}_archive',
+        table.metadata,
+        *(
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.name == 'id',
+                nullable=column.nullable,
+            )
+            for column in table.columns
+        ),
+        Column(
+            'archived_at',
+            DateTime(),
+            nullable=False,
+            server_default=func.now(),
+        ),
+        Index(
+            f'ix_{table.name}_archive_tenant_id_archived_at',
+            'tenant_id',
+            'archived_at',
+        ),
+    )
+
+
+# Cold copies of soft-deleted rows, see src.utils.archive. Keyed by
+# model with the column holding when a row was deactivated; referencing
+# models come first, their rows must leave before the rows they
+# reference.
+ARCHIVE_DEACTIVATED_AT = {
+    Task: 'updated_at',
+    Project: 'updated_at',
+    Category: 'updated_at',
+    Client: 'update_at',
+    User: 'updated_at',
+}
+ARCHIVE_TABLES = {
+    model: _archive_table(model, deactivated_at)
+    for model, deactivated_at in ARCHIVE_DEACTIVATED_AT.items()
+}
+
+
+SCOPED_MODELS = tuple(
+    mapper.class_
+    for mapper in table_registry.mappers
+    if issubclass(mapper.class_, TenantScoped)
+)
+
+# Key of the tenant id in `Session.info`. Sessions holding one are
+# scoped to that tenant, every other session sees all tenants.
+TENANT_KEY = 'tenant_id'
+
+
+def session_tenant_id(session: Session) -> Optional[uuid.UUID]:
+    """Return the tenant `session` is scoped to, if any."""
+    return session.info.get(TENANT_KEY)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _scope_to_tenant(state: ORMExecuteState) -> None:
+    tenant_id = session_tenant_id(state.session)
+    if (
+        tenant_id is None
+        or state.execution_options.get('all_tenants', False)
+        or state.is_column_load
+        or state.is_relationship_load
+        or not (state.is_select or state.is_update or state.is_delete)
+    ):
+        return
+
+    # The criteria also reach the lazy and eager loads of the loaded
+    # objects, and lead every query with the tenant_id of the indexes
+    state.statement = state.statement.options(
+        *(
+            with_loader_criteria(
+                model,
+                lambda cls: cls.tenant_id == tenant_id,
+                include_aliases=True,
+            )
+            for model in SCOPED_MODELS
+        )
+    )
+
+
+@event.listens_for(Session, 'before_flush')
+def _stamp_tenant(session: Session, flush_context, instances) -> None:
+    tenant_id = session_tenant_id(session)
+    if tenant_id is None:
+        return
+
+    for instance in session.new:
+        if isinstance(instance, TenantScoped) and instance.tenant_id is None:
+            instance.tenant_id = tenant_id
+
+
+# Full-text search, see src.utils.search. Postgres keeps a generated
+# tsvector per row under a GIN index; SQLite keeps an FTS5 index of the
+# same columns, synced by triggers. Migration 6e1b0d9c4a75 creates the
+# same objects on existing databases.
+SEARCH_CONFIG = 'portuguese'
+SEARCH_COLUMNS = {'tasks': ('title', 'description'), 'projects': ('name',)}
+
+
+def _search_ddl(table: str, columns: tuple[str, ...]) -> dict[str, list]:
+    weighted = ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(columns, 'ABCD')
+    )
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    fts = f'{table}_fts'
+    delete_old = (
+        f'INSERT INTO {fts}({fts}, rowid, {names}) '
+        f"VALUES ('delete', old.rowid, {old});"
+    )
+    insert_new = (
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new});'
+    )
+
+    return {
+        'postgresql': [
+            f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+            f'GENERATED ALWAYS AS ({weighted}) STORED',
+            f'CREATE INDEX ix_{table}_search_vector ON {table} '
+            'USING gin (search_vector)',
+        ],
+        'sqlite': [
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5('
+            f"{names}, content='{table}', content_rowid='rowid', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+            f'BEGIN {insert_new} END',
+            f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+            f'BEGIN {delete_old} END',
+            f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} '
+            f'ON {table} BEGIN {delete_old} {insert_new} END',
+        ],
+    }
+
+
+def _register_search_ddl(model: type) -> None:
+    table = model.__table__
+    ddl = _search_ddl(table.name, SEARCH_COLUMNS[table.name])
+
+    for dialect, statements in ddl.items():
+        for statement in statements:
+            event.listen(
+                table,
+                'after_create',
+                DDL(statement).execute_if(dialect=dialect),
+            )
+
+    event.listen(
+        table,
+        'after_drop',
+        DDL(f'DROP TABLE IF EXISTS {table.name}_fts').execute_if(
+            dialect='sqlite'
+        ),
+    )
+
+
+_register_search_ddl(Task)
+_register_search_ddl(Project)
+
+
+def task_partition_ddl(
+    partition_by: str,
+    today: date,
+    months_ahead: int = settings.TASKS_PARTITION_MONTHS_AHEAD,
+    hash_partitions: int = settings.TASKS_HASH_PARTITIONS,
+) -> list[str]:
+    """
+    Statements creating the partitions of `tasks` under `partition_by`.
+
+    By `project_id`, `hash_partitions` partitions of equal share. By
+    `created_at`, one partition per month from the month of `today`
+    through `months_ahead` months later, and a default partition for
+    rows outside them; `src.create_task_partitions` keeps adding months.
+    """
+    if partition_by == 'project_id':
+        return [
+            f'CREATE TABLE IF NOT EXISTS tasks_p{remainder} '
+            f'PARTITION OF tasks FOR VALUES WITH '
+            f'(MODULUS {hash_partitions}, REMAINDER {remainder})'
+            for remainder in range(hash_partitions)
+        ]
+
+    if partition_by == 'created_at':
+        statements = []
+        month = today.replace(day=1)
+        for _ in range(months_ahead + 1):
+            following = (month + timedelta(days=31)).replace(day=1)
+            statements.append(
+                f'CREATE TABLE IF NOT EXISTS tasks_{month:%Y_%m} PARTITION OF '
+                f"tasks FOR VALUES FROM ('{month}') TO ('{following}')"
+            )
+            month = following
+        statements.append(
+            'CREATE TABLE IF NOT EXISTS tasks_default PARTITION OF tasks '
+            'DEFAULT'
+        )
+        return statements
+
+    return []
+
+
+@event.listens_for(Task.__table__, 'after_create')
+def _create_task_partitions(target, connection, **kw) -> None:
+    if connection.dialect.name != 'postgresql':
+        return
+
+    for statement in task_partition_ddl(TASK_PARTITION_BY, date.today()):
+        connection.exec_driver_sql(statement)
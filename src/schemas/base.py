@@ -3,3 +3,10 @@ from pydantic import BaseModel
 
 class Message(BaseModel):
     message: str
+
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
@@ -28,3 +28,4 @@ class CategoryList(BaseModel):
     """Schema for list of categories."""
 
     categories: list[CategoryResponse]
+    next_cursor: str | None = None
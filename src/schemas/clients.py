@@ -73,3 +73,15 @@ class ClientRequestUpdate(BaseModel):
 
 class ClientListRequest(BaseModel):
     clients: list[ClientResponse]
+    next_cursor: str | None = None
+
+
+class ClientImportError(BaseModel):
+    line: int
+    identifier: str | None = None
+    error: str
+
+
+class ClientImportReport(BaseModel):
+    imported: int
+    errors: list[ClientImportError]
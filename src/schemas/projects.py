@@ -35,6 +35,32 @@ class ProjectRequestGet(ProjectResponse):
 
 class ProjectRequestGetList(BaseModel):
     projects: list[ProjectRequestGet]
+    next_cursor: str | None = None
+
+
+class ProjectValueStats(BaseModel):
+    project_count: int
+    value_total: float
+    value_average: float | None
+
+
+class ProjectCategoryStats(ProjectValueStats):
+    category_id: UUID | None
+    category_name: str | None
+
+
+class ProjectStatusStats(ProjectValueStats):
+    status_state: str | None
+
+
+class ProjectMonthStats(ProjectValueStats):
+    target_month: date | None
+
+
+class ProjectAnalytics(ProjectValueStats):
+    by_category: list[ProjectCategoryStats]
+    by_status: list[ProjectStatusStats]
+    by_month: list[ProjectMonthStats]
 
 
 class ProjectResquestUpdate(BaseModel):
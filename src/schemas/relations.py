@@ -0,0 +1,31 @@
+"""Project and task schemas embedding their related objects."""
+
+from pydantic import BaseModel
+
+from src.schemas.categories import CategoryResponse
+from src.schemas.projects import ProjectRequestGet
+from src.schemas.tasks import TaskRequestGet
+
+
+class ProjectWithRelations(ProjectRequestGet):
+    """Project, with the relations listed in `include` only."""
+
+    tasks: list[TaskRequestGet] | None = None
+    category: CategoryResponse | None = None
+
+
+class ProjectWithRelationsList(BaseModel):
+    projects: list[ProjectWithRelations]
+    next_cursor: str | None = None
+
+
+class TaskWithRelations(TaskRequestGet):
+    """Task, with the relations listed in `include` only."""
+
+    project: ProjectRequestGet | None = None
+    category: CategoryResponse | None = None
+
+
+class TaskWithRelationsList(BaseModel):
+    tasks: list[TaskWithRelations]
+    next_cursor: str | None = None
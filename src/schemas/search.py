@@ -0,0 +1,16 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: Literal['task', 'project']
+    id: UUID
+    title: str
+    project_id: UUID | None = None
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    results: list[SearchResult]
@@ -1,7 +1,12 @@
 from datetime import date, datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+# Sortable columns, each backed by an index on `tasks`
+TASK_SORT_FIELDS = ('created_at', 'due_date', 'status')
 
 
 class TaskRequestCreate(BaseModel):
@@ -39,6 +44,89 @@ class TaskRequestGet(TaskResponse):
 
 class TaskRequestGetList(BaseModel):
     tasks: list[TaskRequestGet]
+    next_cursor: str | None = None
+
+
+class TaskBulkResult(BaseModel):
+    index: int
+    id: UUID | None = None
+    error: str | None = None
+
+
+class TaskBulkResponse(BaseModel):
+    created: int
+    results: list[TaskBulkResult]
+
+
+class TaskFilterParams(BaseModel):
+    """Query parameters filtering tasks."""
+
+    project_id: UUID | None = None
+    category_id: UUID | None = None
+    created_by: UUID | None = None
+    status: list[str] = Field(default_factory=list)
+    priority: list[str] = Field(default_factory=list)
+    is_active: bool | None = None
+    due_after: date | None = None
+    due_before: date | None = None
+
+    @model_validator(mode='after')
+    def check_filters(self):
+        if (
+            self.due_after
+            and self.due_before
+            and (self.due_after > self.due_before)
+        ):
+            raise ValueError('due_after must not be later than due_before')
+
+        return self
+
+
+class TaskListParams(TaskFilterParams):
+    """Query parameters filtering, sorting and paging tasks."""
+
+    sort: str = Field(
+        default='created_at',
+        description=(
+            'Comma separated columns, prefixed with "-" for descending: '
+            f'{", ".join(TASK_SORT_FIELDS)}'
+        ),
+    )
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+    fields: str | None = Field(
+        default=None,
+        description=(
+            'Comma separated fields to return, every field by default: '
+            f'{", ".join(TaskRequestGet.model_fields)}'
+        ),
+    )
+    include: str | None = Field(
+        default=None,
+        description='Comma separated relations to embed: project, category',
+    )
+
+    @model_validator(mode='after')
+    def check_sort(self):
+        fields = [field.removeprefix('-') for field in self.sort.split(',')]
+        for field in fields:
+            if field not in TASK_SORT_FIELDS:
+                raise ValueError(
+                    f'Cannot sort by {field!r}, use one of: '
+                    f'{", ".join(TASK_SORT_FIELDS)}'
+                )
+        if len(set(fields)) != len(fields):
+            raise ValueError('Sort columns must not repeat')
+
+        return self
+
+    @property
+    def order_by(self) -> list[tuple[str, bool]]:
+        """Sort columns and whether each one is descending."""
+        return [
+            (field.removeprefix('-'), field.startswith('-'))
+            for field in self.sort.split(',')
+        ]
 
 
 class TaskRequestUpdate(BaseModel):
@@ -1,6 +1,17 @@
-from pydantic import BaseModel
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class TokenIdentity(BaseModel):
+    id: UUID
+    email: str
+    is_superuser: bool
+    token_version: int
+
+    model_config = ConfigDict(from_attributes=True)
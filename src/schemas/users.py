@@ -21,6 +21,7 @@ class UserPublic(BaseModel):
 
 class UserList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
 
 class UserUpdate(BaseModel):
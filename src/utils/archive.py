@@ -0,0 +1,280 @@
+"""Utility functions moving soft-deleted rows to and from cold tables."""
+
+import asyncio
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Union
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+from src.core.settings import settings
+from src.models import (
+    ARCHIVE_DEACTIVATED_AT,
+    ARCHIVE_TABLES,
+    Project,
+    ProjectStats,
+    precise_now,
+    session_tenant_id,
+)
+from src.utils.project_stats import project_snapshot, update_project_stats
+
+# Models by the name of their table, as in the restore route
+ARCHIVED_MODELS = {model.__tablename__: model for model in ARCHIVE_TABLES}
+
+# Aggregate rows only hold totals of other rows: once empty, they don't
+# keep the rows they reference hot, and are deleted along with them
+_EMPTY_REFERENCES = {
+    ProjectStats.__table__: ProjectStats.__table__.c.project_count == 0,
+}
+
+
+class days_ago(FunctionElement):  # noqa: N801
+    """
+    `now()` less a number of days, on the database clock.
+
+    Deactivation and creation times are stamped by the database, so the
+    retention cutoff is too, whatever the time zone of the worker.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(days_ago)
+def _compile_days_ago(element, compiler, **kw):
+    (days,) = element.clauses
+    return compiler.process(
+        func.now() - func.make_interval(0, 0, 0, days), **kw
+    )
+
+
+@compiles(days_ago, 'sqlite')
+def _compile_days_ago_sqlite(element, compiler, **kw):
+    (days,) = element.clauses
+    return compiler.process(
+        func.strftime(
+            '%Y-%m-%d %H:%M:%f', 'now', literal('-').concat(days) + ' days'
+        ),
+        **kw,
+    )
+
+
+def _references(table: Any) -> list:
+    # Foreign keys of the hot tables pointing to `table`
+    return [
+        foreign_key
+        for referencing in table.metadata.sorted_tables
+        for foreign_key in referencing.foreign_keys
+        if foreign_key.column.table is table
+    ]
+
+
+def _unreferenced(model: Any) -> list:
+    # Rows still referenced from a hot table stay, the foreign key would
+    # reject their delete. Matching the tenant too lets the check use
+    # the tenant-leading indexes of the referencing table.
+    table = model.__table__
+    conditions = []
+    for foreign_key in _references(table):
+        referencing = foreign_key.parent.table
+        match = foreign_key.parent == foreign_key.column
+        if 'tenant_id' in referencing.c:
+            match = and_(match, referencing.c.tenant_id == table.c.tenant_id)
+        if referencing in _EMPTY_REFERENCES:
+            match = and_(match, ~_EMPTY_REFERENCES[referencing])
+        conditions.append(~exists().where(match))
+    return conditions
+
+
+async def archive_batch(
+    session: AsyncSession,
+    model: Any,
+    cutoff: Union[datetime, ColumnElement[datetime]],
+    batch_size: int,
+) -> int:
+    """
+    Move up to `batch_size` rows of `model`, deactivated before
+    `cutoff`, to its archive table, and commit.
+
+    Each batch is its own short transaction; on Postgres, rows locked by
+    others are skipped rather than waited for.
+
+    Returns:
+        The number of rows moved, 0 once none are left
+    """
+    table = model.__table__
+    archive = ARCHIVE_TABLES[model]
+    deactivated_at = table.c[ARCHIVE_DEACTIVATED_AT[model]]
+    key = list(table.primary_key.columns)
+
+    candidates = (
+        select(*key)
+        .where(
+            ~table.c.is_active,
+            or_(
+                deactivated_at < cutoff,
+                and_(deactivated_at.is_(None), table.c.created_at < cutoff),
+            ),
+            *_unreferenced(model),
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .execution_options(all_tenants=True)
+    )
+    rows = (await session.execute(candidates)).all()
+    if not rows:
+        await session.commit()
+        return 0
+
+    batch = (
+        tuple_(*key).in_(rows)
+        if len(key) > 1
+        else key[0].in_([row[0] for row in rows])
+    )
+    await session.execute(
+        insert(archive).from_select(
+            [column.name for column in table.columns],
+            select(*table.columns).where(batch),
+        )
+    )
+    for foreign_key in _references(table):
+        referencing = foreign_key.parent.table
+        if referencing in _EMPTY_REFERENCES:
+            await session.execute(
+                delete(referencing)
+                .where(
+                    foreign_key.parent.in_(
+                        select(foreign_key.column).where(batch)
+                    )
+                )
+                .execution_options(all_tenants=True)
+            )
+    await session.execute(
+        delete(table).where(batch).execution_options(all_tenants=True)
+    )
+    await session.commit()
+
+    return len(rows)
+
+
+async def archive_inactive(
+    session: AsyncSession,
+    retention_days: int = settings.ARCHIVE_RETENTION_DAYS,
+    batch_size: int = settings.ARCHIVE_BATCH_SIZE,
+    pause_seconds: float = settings.ARCHIVE_PAUSE_SECONDS,
+) -> dict[str, int]:
+    """
+    Move every row deactivated more than `retention_days` ago to the
+    archive tables, across all tenants, in batches of `batch_size`.
+
+    Rows still referenced by hot rows, such as a deleted project with
+    active tasks, stay until those go. Empty `project_stats` rows don't
+    count, and are deleted with the category they reference. The pause
+    between batches leaves room for other writers and for vacuum to
+    reclaim the deleted rows.
+
+    Returns:
+        The number of rows archived per table
+    """
+    cutoff = days_ago(retention_days)
+    archived = {}
+
+    for name, model in ARCHIVED_MODELS.items():
+        archived[name] = 0
+        while moved := await archive_batch(session, model, cutoff, batch_size):
+            archived[name] += moved
+            if moved < batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+
+    return archived
+
+
+async def restore_archived(
+    session: AsyncSession, model: Any, row_id: UUID
+) -> None:
+    """
+    Move the archived row `row_id` of `model` back to its table, active,
+    and commit.
+
+    Raises:
+        HTTPException: 404 when the session's tenant has no such archived
+            row, 409 when a row it references is gone, or it conflicts
+            with a current row (such as a reused email)
+    """
+    table = model.__table__
+    archive = ARCHIVE_TABLES[model]
+
+    row = (
+        await session.execute(
+            select(*(archive.c[column.name] for column in table.columns))
+            .where(
+                archive.c.id == row_id,
+                archive.c.tenant_id == session_tenant_id(session),
+            )
+            .limit(1)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Archived row not found',
+        )
+
+    values = row._asdict()
+    for foreign_key in table.foreign_keys:
+        referenced = foreign_key.column
+        value = values[foreign_key.parent.name]
+        if value is None or referenced.table.name == 'tenants':
+            continue
+        if not await session.scalar(
+            select(exists().where(referenced == value))
+        ):
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT,
+                detail=(
+                    f"{referenced.table.name} {value} doesn't exist, "
+                    'restore it first'
+                ),
+            )
+
+    values['is_active'] = True
+    values[ARCHIVE_DEACTIVATED_AT[model]] = precise_now()
+
+    try:
+        await session.execute(insert(table).values(values))
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Archived row conflicts with an existing row',
+        )
+    await session.execute(delete(archive).where(archive.c.id == row_id))
+
+    if model is Project:
+        project = await session.scalar(
+            select(Project)
+            .where(Project.id == row_id)
+            .execution_options(populate_existing=True)
+        )
+        await update_project_stats(session, None, project_snapshot(project))
+
+    await session.commit()
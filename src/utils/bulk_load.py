@@ -0,0 +1,82 @@
+"""Utility functions for loading many rows at once."""
+
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import TenantScoped, session_tenant_id
+
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _copy_value(value: Any) -> Any:
+    # Enum columns store the member name
+    return value.name if isinstance(value, Enum) else value
+
+
+async def bulk_insert(
+    session: AsyncSession,
+    model: Any,
+    rows: list[dict],
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+) -> None:
+    """
+    Insert `rows` in the session's transaction as fast as the driver allows.
+
+    On Postgres the rows are streamed with `COPY`, on other databases they
+    are inserted with one multi-row `INSERT` per chunk. `COPY` skips
+    Python-side defaults, so every row must carry the same keys and every
+    value without a server-side default. Rows of tenant-scoped models
+    are stamped with the session's tenant, as flushes do.
+
+    Args:
+        session: Database session
+        model: Mapped class to insert into
+        rows: Column values of each row
+        chunk_size: Rows per `INSERT` statement on the fallback path
+    """
+    if not rows:
+        return
+
+    tenant_id = session_tenant_id(session)
+    if tenant_id is not None and issubclass(model, TenantScoped):
+        rows = [{**row, 'tenant_id': tenant_id} for row in rows]
+
+    connection = await session.connection()
+    driver = connection.dialect.driver
+    table = model.__table__
+    columns = list(rows[0])
+    records = (tuple(_copy_value(row[key]) for key in columns) for row in rows)
+
+    if driver == 'asyncpg':
+        # SQLAlchemy opens the asyncpg transaction lazily, on the first
+        # statement it runs; a COPY on the raw connection doesn't count,
+        # and would run and commit outside the session's transaction.
+        await connection.exec_driver_sql('SELECT 1')
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            schema_name=table.schema,
+            columns=columns,
+            records=list(records),
+        )
+        return
+
+    if driver == 'psycopg':
+        raw_connection = await connection.get_raw_connection()
+        statement = 'COPY {} ({}) FROM STDIN'.format(
+            table.fullname, ', '.join(columns)
+        )
+        async with raw_connection.driver_connection.cursor() as cursor:
+            async with cursor.copy(statement) as copy:
+                for record in records:
+                    await copy.write_row(record)
+        return
+
+    # A Core insert keeps each chunk in one statement, the ORM bulk insert
+    # would split it by the combination of non-None keys of each row
+    statement = insert(model.__table__)
+    for start in range(0, len(rows), chunk_size):
+        await session.execute(statement, rows[start : start + chunk_size])
@@ -1,11 +1,29 @@
 """Utility functions for category management."""
 
 from typing import Optional
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Exists, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Category
+from src.core.cache import TTLCache
+from src.core.settings import settings
+from src.models import Category, session_tenant_id
+
+# Active category ids keyed by tenant id and normalized name, local to
+# each worker.
+# Other workers may delete a cached category, and a caller may roll back
+# the transaction that created one, so write paths check a cached id is
+# still active before using it; the TTL bounds the rest.
+category_cache = TTLCache(
+    maxsize=settings.CATEGORY_CACHE_MAX_SIZE,
+    ttl=settings.CATEGORY_CACHE_TTL_SECONDS,
+)
+
+# Lookups retried by get_or_create_category_ids when concurrent requests
+# keep creating the same names
+CREATE_ATTEMPTS = 3
 
 
 async def get_or_create_category(
@@ -14,6 +32,10 @@ async def get_or_create_category(
     """
     Get or create a category with the given name.
 
+    A soft-deleted category with the same name is reactivated, since
+    category names are unique. Changes are flushed, not committed, so
+    they are published by the caller's commit.
+
     Args:
         db: Database session
         category_name: Name of the category to retrieve or create
@@ -28,24 +50,181 @@ async def get_or_create_category(
     normalized_name = category_name.strip()
 
     # Try to find existing category
-    query = select(Category).where(
-        Category.name == normalized_name,
-        Category.is_active == True,  # noqa: E712
-    )
+    query = select(Category).where(Category.name == normalized_name)
 
     category = await db.scalar(query)
 
-    # If category exists, return it
-    if category:
+    # If an active category exists, return it
+    if category and category.is_active:
+        category_cache.set((category.tenant_id, normalized_name), category.id)
         return category
 
-    # Otherwise, create a new category
-    new_category = Category(
-        name=normalized_name,
+    # Otherwise, create a new category or reactivate the deleted one
+    if category:
+        category.is_active = True
+    else:
+        category = Category(
+            name=normalized_name,
+        )
+
+    try:
+        # A savepoint, so a conflict leaves the caller's transaction and
+        # the objects it loaded alone
+        async with db.begin_nested():
+            db.add(category)
+            await db.flush()
+    except IntegrityError:
+        # A concurrent request created the same name first
+        category = await db.scalar(query)
+
+    category_cache.set((category.tenant_id, normalized_name), category.id)
+
+    return category
+
+
+def _add_missing(
+    db: AsyncSession, categories: dict[str, Category], names: set[str]
+) -> None:
+    # Create the unknown names in `categories` and reactivate deleted ones
+    for name in names:
+        category = categories.get(name)
+        if category is None:
+            categories[name] = Category(name=name)
+            db.add(categories[name])
+        elif not category.is_active:
+            category.is_active = True
+
+
+async def get_or_create_category_ids(
+    db: AsyncSession, category_names: list[str]
+) -> dict[str, UUID]:
+    """
+    Resolve many category names at once, creating the missing ones.
+
+    Cached ids are checked active with a single query, names missing
+    from `category_cache` are looked up with another, and the unknown
+    ones are created with a single flush, published by the caller's
+    commit.
+
+    Args:
+        db: Database session
+        category_names: Names to resolve, duplicates allowed
+
+    Returns:
+        Category ids keyed by normalized name
+    """
+    tenant_id = session_tenant_id(db)
+    category_ids = {}
+    missing = set()
+
+    names = {name.strip() for name in category_names if name}
+    names.discard('')
+
+    for name in names:
+        category_id = category_cache.get((tenant_id, name))
+        if category_id:
+            category_ids[name] = category_id
+        else:
+            missing.add(name)
+
+    if category_ids:
+        # Another worker may have deleted cached categories since
+        active = set(
+            await db.scalars(
+                select(Category.id).where(
+                    Category.id.in_(category_ids.values()), Category.is_active
+                )
+            )
+        )
+        for name, category_id in list(category_ids.items()):
+            if category_id not in active:
+                del category_ids[name]
+                missing.add(name)
+
+    if not missing:
+        return category_ids
+
+    for attempt in range(1, CREATE_ATTEMPTS + 1):
+        categories = {
+            category.name: category
+            for category in await db.scalars(
+                select(Category).where(Category.name.in_(missing))
+            )
+        }
+
+        try:
+            async with db.begin_nested():
+                _add_missing(db, categories, missing)
+                await db.flush()
+        except IntegrityError:
+            # A concurrent request created one of the names first, look
+            # them up again so it is found
+            if attempt == CREATE_ATTEMPTS:
+                raise
+        else:
+            break
+
+    for name in missing:
+        category_ids[name] = categories[name].id
+        category_cache.set((tenant_id, name), categories[name].id)
+
+    return category_ids
+
+
+def cached_category_id(
+    db: AsyncSession, category_name: Optional[str]
+) -> Optional[UUID]:
+    """Return the id `category_cache` holds for a name, if any."""
+    if not category_name:
+        return None
+
+    return category_cache.get((session_tenant_id(db), category_name.strip()))
+
+
+def category_is_active(category_id: Optional[UUID]) -> Exists:
+    """
+    Tell if `category_id` is an active category, as a column to select
+    along with a query a write path runs anyway.
+    """
+    # Selecting an entity column, so the subquery is scoped to the tenant
+    return (
+        select(Category.id)
+        .where(Category.id == category_id, Category.is_active)
+        .exists()
     )
 
-    db.add(new_category)
-    await db.commit()
-    await db.refresh(new_category)
 
-    return new_category
+async def get_or_create_category_id(
+    db: AsyncSession, category_name: str, active: Optional[bool] = None
+) -> Optional[UUID]:
+    """
+    Get the id of the category with the given name, creating it if needed.
+
+    Known names are answered from `category_cache`, once the cached id
+    is known to be active, since another worker may have deleted the
+    category. A deleted category is reactivated, as for unknown names.
+
+    Args:
+        db: Database session
+        category_name: Name of the category to retrieve or create
+        active: `category_is_active` of the cached id, when the caller
+            selected it already; checked with a query of its own
+            otherwise
+
+    Returns:
+        The id of the retrieved or newly created category
+    """
+    if not category_name:
+        return None
+
+    category_id = cached_category_id(db, category_name)
+
+    if category_id:
+        if active is None:
+            active = await db.scalar(select(category_is_active(category_id)))
+        if active:
+            return category_id
+
+    category = await get_or_create_category(db, category_name)
+
+    return category.id
@@ -0,0 +1,159 @@
+"""Utility functions for importing clients from CSV files."""
+
+import csv
+import uuid
+from asyncio import to_thread
+from itertools import islice
+from typing import IO, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Client, IdentifierType
+from src.utils.bulk_load import bulk_insert
+from src.utils.identifiers import normalize_identifier, validate_identifiers
+
+CLIENT_IMPORT_BATCH_SIZE = 5000
+CLIENT_IMPORT_COLUMNS = (
+    'name',
+    'client_type',
+    'type_identifier',
+    'identifier',
+)
+ERROR_REPORT_COLUMNS = ('line', 'identifier', 'error')
+
+
+def _read_batch(reader: csv.DictReader, size: int) -> list[tuple[int, dict]]:
+    return [(reader.line_num, row) for row in islice(reader, size)]
+
+
+def _parse_row(row: dict) -> tuple[Optional[dict], Optional[str]]:
+    values = {
+        key: (row.get(key) or '').strip() for key in CLIENT_IMPORT_COLUMNS
+    }
+
+    missing = [key for key, value in values.items() if not value]
+    if missing:
+        return None, f'Missing {", ".join(missing)}'
+
+    try:
+        values['type_identifier'] = IdentifierType(
+            values['type_identifier'].lower()
+        )
+    except ValueError:
+        return None, 'type_identifier must be cpf or cnpj'
+
+    values['identifier'] = normalize_identifier(values['identifier'])
+    return values, None
+
+
+async def _import_batch(
+    session: AsyncSession,
+    batch: list[tuple[int, dict]],
+    seen: set[str],
+    errors: list[dict],
+) -> int:
+    parsed = []
+
+    for line, row in batch:
+        values, error = _parse_row(row)
+        if error:
+            errors.append({
+                'line': line,
+                'identifier': row.get('identifier'),
+                'error': error,
+            })
+        else:
+            parsed.append((line, values))
+
+    identifier_errors = validate_identifiers(
+        (values['type_identifier'], values['identifier'])
+        for _, values in parsed
+    )
+
+    # One query per batch finds the identifiers already stored
+    existing = set(
+        await session.scalars(
+            select(Client.identifier).where(
+                Client.identifier.in_({
+                    values['identifier'] for _, values in parsed
+                })
+            )
+        )
+    )
+
+    rows = []
+
+    for (line, values), identifier_error in zip(parsed, identifier_errors):
+        identifier = values['identifier']
+        error = identifier_error
+
+        if error is None and identifier in existing:
+            error = 'Client already exists'
+        elif error is None and identifier in seen:
+            error = 'Duplicate identifier in file'
+
+        if error:
+            errors.append({
+                'line': line,
+                'identifier': identifier,
+                'error': error,
+            })
+            continue
+
+        seen.add(identifier)
+        rows.append({**values, 'id': uuid.uuid4(), 'is_active': True})
+
+    await bulk_insert(session, Client, rows)
+    await session.commit()
+
+    return len(rows)
+
+
+async def import_clients(
+    session: AsyncSession,
+    csv_file: IO[str],
+    batch_size: int = CLIENT_IMPORT_BATCH_SIZE,
+) -> dict:
+    """
+    Import the clients of a CSV file in batches.
+
+    The file needs a header with `name`, `client_type`, `type_identifier`
+    and `identifier`. Each batch is validated at once, checked for
+    duplicates with a single query and committed on its own, so rows
+    already imported stay imported if a later batch fails.
+
+    Args:
+        session: Database session
+        csv_file: Text file opened with `newline=''`
+        batch_size: Rows validated and loaded together
+
+    Returns:
+        The number of imported clients and the rejected rows
+
+    Raises:
+        ValueError: If the header lacks a required column
+    """
+    reader = csv.DictReader(csv_file)
+    header = await to_thread(lambda: reader.fieldnames or [])
+
+    missing = [key for key in CLIENT_IMPORT_COLUMNS if key not in header]
+    if missing:
+        raise ValueError(f'Missing columns: {", ".join(missing)}')
+
+    imported = 0
+    errors = []
+    seen = set()
+
+    # File reads run in a thread so large uploads don't block the loop
+    while batch := await to_thread(_read_batch, reader, batch_size):
+        imported += await _import_batch(session, batch, seen, errors)
+
+    return {'imported': imported, 'errors': errors}
+
+
+def write_error_report(errors: list[dict], report_file: IO[str]) -> None:
+    """Write the rows rejected by `import_clients` as CSV."""
+    writer = csv.DictWriter(report_file, fieldnames=ERROR_REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(errors)
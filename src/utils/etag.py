@@ -0,0 +1,110 @@
+"""Utility functions for ETags and conditional requests."""
+
+import hashlib
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _changed_at(model: Any) -> str:
+    # Clients name their update timestamp `update_at`
+    return 'updated_at' if hasattr(model, 'updated_at') else 'update_at'
+
+
+def make_etag(
+    row_id: UUID, created_at: datetime, updated_at: Optional[datetime]
+) -> str:
+    """
+    Build the strong ETag of a row version.
+
+    Args:
+        row_id: Id of the row
+        created_at: Creation timestamp, versions rows never updated
+        updated_at: Last update timestamp, if any
+
+    Returns:
+        A quoted opaque tag that changes whenever the row is updated
+    """
+    version = f'{row_id}:{(updated_at or created_at).isoformat()}'
+    return f'"{hashlib.blake2b(version.encode(), digest_size=8).hexdigest()}"'
+
+
+def row_etag(row: Any) -> str:
+    """Return the ETag of a loaded row."""
+    return make_etag(row.id, row.created_at, getattr(row, _changed_at(row)))
+
+
+def etag_matches(
+    header: Optional[str], etag: str, *, weak: bool = False
+) -> bool:
+    """
+    Tell if an `If-None-Match`/`If-Match` header lists `etag`.
+
+    `*` matches any tag. With `weak`, as for `If-None-Match`, weak tags
+    (`W/"..."`) compare equal to their strong counterpart; otherwise,
+    as `If-Match` requires, they match nothing.
+    """
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    if weak:
+        tags = [tag.removeprefix('W/') for tag in tags]
+    return '*' in tags or etag in tags
+
+
+async def not_modified(
+    session: AsyncSession,
+    model: Any,
+    row_id: UUID,
+    if_none_match: Optional[str],
+) -> Optional[Response]:
+    """
+    Answer a conditional GET without loading the row.
+
+    Only the timestamps of the row are selected, so the full row is read
+    and serialized only when the client's copy is stale.
+
+    Returns:
+        A `304 Not Modified` response when `if_none_match` lists the
+        current ETag of the row, None otherwise
+    """
+    if not if_none_match:
+        return None
+
+    version = (
+        await session.execute(
+            select(model.created_at, getattr(model, _changed_at(model))).where(
+                model.id == row_id
+            )
+        )
+    ).first()
+    if version is None:
+        return None
+
+    etag = make_etag(row_id, *version)
+    if not etag_matches(if_none_match, etag, weak=True):
+        return None
+
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+    )
+
+
+def check_if_match(if_match: Optional[str], row: Any) -> None:
+    """
+    Reject an update of a row the client has an outdated copy of.
+
+    Raises:
+        HTTPException: 412 when `if_match` is given and does not list
+            the current ETag of `row`
+    """
+    if if_match and not etag_matches(if_match, row_etag(row)):
+        raise HTTPException(
+            status_code=HTTPStatus.PRECONDITION_FAILED,
+            detail='Resource was modified',
+        )
@@ -0,0 +1,45 @@
+"""Utility functions for streaming exports."""
+
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EXPORT_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+async def stream_ndjson(
+    session: AsyncSession, query: Select, schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of `query` as newline-delimited JSON.
+
+    Rows are fetched through a server-side cursor in batches of
+    `EXPORT_BATCH_SIZE`, so memory stays flat regardless of table size.
+
+    Args:
+        session: Request session, used only for its bind and tenant
+        query: Select statement returning mapped objects
+        schema: Pydantic model used to serialize each row
+
+    Yields:
+        One chunk of NDJSON lines per fetched batch
+    """
+    # The request session may be closed as soon as the route returns,
+    # before the body is sent, so the stream owns its own session,
+    # scoped to the same tenant.
+    async with AsyncSession(
+        session.bind, info=dict(session.info)
+    ) as stream_session:
+        result = await stream_session.stream_scalars(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        async for rows in result.partitions():
+            yield b''.join(
+                schema.model_validate(row).model_dump_json().encode() + b'\n'
+                for row in rows
+            )
+            stream_session.expunge_all()
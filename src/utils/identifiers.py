@@ -0,0 +1,98 @@
+"""Utility functions for validating Brazilian CPF/CNPJ identifiers."""
+
+from operator import mul
+from typing import Iterable, Optional
+
+from src.models import IdentifierType
+from src.schemas.clients import CNPJ_LENGTH, CPF_LENGTH
+
+# Punctuation accepted in formatted identifiers, e.g. 123.456.789-09
+_PUNCTUATION = str.maketrans('', '', '.-/ ')
+
+_CPF_WEIGHTS = (tuple(range(10, 1, -1)), tuple(range(11, 1, -1)))
+_CNPJ_WEIGHTS = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+
+
+def normalize_identifier(identifier: str) -> str:
+    """Strip the punctuation of a formatted CPF/CNPJ."""
+    return identifier.translate(_PUNCTUATION)
+
+
+def _cpf_digit(digits: list[int], weights: tuple[int, ...]) -> int:
+    remainder = sum(map(mul, digits, weights)) * 10 % 11
+    return 0 if remainder == 10 else remainder  # noqa: PLR2004
+
+
+def _cnpj_digit(digits: list[int], weights: tuple[int, ...]) -> int:
+    remainder = sum(map(mul, digits, weights)) % 11
+    return 0 if remainder < 2 else 11 - remainder  # noqa: PLR2004
+
+
+def _check_identifier(
+    type_identifier: IdentifierType, identifier: str
+) -> Optional[str]:
+    if type_identifier == IdentifierType.cpf:
+        length, digit, weights = CPF_LENGTH, _cpf_digit, _CPF_WEIGHTS
+    else:
+        length, digit, weights = CNPJ_LENGTH, _cnpj_digit, _CNPJ_WEIGHTS
+
+    label = type_identifier.name.upper()
+
+    if len(identifier) != length or not identifier.isdigit():
+        return f'{label} must have exactly {length} digits'
+
+    digits = [int(char) for char in identifier]
+
+    # Repeated digits pass the checksum but are never issued
+    if len(set(digits)) == 1:
+        return f'Invalid {label}'
+
+    for weight in weights:
+        if digit(digits, weight) != digits[len(weight)]:
+            return f'Invalid {label} check digits'
+
+    return None
+
+
+def with_check_digits(type_identifier: IdentifierType, base: str) -> str:
+    """
+    Append the check digits to the base of a CPF/CNPJ.
+
+    Args:
+        type_identifier: Kind of identifier
+        base: The first 9 (CPF) or 12 (CNPJ) digits
+
+    Returns:
+        The complete identifier
+    """
+    if type_identifier == IdentifierType.cpf:
+        digit, weights = _cpf_digit, _CPF_WEIGHTS
+    else:
+        digit, weights = _cnpj_digit, _CNPJ_WEIGHTS
+
+    digits = [int(char) for char in base]
+    for weight in weights:
+        digits.append(digit(digits, weight))
+
+    return ''.join(map(str, digits))
+
+
+def validate_identifiers(
+    identifiers: Iterable[tuple[IdentifierType, str]],
+) -> list[Optional[str]]:
+    """
+    Validate length and check digits of a batch of identifiers.
+
+    Args:
+        identifiers: Pairs of identifier type and normalized identifier
+
+    Returns:
+        One error message per identifier, or None when it is valid
+    """
+    return [
+        _check_identifier(type_identifier, identifier)
+        for type_identifier, identifier in identifiers
+    ]
@@ -0,0 +1,120 @@
+"""Utility functions for embedding related objects in responses."""
+
+from http import HTTPStatus
+from typing import Any, Iterable, Optional, Sequence, TypedDict
+
+from fastapi import HTTPException
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from src.utils.serialization import RawJSONResponse
+
+
+class Includes:
+    """
+    Relations a route embeds on request, as in `?include=tasks,category`.
+
+    Each relation is loaded by its own loader option, `joinedload` for
+    many-to-one and `selectinload` for collections, so a response costs
+    a fixed number of statements however many rows it holds.
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        key: str,
+        loaders: dict[str, LoaderOption],
+    ):
+        """
+        Args:
+            schema: Pydantic model of one item, with an optional field
+                per relation
+            key: Name of the list in the page envelope, e.g. `tasks`
+            loaders: Loader option of each relation, by field name
+        """
+        self.key = key
+        self.loaders = loaders
+        self.fields = [
+            name for name in schema.model_fields if name not in loaders
+        ]
+
+        page = TypedDict(
+            f'{schema.__name__}Page',
+            {key: list[schema], 'next_cursor': Optional[str]},
+        )
+        self._adapter = TypeAdapter(page)
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the relations that can be included."""
+        return list(self.loaders)
+
+    def parse(self, include: Optional[str]) -> list[str]:
+        """
+        Parse an `include` query parameter, e.g. `tasks,category`.
+
+        Raises:
+            HTTPException: 422 when a name is not an includable relation
+        """
+        if include is None:
+            return []
+
+        names = list(
+            dict.fromkeys(name.strip() for name in include.split(','))
+        )
+        unknown = [name for name in names if name not in self.loaders]
+        if unknown:
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail=(
+                    f'Cannot include: {", ".join(unknown)}; use any of: '
+                    f'{", ".join(self.loaders)}'
+                ),
+            )
+
+        return names
+
+    def options(self, names: Iterable[str]) -> list[LoaderOption]:
+        """Return the loader options of the relations in `names`."""
+        return [self.loaders[name] for name in names]
+
+    def embed(self, row: Any, names: Iterable[str]) -> dict:
+        """
+        Read the fields of `row`, plus the relations in `names`.
+
+        Relations left out are absent from the result, rather than
+        null, and never loaded.
+        """
+        return {name: getattr(row, name) for name in (*self.fields, *names)}
+
+    def response(
+        self,
+        rows: Iterable[Any],
+        next_cursor: Optional[str],
+        names: Sequence[str],
+        fields: Optional[Sequence[str]] = None,
+    ) -> RawJSONResponse:
+        """
+        Serialize one page of loaded objects with their relations.
+
+        Args:
+            rows: Objects loaded with `options(names)`
+            next_cursor: Cursor of the next page
+            names: Relations to embed
+            fields: Fields to serialize besides the relations, every
+                field by default
+        """
+        page = self._adapter.validate_python({
+            self.key: [self.embed(row, names) for row in rows],
+            'next_cursor': next_cursor,
+        })
+        include = None
+        if fields is not None:
+            include = {
+                self.key: {'__all__': {*fields, *names}},
+                'next_cursor': True,
+            }
+
+        return RawJSONResponse(
+            self._adapter.dump_json(page, include=include, exclude_unset=True)
+        )
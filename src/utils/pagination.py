@@ -0,0 +1,202 @@
+"""Utility functions for keyset (cursor) pagination."""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Select, and_, func, literal, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# (column name, descending)
+DEFAULT_ORDER = (('created_at', False),)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _from_json(value: Any, python_type: type) -> Any:
+    if value is None:
+        return None
+    if python_type in {datetime, date}:
+        return python_type.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if not isinstance(value, python_type):
+        raise TypeError(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the position of a row into an opaque cursor.
+
+    Args:
+        values: Sort key values of the last row in the page, its id last
+
+    Returns:
+        A URL-safe string pointing right after the given row
+    """
+    payload = json.dumps([_to_json(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, types: Sequence[type] = (datetime, UUID)
+) -> tuple[Any, ...]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: The cursor
+        types: Python type of each encoded value
+
+    Raises:
+        HTTPException: If the cursor is malformed or does not match `types`
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+        if len(values) != len(types):
+            raise ValueError(values)
+        return tuple(map(_from_json, values, types))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor'
+        )
+
+
+def _sort_key(session: AsyncSession, column: Any) -> Any:
+    # SQLite stores `CURRENT_TIMESTAMP` defaults without fractional seconds
+    # while bound datetimes always carry them, so both sides are compared
+    # on the same text representation there.
+    if session.bind.dialect.name == 'sqlite' and isinstance(
+        column.type, DateTime
+    ):
+        return func.strftime('%Y-%m-%d %H:%M:%f', column)
+    return column
+
+
+def _selects(query: Select, model: Any) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]['expr'] is model
+
+
+def _bound(session: AsyncSession, column: Any, value: Any) -> Any:
+    return _sort_key(session, literal(value, column.type))
+
+
+def _after(
+    session: AsyncSession, order: list[tuple[Any, bool]], values: tuple
+) -> Any:
+    """Rows sorting after `values`, nulls last in every direction."""
+    clauses = []
+    ties = []
+
+    for (column, descending), value in zip(order, values):
+        key = _sort_key(session, column)
+
+        if value is None:
+            # Only other nulls tie, nothing sorts after them
+            ties.append(key.is_(None))
+            continue
+
+        bound = _bound(session, column, value)
+        after = key < bound if descending else key > bound
+        if column.nullable:
+            after = or_(after, key.is_(None))
+
+        clauses.append(and_(*ties, after))
+        ties.append(key == bound)
+
+    return or_(*clauses)
+
+
+async def paginate(  # noqa: PLR0913, PLR0917
+    session: AsyncSession,
+    query: Select,
+    model: Any,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    order_by: Sequence[tuple[str, bool]] = DEFAULT_ORDER,
+) -> tuple[list[Any], Optional[str]]:
+    """
+    Fetch one page of `query` in the order given by `order_by`.
+
+    The id is always appended as the final tie-breaker, and nullable
+    columns sort their nulls last in both directions.
+
+    Args:
+        session: Database session
+        query: Select statement over `model`, or over columns of
+            `model` including the sort columns, filters already applied
+        model: Mapped class exposing the sort columns and `id`
+        limit: Maximum number of rows to return
+        cursor: Cursor returned by the previous page, if any
+        order_by: Column names and whether each one is descending,
+            `created_at` ascending by default
+
+    Returns:
+        The rows of the page and the cursor of the next page, or None
+        when there are no more rows
+    """
+    names = [name for name, _ in order_by]
+    order = [(getattr(model, name), desc) for name, desc in order_by]
+    if 'id' not in names:
+        names.append('id')
+        order.append((model.id, False))
+
+    if cursor:
+        values = decode_cursor(
+            cursor, [column.type.python_type for column, _ in order]
+        )
+        directions = {descending for _, descending in order}
+
+        if len(directions) == 1 and not any(
+            column.nullable for column, _ in order
+        ):
+            # A row value comparison lets the database seek the index.
+            # The bound on the leading column it implies lets Postgres
+            # skip partitions of a table partitioned on that column.
+            keys = [_sort_key(session, c) for c, _ in order]
+            bounds = [
+                _bound(session, c, v) for (c, _), v in zip(order, values)
+            ]
+            if directions.pop():
+                query = query.where(
+                    tuple_(*keys) < tuple_(*bounds), keys[0] <= bounds[0]
+                )
+            else:
+                query = query.where(
+                    tuple_(*keys) > tuple_(*bounds), keys[0] >= bounds[0]
+                )
+        else:
+            query = query.where(_after(session, order, values))
+
+    for column, descending in order:
+        key = _sort_key(session, column)
+        key = key.desc() if descending else key.asc()
+        query = query.order_by(key.nulls_last() if column.nullable else key)
+
+    result = await session.execute(query.limit(limit + 1))
+    # Selecting the model yields objects, selecting columns yields rows
+    rows = (result.scalars() if _selects(query, model) else result).all()
+
+    if len(rows) <= limit:
+        return list(rows), None
+
+    rows = rows[:limit]
+    return list(rows), encode_cursor(
+        *(getattr(rows[-1], name) for name in names)
+    )
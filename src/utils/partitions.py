@@ -0,0 +1,42 @@
+"""Utility functions maintaining the partitions of the tasks table."""
+
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+from src.models import TASK_PARTITION_BY, task_partition_ddl
+
+
+async def create_task_partitions(
+    session: AsyncSession,
+    months_ahead: int = settings.TASKS_PARTITION_MONTHS_AHEAD,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Create the monthly partitions of `tasks` through `months_ahead`
+    months from now, when it is partitioned by `created_at`.
+
+    Run ahead of each month: until its partition exists, a month's
+    tasks land in the default partition, and a partition cannot be
+    created over rows the default partition already holds.
+
+    Returns:
+        The statements executed, none unless partitioned by `created_at`
+        on Postgres
+    """
+    connection = await session.connection()
+    if (
+        connection.dialect.name != 'postgresql'
+        or TASK_PARTITION_BY != 'created_at'
+    ):
+        return []
+
+    statements = task_partition_ddl(
+        TASK_PARTITION_BY, today or date.today(), months_ahead
+    )
+    for statement in statements:
+        await connection.exec_driver_sql(statement)
+    await session.commit()
+
+    return statements
@@ -0,0 +1,228 @@
+"""Utility functions maintaining the project value aggregates."""
+
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Row, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Category, Project, ProjectStats, session_tenant_id
+
+# (category_id, status_state, target_month)
+ProjectGroup = tuple[Optional[UUID], Optional[str], Optional[date]]
+# The group and value a project contributes, None when it counts nowhere
+ProjectSnapshot = Optional[tuple[ProjectGroup, Optional[float]]]
+
+_UPSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def project_snapshot(project: Project) -> ProjectSnapshot:
+    """Return what `project` currently contributes to the aggregates."""
+    if not project.is_active:
+        return None
+
+    target_month = (
+        project.target_date.replace(day=1) if project.target_date else None
+    )
+    group = (project.category_id, project.status_state, target_month)
+    return group, project.project_value
+
+
+def _group_key(group: ProjectGroup) -> str:
+    return '|'.join('' if part is None else str(part) for part in group)
+
+
+def _stats_row(
+    tenant_id: UUID,
+    group: ProjectGroup,
+    count: int,
+    value_count: int,
+    value_total: float,
+) -> dict:
+    category_id, status_state, target_month = group
+    return {
+        'tenant_id': tenant_id,
+        'group_key': _group_key(group),
+        'category_id': category_id,
+        'status_state': status_state,
+        'target_month': target_month,
+        'project_count': count,
+        'value_count': value_count,
+        'value_total': value_total,
+    }
+
+
+async def _add(
+    session: AsyncSession,
+    snapshot: tuple[ProjectGroup, Optional[float]],
+    sign: int,
+) -> None:
+    group, value = snapshot
+    row = _stats_row(
+        session_tenant_id(session),
+        group,
+        sign,
+        sign if value is not None else 0,
+        sign * (value or 0.0),
+    )
+
+    # Adding in the database keeps concurrent requests from losing updates
+    statement = _UPSERTS[session.bind.dialect.name](ProjectStats).values(row)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ProjectStats.tenant_id, ProjectStats.group_key],
+            set_={
+                column: getattr(ProjectStats, column)
+                + getattr(statement.excluded, column)
+                for column in ('project_count', 'value_count', 'value_total')
+            },
+        )
+    )
+
+
+async def update_project_stats(
+    session: AsyncSession, before: ProjectSnapshot, after: ProjectSnapshot
+) -> None:
+    """
+    Move a project's contribution from `before` to `after`.
+
+    Runs in the caller's transaction, so the aggregates are committed
+    together with the project change. The session must be scoped to the
+    project's tenant.
+
+    Args:
+        session: Database session
+        before: Snapshot taken before the change, None for a new project
+        after: Snapshot taken after the change, None for a deleted project
+    """
+    if before == after:
+        return
+
+    if before:
+        await _add(session, before, -1)
+    if after:
+        await _add(session, after, 1)
+
+
+async def rebuild_project_stats(session: AsyncSession) -> None:
+    """
+    Recompute the aggregates from every active project and commit.
+
+    Needed after loading projects without going through the API, and to
+    correct any drift. Covers the session's tenant, or every tenant when
+    the session is not scoped.
+    """
+    rows = await session.execute(
+        select(
+            Project.tenant_id,
+            Project.category_id,
+            Project.status_state,
+            Project.target_date,
+            func.count(),
+            func.count(Project.project_value),
+            func.coalesce(func.sum(Project.project_value), 0.0),
+        )
+        .where(Project.is_active)
+        .group_by(
+            Project.tenant_id,
+            Project.category_id,
+            Project.status_state,
+            Project.target_date,
+        )
+    )
+
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for tenant_id, category_id, status_state, target_date, *sums in rows:
+        month = target_date.replace(day=1) if target_date else None
+        group_totals = totals[tenant_id, (category_id, status_state, month)]
+        for i, value in enumerate(sums):
+            group_totals[i] += value
+
+    await session.execute(delete(ProjectStats))
+    if totals:
+        await session.execute(
+            insert(ProjectStats),
+            [
+                _stats_row(tenant_id, group, *sums)
+                for (tenant_id, group), sums in totals.items()
+            ],
+        )
+    await session.commit()
+
+
+def _summary(count: int, value_count: int, value_total: float) -> dict:
+    return {
+        'project_count': count,
+        'value_total': round(value_total, 2),
+        'value_average': (
+            round(value_total / value_count, 2) if value_count else None
+        ),
+    }
+
+
+def _summarize(rows: Iterable[Row], name: str) -> list[dict]:
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for row in rows:
+        group_totals = totals[getattr(row, name)]
+        group_totals[0] += row.project_count
+        group_totals[1] += row.value_count
+        group_totals[2] += row.value_total
+
+    return [
+        {name: key, **_summary(*sums)}
+        for key, sums in totals.items()
+        if sums[0]
+    ]
+
+
+async def get_project_analytics(session: AsyncSession) -> dict:
+    """
+    Summarize active projects by category, status and target month.
+
+    Reads the aggregate rows only, so the cost depends on the number of
+    distinct groups rather than the number of projects.
+
+    Returns:
+        Totals over every active project, plus one entry per category,
+        status and month holding the count, total and average value
+    """
+    rows = (
+        await session.execute(
+            select(
+                ProjectStats.category_id,
+                ProjectStats.status_state,
+                ProjectStats.target_month,
+                ProjectStats.project_count,
+                ProjectStats.value_count,
+                ProjectStats.value_total,
+                Category.name.label('category_name'),
+            )
+            .outerjoin(Category, Category.id == ProjectStats.category_id)
+            .where(ProjectStats.project_count > 0)
+        )
+    ).all()
+
+    names = {row.category_id: row.category_name for row in rows}
+    by_category = _summarize(rows, 'category_id')
+    for entry in by_category:
+        entry['category_name'] = names[entry['category_id']]
+
+    return {
+        **_summary(
+            sum(row.project_count for row in rows),
+            sum(row.value_count for row in rows),
+            sum(row.value_total for row in rows),
+        ),
+        'by_category': by_category,
+        'by_status': _summarize(rows, 'status_state'),
+        'by_month': sorted(
+            _summarize(rows, 'target_month'),
+            key=lambda entry: (
+                entry['target_month'] is None,
+                entry['target_month'] or date.min,
+            ),
+        ),
+    }
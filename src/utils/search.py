@@ -0,0 +1,108 @@
+"""Utility functions for full-text search over tasks and projects."""
+
+import re
+from typing import Any
+
+from sqlalchemy import (
+    Select,
+    column,
+    func,
+    literal,
+    literal_column,
+    null,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import SEARCH_CONFIG, Project, Task
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# bm25 weight of each FTS5 column, titles count ten times a description
+_FTS_WEIGHTS = {'tasks': (10.0, 1.0), 'projects': (10.0,)}
+
+
+def _terms(q: str) -> list[str]:
+    return re.findall(r'\w+', q)
+
+
+def _columns(model: type, kind: str, title: Any, rank: Any) -> tuple:
+    return (
+        literal(kind).label('type'),
+        model.id,
+        title.label('title'),
+        (model.project_id if model is Task else null()).label('project_id'),
+        rank.label('rank'),
+    )
+
+
+def _postgres_query(model: type, kind: str, title: Any, q: str) -> Select:
+    vector = literal_column(
+        f'{model.__tablename__}.search_vector', type_=TSVECTOR
+    )
+    query = func.plainto_tsquery(SEARCH_CONFIG, q)
+
+    return select(
+        *_columns(model, kind, title, func.ts_rank(vector, query))
+    ).where(vector.op('@@')(query), model.is_active)
+
+
+def _sqlite_query(model: type, kind: str, title: Any, q: str) -> Select:
+    name = f'{model.__tablename__}_fts'
+    fts = table(name, column('rowid'))
+    # Quoted terms are matched literally and all of them must appear,
+    # like plainto_tsquery
+    match = ' '.join(f'"{term}"' for term in _terms(q))
+    # bm25 is lower for better matches
+    rank = -func.bm25(literal_column(name), *_FTS_WEIGHTS[model.__tablename__])
+
+    return (
+        select(*_columns(model, kind, title, rank))
+        .join(
+            fts, fts.c.rowid == literal_column(f'{model.__tablename__}.rowid')
+        )
+        .where(literal_column(name).op('MATCH')(match), model.is_active)
+    )
+
+
+async def search(
+    session: AsyncSession, q: str, limit: int = DEFAULT_SEARCH_LIMIT
+) -> list[dict]:
+    """
+    Find active tasks and projects matching every word of `q`.
+
+    Task titles and descriptions and project names are matched through
+    the full-text index of the database, a generated `tsvector` with a
+    GIN index on Postgres or an FTS5 table on SQLite.
+
+    Args:
+        session: Database session
+        q: Words to search for, operators are not interpreted
+        limit: Maximum number of results
+
+    Returns:
+        The best matches first, each with its type, id, title, the
+        project of tasks and a rank comparable within one response
+    """
+    if not _terms(q):
+        return []
+
+    build = (
+        _postgres_query
+        if session.bind.dialect.name == 'postgresql'
+        else _sqlite_query
+    )
+    matches = union_all(
+        build(Task, 'task', Task.title, q),
+        build(Project, 'project', Project.name, q),
+    ).subquery()
+
+    rows = await session.execute(
+        select(matches).order_by(matches.c.rank.desc()).limit(limit)
+    )
+
+    return [row._asdict() for row in rows]
@@ -0,0 +1,298 @@
+"""Utility functions for generating synthetic data at scale."""
+
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from time import perf_counter
+from typing import Any, Iterator
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import (
+    Category,
+    Client,
+    IdentifierType,
+    Project,
+    Task,
+    User,
+    session_tenant_id,
+)
+from src.security import get_password_hash
+from src.utils.bulk_load import bulk_insert
+from src.utils.identifiers import with_check_digits
+from src.utils.project_stats import rebuild_project_stats
+from src.utils.tenants import scope_to_default_tenant
+
+SYNTHETIC_PASSWORD = 'synthetic-password'
+SYNTHETIC_BATCH_SIZE = 10_000
+TASK_ID_SAMPLE_SIZE = 1000
+
+# Rows generated per unit of `--scale`
+SCALE_VOLUMES = {'users': 10, 'clients': 100, 'projects': 50, 'tasks': 1000}
+
+FIRST_NAMES = (
+    'Ana', 'Bruno', 'Camila', 'Diego', 'Eduarda', 'Felipe', 'Gabriela',
+    'Henrique', 'Isabela', 'Joao', 'Larissa', 'Lucas', 'Mariana', 'Pedro',
+    'Rafaela', 'Thiago', 'Vitoria', 'Gustavo', 'Juliana', 'Rodrigo',
+)  # fmt: skip
+LAST_NAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira',
+    'Alves', 'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins',
+    'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira',
+)  # fmt: skip
+COMPANY_SUFFIXES = ('Ltda', 'S.A.', 'ME', 'EIRELI', 'Comercio Ltda')
+CATEGORY_NAMES = (
+    'Design', 'Marketing', 'Desenvolvimento', 'Financeiro', 'Juridico',
+    'Consultoria', 'Eventos', 'Fotografia', 'Video', 'Branding',
+    'Social Media', 'Arquitetura', 'Interiores', 'Pesquisa', 'Treinamento',
+)  # fmt: skip
+PROJECT_WORDS = (
+    'Portal', 'Campanha', 'Identidade', 'Loja', 'Catalogo', 'Evento',
+    'Aplicativo', 'Relatorio', 'Reforma', 'Lancamento', 'Site', 'Painel',
+)  # fmt: skip
+PROJECT_STATES = ('planning', 'active', 'on_hold', 'completed')
+TASK_VERBS = (
+    'Revisar', 'Criar', 'Aprovar', 'Enviar', 'Atualizar', 'Testar',
+    'Publicar', 'Orcar', 'Documentar', 'Apresentar',
+)  # fmt: skip
+TASK_OBJECTS = (
+    'briefing', 'layout', 'contrato', 'proposta', 'cronograma', 'relatorio',
+    'prototipo', 'orcamento', 'apresentacao', 'entregaveis',
+)  # fmt: skip
+TASK_STATUSES = ('to_do', 'in_progress', 'review', 'done')
+TASK_PRIORITIES = ('low', 'medium', 'high', 'critical')
+
+# Share of generated rows having each property
+CPF_CLIENT_RATE = 0.5
+INACTIVE_USER_RATE = 0.02
+INACTIVE_ROW_RATE = 0.05
+TASK_DESCRIPTION_RATE = 0.5
+TASK_CATEGORY_RATE = 0.7
+
+
+def scale_volumes(scale: int) -> dict[str, int]:
+    """Return the number of rows of each table generated for `scale`."""
+    return {table: count * scale for table, count in SCALE_VOLUMES.items()}
+
+
+class _Generator:
+    """Deterministic row factories sharing one random source."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.today = self.now.date()
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def created_at(self) -> datetime:
+        # Spread over the last year so pagination and sorting are realistic
+        return self.now - timedelta(seconds=self.rng.random() * 365 * 86400)
+
+    def future_date(self) -> date:
+        return self.today + timedelta(days=self.rng.randrange(-30, 180))
+
+    def person(self) -> tuple[str, str]:
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def users(self, user_ids: list[uuid.UUID], password: str) -> Iterator:
+        for i, user_id in enumerate(user_ids):
+            first, last = self.person()
+            yield {
+                'id': user_id,
+                'email': f'{first}.{last}.{i}@example.com'.lower(),
+                'password': password,
+                'full_name': f'{first} {last}',
+                'is_superuser': False,
+                'is_active': self.rng.random() >= INACTIVE_USER_RATE,
+                'token_version': 0,
+                'created_at': self.created_at(),
+            }
+
+    def clients(self, client_ids: list[uuid.UUID]) -> Iterator:
+        cpf_number = 0
+        cnpj_number = 0
+
+        for client_id in client_ids:
+            if self.rng.random() < CPF_CLIENT_RATE:
+                cpf_number += 1
+                base = f'{cpf_number:09d}'
+                # Repeated-digit CPFs are invalid, skip them
+                if len(set(base)) == 1:
+                    cpf_number += 1
+                    base = f'{cpf_number:09d}'
+                type_identifier = IdentifierType.cpf
+                name = ' '.join(self.person())
+                client_type = 'individual'
+            else:
+                cnpj_number += 1
+                base = f'{cnpj_number:08d}0001'
+                type_identifier = IdentifierType.cnpj
+                name = (
+                    f'{self.rng.choice(LAST_NAMES)} '
+                    f'{self.rng.choice(COMPANY_SUFFIXES)}'
+                )
+                client_type = 'business'
+
+            yield {
+                'id': client_id,
+                'name': name,
+                'client_type': client_type,
+                'type_identifier': type_identifier,
+                'identifier': with_check_digits(type_identifier, base),
+                'is_active': True,
+                'created_at': self.created_at(),
+            }
+
+    def projects(
+        self,
+        project_ids: list[uuid.UUID],
+        user_ids: list[uuid.UUID],
+        category_ids: list[uuid.UUID],
+    ) -> Iterator:
+        for i, project_id in enumerate(project_ids):
+            yield {
+                'id': project_id,
+                'name': f'{self.rng.choice(PROJECT_WORDS)} {i}',
+                'created_by': self.rng.choice(user_ids),
+                'category_id': self.rng.choice(category_ids),
+                'status_state': self.rng.choice(PROJECT_STATES),
+                'project_value': round(self.rng.uniform(1_000, 500_000), 2),
+                'target_date': self.future_date(),
+                'is_active': self.rng.random() >= INACTIVE_ROW_RATE,
+                'created_at': self.created_at(),
+            }
+
+    def tasks(
+        self,
+        count: int,
+        project_ids: list[uuid.UUID],
+        user_ids: list[uuid.UUID],
+        category_ids: list[uuid.UUID],
+        task_ids: list[uuid.UUID],
+    ) -> Iterator:
+        rng = self.rng
+        for _ in range(count):
+            task_id = self.new_id()
+            if len(task_ids) < TASK_ID_SAMPLE_SIZE:
+                task_ids.append(task_id)
+
+            title = f'{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}'
+            yield {
+                'id': task_id,
+                'title': title,
+                'description': (
+                    f'{title} do projeto'
+                    if rng.random() < TASK_DESCRIPTION_RATE
+                    else None
+                ),
+                'project_id': rng.choice(project_ids),
+                'created_by': rng.choice(user_ids),
+                'category_id': (
+                    rng.choice(category_ids)
+                    if rng.random() < TASK_CATEGORY_RATE
+                    else None
+                ),
+                'status': rng.choice(TASK_STATUSES),
+                'priority': rng.choice(TASK_PRIORITIES),
+                'due_date': self.future_date(),
+                'is_active': rng.random() >= INACTIVE_ROW_RATE,
+                'created_at': self.created_at(),
+            }
+
+
+async def _load(session: AsyncSession, model: Any, rows: Iterator) -> int:
+    start = perf_counter()
+    total = 0
+
+    while batch := list(islice(rows, SYNTHETIC_BATCH_SIZE)):
+        await bulk_insert(session, model, batch)
+        await session.commit()
+        total += len(batch)
+
+    logger.info(
+        'Inserted {} {} in {:.1f}s',
+        total,
+        model.__tablename__,
+        perf_counter() - start,
+    )
+    return total
+
+
+async def generate_data(
+    session: AsyncSession, volumes: dict[str, int], seed: int = 0
+) -> dict[str, list[uuid.UUID]]:
+    """
+    Fill an empty database with realistic synthetic rows.
+
+    Every user shares one password hash, computed once, and rows are
+    loaded in batches of `SYNTHETIC_BATCH_SIZE` through `bulk_insert`
+    (`COPY` on Postgres), committing after each batch.
+
+    Args:
+        session: Database session
+        volumes: Rows per table, see `scale_volumes`
+        seed: Seed of the random generator, the same seed generates the
+            same rows and ids
+
+    Rows belong to the session's tenant, or to the default tenant when
+    the session is not scoped to one.
+
+    Returns:
+        Ids of the generated users, clients, categories and projects,
+        and a sample of at most `TASK_ID_SAMPLE_SIZE` task ids
+    """
+    if session_tenant_id(session) is None:
+        await scope_to_default_tenant(session)
+
+    generator = _Generator(seed)
+    password = get_password_hash(SYNTHETIC_PASSWORD)
+
+    user_ids = [generator.new_id() for _ in range(max(volumes['users'], 1))]
+    client_ids = [generator.new_id() for _ in range(volumes['clients'])]
+    category_ids = [generator.new_id() for _ in CATEGORY_NAMES]
+    project_ids = [
+        generator.new_id() for _ in range(max(volumes['projects'], 1))
+    ]
+    task_ids = []
+
+    await _load(session, User, generator.users(user_ids, password))
+    await _load(session, Client, generator.clients(client_ids))
+    await _load(
+        session,
+        Category,
+        (
+            {
+                'id': category_id,
+                'name': name,
+                'is_active': True,
+                'created_at': generator.created_at(),
+            }
+            for category_id, name in zip(category_ids, CATEGORY_NAMES)
+        ),
+    )
+    await _load(
+        session,
+        Project,
+        generator.projects(project_ids, user_ids, category_ids),
+    )
+    await _load(
+        session,
+        Task,
+        generator.tasks(
+            volumes['tasks'], project_ids, user_ids, category_ids, task_ids
+        ),
+    )
+    # Bulk loaded projects bypass the incremental updates
+    await rebuild_project_stats(session)
+
+    return {
+        'user_ids': user_ids,
+        'client_ids': client_ids,
+        'category_ids': category_ids,
+        'project_ids': project_ids,
+        'task_ids': task_ids,
+    }
@@ -0,0 +1,65 @@
+"""Utility functions for resolving tenants."""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.settings import settings
+from src.models import TENANT_KEY, Tenant
+
+# Active tenant ids keyed by domain, local to each worker. Every request
+# resolves its tenant, so a hit saves a query per request; the TTL
+# bounds how long a deactivated tenant stays reachable.
+tenant_cache = TTLCache(
+    maxsize=settings.TENANT_CACHE_MAX_SIZE,
+    ttl=settings.TENANT_CACHE_TTL_SECONDS,
+)
+
+
+async def get_tenant_id(session: AsyncSession, domain: str) -> Optional[UUID]:
+    """
+    Resolve the active tenant of `domain`.
+
+    Args:
+        session: Database session
+        domain: Domain of the tenant, as sent in `X-Tenant-Domain`
+
+    Returns:
+        The id of the tenant, or None when no active tenant has `domain`
+    """
+    tenant_id = tenant_cache.get(domain)
+    if tenant_id is not None:
+        return tenant_id
+
+    tenant_id = await session.scalar(
+        select(Tenant.id).where(Tenant.domain == domain, Tenant.is_active)
+    )
+    if tenant_id is not None:
+        tenant_cache.set(domain, tenant_id)
+
+    return tenant_id
+
+
+async def scope_to_default_tenant(session: AsyncSession) -> UUID:
+    """
+    Scope `session` to the default tenant, creating the tenant if needed.
+
+    Used by scripts, which act on the tenant of `DEFAULT_TENANT_DOMAIN`.
+    """
+    domain = settings.DEFAULT_TENANT_DOMAIN
+    tenant_id = await session.scalar(
+        select(Tenant.id).where(Tenant.domain == domain)
+    )
+
+    if tenant_id is None:
+        tenant = Tenant(name=domain, domain=domain)
+        session.add(tenant)
+        await session.flush()
+        tenant_id = tenant.id
+        await session.commit()
+
+    session.info[TENANT_KEY] = tenant_id
+    return tenant_id
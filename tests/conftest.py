@@ -8,10 +8,23 @@ from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-from src.api.dependencies import get_session
+from src.api.dependencies import get_session, token_versions, user_cache
 from src.api.main import app
+from src.core.database import begin_sqlite_transactions, instrument_engine
+from src.core.settings import settings
 from src.models import Client, Project, User, table_registry
 from src.security import get_password_hash
+from src.utils.category_utils import category_cache
+from src.utils.tenants import scope_to_default_tenant, tenant_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    user_cache.clear()
+    token_versions.clear()
+    category_cache.clear()
+    tenant_cache.clear()
 
 
 @pytest_asyncio.fixture
@@ -46,6 +59,35 @@ def mock_db_time():
     return _mock_db_time
 
 
+@pytest.fixture
+def assert_query_count(session):
+    """
+    Assert the exact number of statements run inside a `with` block.
+
+    Usage:
+        with assert_query_count(3):
+            api_client.get(...)
+    """
+
+    @contextmanager
+    def assert_query_count(expected):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, 'after_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'after_cursor_execute', record)
+
+        assert len(statements) == expected, '\n'.join(statements)
+
+    return assert_query_count
+
+
 @pytest_asyncio.fixture
 async def session():
     engine = create_async_engine(
@@ -53,10 +95,16 @@ async def session():
         connect_args={'check_same_thread': False},
         poolclass=StaticPool,
     )
+    instrument_engine(engine)
+    begin_sqlite_transactions(engine)
     async with engine.begin() as conn:
         await conn.run_sync(table_registry.metadata.create_all)
 
     async with AsyncSession(engine, expire_on_commit=False) as session:
+        # Fixtures and requests act on the default tenant, already cached
+        # like on a warm worker
+        tenant_id = await scope_to_default_tenant(session)
+        tenant_cache.set(settings.DEFAULT_TENANT_DOMAIN, tenant_id)
         yield session
 
     async with engine.begin() as conn:
@@ -141,6 +141,26 @@ def test_get_all_clients(
     assert response_client['is_active'] == client_schema['is_active']
 
 
+def test_get_all_clients_fields(
+    api_client, db_client, superuser_token
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+
+    response = api_client.get(url='/clients?fields=id,name', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['clients'] == [
+        {'id': str(db_client.id), 'name': db_client.name}
+    ]
+
+    response = api_client.get(
+        url='/clients?fields=name,password', headers=headers
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'].startswith('Unknown fields: password')
+
+
 def test_get_client_by_id(
     session, db_client, api_client, superuser_token
 ) -> None:
@@ -168,3 +188,109 @@ def test_get_client_by_id_not_found(
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'Client not found'}
+
+
+def test_import_clients(api_client, db_client, superuser_token) -> None:
+    csv_content = (
+        'name,client_type,type_identifier,identifier\n'
+        'Ana,pf,cpf,529.982.247-25\n'
+        'Caju,pj,cnpj,11.222.333/0001-81\n'
+        'Dup,pj,cnpj,11222333000181\n'
+        'Bad,pf,cpf,52998224724\n'
+        'Old,pj,cnpj,12345678901234\n'
+        ',pf,rg,123\n'
+    )
+
+    response = api_client.post(
+        url='/clients/import',
+        files={'file': ('clients.csv', csv_content, 'text/csv')},
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['imported'] == 2  # noqa: PLR2004
+    assert [(error['line'], error['error']) for error in data['errors']] == [
+        (7, 'Missing name'),
+        (4, 'Duplicate identifier in file'),
+        (5, 'Invalid CPF check digits'),
+        (6, 'Invalid CNPJ check digits'),
+    ]
+
+    response = api_client.get(
+        url='/clients',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+    identifiers = {
+        client['identifier'] for client in response.json()['clients']
+    }
+    assert {'52998224725', '11222333000181'} <= identifiers
+
+    # Importing the first row again is reported as a duplicate
+    response = api_client.post(
+        url='/clients/import',
+        files={'file': ('clients.csv', csv_content[:70], 'text/csv')},
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.json() == {
+        'imported': 0,
+        'errors': [
+            {
+                'line': 2,
+                'identifier': '52998224725',
+                'error': 'Client already exists',
+            }
+        ],
+    }
+
+
+def test_import_clients_missing_columns(api_client, superuser_token) -> None:
+    response = api_client.post(
+        url='/clients/import',
+        files={'file': ('clients.csv', 'name,identifier\n', 'text/csv')},
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'Missing columns: client_type, type_identifier'
+    }
+
+
+def test_import_clients_requires_superuser(api_client, user_token) -> None:
+    response = api_client.post(
+        url='/clients/import',
+        files={'file': ('clients.csv', '', 'text/csv')},
+        headers={'Authorization': f'Bearer {user_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_get_client_by_id_not_modified(
+    api_client, db_client, superuser_token
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    etag = api_client.get(f'/clients/{db_client.id}', headers=headers).headers[
+        'ETag'
+    ]
+
+    response = api_client.get(
+        f'/clients/{db_client.id}', headers={**headers, 'If-None-Match': etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = api_client.patch(
+        f'/clients/{db_client.id}',
+        json={'name': 'renamed'},
+        headers={**headers, 'If-Match': etag},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = api_client.patch(
+        f'/clients/{db_client.id}',
+        json={'name': 'renamed again'},
+        headers={**headers, 'If-Match': etag},
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+from src.core.metrics import CONTENT_TYPE
+
+
+def test_metrics(api_client, user_token) -> None:
+    api_client.get(
+        '/users/me', headers={'Authorization': f'Bearer {user_token}'}
+    )
+
+    response = api_client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == CONTENT_TYPE
+    lines = response.text.splitlines()
+    assert any(
+        line.startswith(
+            'http_requests_total{method="GET",route="/users/me",status="200"}'
+        )
+        for line in lines
+    )
+    assert any(
+        line.startswith(
+            'http_request_db_queries_count{method="GET",route="/users/me"}'
+        )
+        for line in lines
+    )
+    assert any(
+        line.startswith('password_hash_seconds_count{operation="verify"}')
+        for line in lines
+    )
+    assert any(line.startswith('db_queries_total ') for line in lines)
+    assert any(
+        line.startswith('cache_entries{cache="users"}') for line in lines
+    )
+
+
+def test_metrics_route_template_label(api_client, user_token) -> None:
+    api_client.get(
+        '/tasks/123e4567-e89b-12d3-a456-426614174000',
+        headers={'Authorization': f'Bearer {user_token}'},
+    )
+
+    response = api_client.get('/metrics')
+
+    assert (
+        'http_requests_total{method="GET",route="/tasks/{task_id}",'
+        'status="404"}'
+    ) in response.text
+    assert '123e4567' not in response.text
@@ -1,9 +1,12 @@
+import json
 from datetime import date
 from http import HTTPStatus
 from uuid import UUID
 
+import pytest
 import pytest_asyncio
 
+from src.api.routes import projects
 from src.models import Project
 
 
@@ -119,6 +122,35 @@ def test_update_project(api_client, db_project, superuser_token) -> None:
     assert UUID(data['updated_by']) is not None
 
 
+@pytest.mark.parametrize(
+    ('project_id', 'if_match', 'status'),
+    [
+        (
+            '123e4567-e89b-12d3-a456-426614174000',
+            None,
+            HTTPStatus.NOT_FOUND,
+        ),
+        (None, '"stale"', HTTPStatus.PRECONDITION_FAILED),
+    ],
+)
+def test_update_project_rejected_creates_no_category(  # noqa: PLR0913, PLR0917
+    api_client, db_project, superuser_token, project_id, if_match, status
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+
+    response = api_client.patch(
+        f'/projects/{project_id or db_project.id}',
+        json={'category_name': 'New category'},
+        headers={**headers, 'If-Match': if_match} if if_match else headers,
+    )
+
+    assert response.status_code == status
+    assert (
+        api_client.get('/categories/', headers=headers).json()['categories']
+        == []
+    )
+
+
 def test_update_project_integrity_error(
     api_client, db_project, superuser_token
 ) -> None:
@@ -151,7 +183,53 @@ def test_get_all_projects(session, api_client, superuser_token) -> None:
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'projects': []}
+    assert response.json() == {'projects': [], 'next_cursor': None}
+
+
+def test_get_all_projects_paginated(
+    api_client, superuser, superuser_token
+) -> None:
+    for name in ('project1', 'project2', 'project3'):
+        api_client.post(
+            url='/projects',
+            json={'name': name},
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        )
+
+    PAGE_SIZE = 2
+
+    first_page = api_client.get(
+        url=f'/projects?limit={PAGE_SIZE}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    ).json()
+    second_page = api_client.get(
+        url=f'/projects?limit={PAGE_SIZE}&cursor={first_page["next_cursor"]}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    ).json()
+
+    assert len(first_page['projects']) == PAGE_SIZE
+    assert len(second_page['projects']) == 1
+    assert second_page['next_cursor'] is None
+    names = {p['name'] for p in first_page['projects']}
+    names.add(second_page['projects'][0]['name'])
+    assert names == {'project1', 'project2', 'project3'}
+
+
+def test_get_all_projects_fields(api_client, superuser_token) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    for name in ('project1', 'project2'):
+        api_client.post(url='/projects', json={'name': name}, headers=headers)
+
+    url = '/projects?limit=1&fields=name'
+    first_page = api_client.get(url=url, headers=headers).json()
+    second_page = api_client.get(
+        url=f'{url}&cursor={first_page["next_cursor"]}', headers=headers
+    ).json()
+
+    assert first_page['projects'] + second_page['projects'] in (
+        [{'name': 'project1'}, {'name': 'project2'}],
+        [{'name': 'project2'}, {'name': 'project1'}],
+    )
 
 
 def test_get_project_by_id(
@@ -176,6 +254,164 @@ def test_get_project_by_id(
         assert data['updated_by'] is None
 
 
+def _project_with_tasks(api_client, headers, name: str, tasks: int) -> str:
+    project_id = api_client.post(
+        url='/projects',
+        json={'name': name, 'category_name': f'{name} category'},
+        headers=headers,
+    ).json()['id']
+    for i in range(tasks):
+        api_client.post(
+            url='/tasks',
+            json={'title': f'{name} task {i}', 'project_id': project_id},
+            headers=headers,
+        )
+    return project_id
+
+
+def test_create_project_cached_category_query_count(
+    api_client, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    api_client.post(
+        url='/categories', json={'name': 'Design'}, headers=headers
+    )
+
+    # The name check, which also checks the cached category is active,
+    # insert, stats, refresh
+    with assert_query_count(4) as statements:
+        response = api_client.post(
+            url='/projects',
+            json={'name': 'New Project', 'category_name': 'Design'},
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert 'FROM categories' in statements[0]
+
+
+def test_update_project_cached_category_query_count(
+    api_client, db_project, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    category = api_client.post(
+        url='/categories', json={'name': 'Design'}, headers=headers
+    ).json()
+
+    # The row select, which also checks the cached category is active,
+    # update, stats of the old and new groups, refresh
+    with assert_query_count(5) as statements:
+        response = api_client.patch(
+            url=f'/projects/{db_project.id}',
+            json={'category_name': 'Design'},
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['category_id'] == category['id']
+    assert 'FROM categories' in statements[0]
+
+
+def test_get_project_by_id_include(
+    api_client, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    project_id = _project_with_tasks(api_client, headers, 'project1', 3)
+
+    # The project joined to its category, then its tasks
+    with assert_query_count(2):
+        response = api_client.get(
+            url=f'/projects/{project_id}?include=tasks,category',
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'ETag' not in response.headers
+    data = response.json()
+    assert data['category']['name'] == 'project1 category'
+    assert data['category']['id'] == data['category_id']
+    assert sorted(task['title'] for task in data['tasks']) == [
+        'project1 task 0',
+        'project1 task 1',
+        'project1 task 2',
+    ]
+
+    data = api_client.get(
+        url=f'/projects/{project_id}', headers=headers
+    ).json()
+    assert 'tasks' not in data
+    assert 'category' not in data
+
+
+def test_get_all_projects_include(
+    api_client, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    for i in range(3):
+        _project_with_tasks(api_client, headers, f'project{i}', i + 1)
+
+    # The page joined to the categories, then the tasks of the page
+    with assert_query_count(2):
+        response = api_client.get(
+            url='/projects?include=tasks,category&fields=name',
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    projects = response.json()['projects']
+    assert {
+        project['name']: len(project['tasks']) for project in projects
+    } == {
+        'project0': 1,
+        'project1': 2,
+        'project2': 3,
+    }
+    assert all(
+        project.keys() == {'name', 'tasks', 'category'} for project in projects
+    )
+
+
+def test_include_tasks_capped(
+    api_client, superuser_token, monkeypatch
+) -> None:
+    monkeypatch.setattr(projects, 'INCLUDED_TASKS', 2)
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    project_id = _project_with_tasks(api_client, headers, 'project', 4)
+    tasks = api_client.get(
+        url=f'/tasks?project_id={project_id}', headers=headers
+    ).json()['tasks']
+    deleted = tasks[0]
+    response = api_client.delete(
+        url=f'/tasks/{deleted["id"]}', headers=headers
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = api_client.get(url='/projects?include=tasks', headers=headers)
+    (listed,) = response.json()['projects']
+    response = api_client.get(
+        url=f'/projects/{project_id}?include=tasks', headers=headers
+    )
+    single = response.json()
+
+    # The same tasks on both routes: active ones, at most INCLUDED_TASKS
+    assert listed['tasks'] == single['tasks']
+    assert len(single['tasks']) == 2  # noqa: PLR2004
+    assert deleted['id'] not in {task['id'] for task in single['tasks']}
+    assert all(task['is_active'] for task in single['tasks'])
+
+
+def test_get_project_unknown_include(
+    api_client, db_project, superuser_token
+) -> None:
+    response = api_client.get(
+        url=f'/projects/{db_project.id}?include=owner',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'].startswith('Cannot include: owner')
+
+
 def test_get_project_by_id_not_found(
     session, api_client, superuser_token
 ) -> None:
@@ -186,3 +422,91 @@ def test_get_project_by_id_not_found(
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': "Project doesn't exist"}
+
+
+def test_export_projects(api_client, db_project, superuser_token) -> None:
+    response = api_client.get(
+        url='/projects/export',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])['name'] == db_project.name
+
+
+def test_project_analytics(api_client, superuser_token) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    ids = []
+    for name, status, value, target_date, category in [
+        ('p1', 'active', 1000.0, '2025-01-10', 'Design'),
+        ('p2', 'active', 3000.0, '2025-01-25', 'Design'),
+        ('p3', 'planning', None, '2025-02-01', None),
+        ('p4', 'active', 500.0, None, 'Video'),
+    ]:
+        response = api_client.post(
+            url='/projects',
+            json={
+                'name': name,
+                'status_state': status,
+                'project_value': value,
+                'target_date': target_date,
+                'category_name': category,
+            },
+            headers=headers,
+        )
+        ids.append(response.json()['id'])
+
+    # Move p2 to another status and month, then delete p4
+    api_client.patch(
+        url=f'/projects/{ids[1]}',
+        json={'status_state': 'completed', 'target_date': '2025-02-15'},
+        headers=headers,
+    )
+    api_client.delete(url=f'/projects/{ids[3]}', headers=headers)
+
+    response = api_client.get('/projects/analytics', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['project_count'] == 3  # noqa: PLR2004
+    assert data['value_total'] == 4000.0  # noqa: PLR2004
+    assert data['value_average'] == 2000.0  # noqa: PLR2004
+    assert {
+        entry['category_name']: entry['project_count']
+        for entry in data['by_category']
+    } == {'Design': 2, None: 1}
+    assert {
+        entry['status_state']: entry['value_total']
+        for entry in data['by_status']
+    } == {'active': 1000.0, 'completed': 3000.0, 'planning': 0.0}
+    assert [
+        (entry['target_month'], entry['project_count'])
+        for entry in data['by_month']
+    ] == [('2025-01-01', 1), ('2025-02-01', 2)]
+    assert (
+        next(
+            entry
+            for entry in data['by_status']
+            if entry['status_state'] == 'planning'
+        )['value_average']
+        is None
+    )
+
+
+def test_project_analytics_empty(api_client, superuser_token) -> None:
+    response = api_client.get(
+        '/projects/analytics',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'project_count': 0,
+        'value_total': 0.0,
+        'value_average': None,
+        'by_category': [],
+        'by_status': [],
+        'by_month': [],
+    }
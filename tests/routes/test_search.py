@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest_asyncio
+
+from src.models import Project, Task
+
+
+@pytest_asyncio.fixture
+async def searchable(session, superuser) -> dict:
+    project = Project(name='Portal do cliente', created_by=superuser.id)
+    session.add(project)
+    await session.commit()
+
+    tasks = {
+        'title': Task(
+            title='Revisar layout',
+            description='Primeira versao',
+            project_id=project.id,
+            created_by=superuser.id,
+        ),
+        'description': Task(
+            title='Enviar proposta',
+            description='Incluir o layout aprovado',
+            project_id=project.id,
+            created_by=superuser.id,
+        ),
+        'inactive': Task(
+            title='Layout antigo',
+            project_id=project.id,
+            created_by=superuser.id,
+            is_active=False,
+        ),
+    }
+    session.add_all(tasks.values())
+    await session.commit()
+
+    return {'project': project, **tasks}
+
+
+def _search(api_client, token, q):
+    response = api_client.get(
+        '/search',
+        params={'q': q},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['results']
+
+
+def test_search_ranks_titles_first(
+    api_client, searchable, superuser_token
+) -> None:
+    results = _search(api_client, superuser_token, 'layout')
+
+    assert [result['id'] for result in results] == [
+        str(searchable['title'].id),
+        str(searchable['description'].id),
+    ]
+    assert results[0]['type'] == 'task'
+    assert results[0]['project_id'] == str(searchable['project'].id)
+    assert results[0]['rank'] > results[1]['rank']
+
+
+def test_search_projects_and_accents(
+    api_client, searchable, superuser_token
+) -> None:
+    results = _search(api_client, superuser_token, 'PORTAL')
+
+    assert results == [
+        {
+            'type': 'project',
+            'id': str(searchable['project'].id),
+            'title': 'Portal do cliente',
+            'project_id': None,
+            'rank': results[0]['rank'],
+        }
+    ]
+    # Matching ignores case and diacritics
+    assert _search(api_client, superuser_token, 'versão')
+
+
+def test_search_every_word_must_match(
+    api_client, searchable, superuser_token
+) -> None:
+    results = _search(api_client, superuser_token, 'layout proposta')
+
+    assert [result['id'] for result in results] == [
+        str(searchable['description'].id)
+    ]
+
+
+def test_search_follows_updates(
+    api_client, searchable, superuser_token
+) -> None:
+    api_client.patch(
+        f'/tasks/{searchable["title"].id}',
+        json={'title': 'Revisar cronograma'},
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert _search(api_client, superuser_token, 'cronograma')
+    assert [
+        result['id']
+        for result in _search(api_client, superuser_token, 'layout')
+    ] == [str(searchable['description'].id)]
+
+
+def test_search_ignores_operators(
+    api_client, searchable, superuser_token
+) -> None:
+    assert _search(api_client, superuser_token, '"*) OR (') == []
+    assert _search(api_client, superuser_token, 'layout*') == _search(
+        api_client, superuser_token, 'layout'
+    )
+
+
+def test_search_requires_query(api_client, superuser_token) -> None:
+    response = api_client.get(
+        '/search', headers={'Authorization': f'Bearer {superuser_token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -51,6 +51,34 @@ def test_delete_user(api_client, user, superuser_token):
     assert response.json() == {'message': 'User deleted'}
 
 
+def test_delete_user_revokes_cached_user(
+    api_client, user, user_token, superuser_token
+):
+    api_client.get(
+        '/users/me', headers={'Authorization': f'Bearer {user_token}'}
+    )
+    api_client.delete(
+        f'/superuser/{user.id}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    response = api_client.get(
+        '/users/me', headers={'Authorization': f'Bearer {user_token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_read_user_cache_stats(api_client, superuser_token):
+    response = api_client.get(
+        '/superuser/cache-stats',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.json()) == {'size', 'maxsize', 'hits', 'misses'}
+
+
 def test_delete_user_not_found(api_client, superuser_token):
     response = api_client.delete(
         '/superuser/123e4567-e89b-12d3-a456-426614174000',
@@ -61,6 +89,21 @@ def test_delete_user_not_found(api_client, superuser_token):
     assert response.json() == {'detail': 'User Not Found'}
 
 
+def test_read_users_paginated(api_client, user, superuser_token):
+    first_page = api_client.get(
+        '/superuser/?limit=1',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    ).json()
+    second_page = api_client.get(
+        f'/superuser/?limit=1&cursor={first_page["next_cursor"]}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    ).json()
+
+    emails = {u['email'] for u in first_page['users'] + second_page['users']}
+    assert emails == {'admin@admin.com', user.email}
+    assert second_page['next_cursor'] is None
+
+
 def test_read_users_with_user(api_client, user, user_token):
     user_schema = UserPublic.model_validate(user).model_dump()
     # Convert UUID to string for comparison with JSON response
@@ -154,3 +197,15 @@ def test_update_user_password(api_client, user, superuser_token):
     assert data['email'] == 'test@test.com'
     assert data['is_superuser'] is False
     assert data['is_active'] is True
+
+
+def test_read_user_not_modified(api_client, user, superuser_token):
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    response = api_client.get(f'/superuser/{user.id}', headers=headers)
+    etag = response.headers['ETag']
+
+    response = api_client.get(
+        f'/superuser/{user.id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -1,10 +1,13 @@
+import json
 from datetime import date
 from http import HTTPStatus
 from uuid import UUID
 
+import pytest
 import pytest_asyncio
+from sqlalchemy import select, update
 
-from src.models import Task
+from src.models import Category, Task
 
 
 @pytest_asyncio.fixture
@@ -24,7 +27,8 @@ async def db_task(session, db_project, superuser) -> Task:
 
     session.add(task)
     await session.commit()
-    await session.refresh(task)
+    # A full refresh would unload the deferred description
+    await session.refresh(task, ['created_at'])
     return task
 
 
@@ -149,6 +153,51 @@ def test_read_all_tasks_filter_by_project_no_results(
     assert len(data['tasks']) == 0
 
 
+def test_read_all_tasks_paginated(
+    api_client, db_project, superuser_token
+) -> None:
+    for title in ('Task 1', 'Task 2', 'Task 3'):
+        api_client.post(
+            url='/tasks',
+            json={'title': title, 'project_id': str(db_project.id)},
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        url = '/tasks?limit=1' + (f'&cursor={cursor}' if cursor else '')
+        data = api_client.get(
+            url=url,
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        ).json()
+        seen.extend(task['title'] for task in data['tasks'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+
+    assert sorted(seen) == ['Task 1', 'Task 2', 'Task 3']
+
+
+def test_read_all_tasks_invalid_cursor(api_client, superuser_token) -> None:
+    response = api_client.get(
+        url='/tasks?cursor=not-a-cursor',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+def test_read_all_tasks_limit_too_large(api_client, superuser_token) -> None:
+    response = api_client.get(
+        url='/tasks?limit=100000',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 def test_update_task(session, db_task, api_client, superuser_token) -> None:
     response = api_client.patch(
         url=f'/tasks/{db_task.id}',
@@ -208,3 +257,552 @@ def test_delete_task_not_found(api_client, superuser_token) -> None:
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': "Task doesn't exist"}
+
+
+def test_export_tasks(api_client, db_task, superuser_token) -> None:
+    response = api_client.get(
+        url='/tasks/export',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])['id'] == str(db_task.id)
+
+
+def test_export_tasks_filter_by_project_no_results(
+    api_client, db_task, superuser_token
+) -> None:
+    response = api_client.get(
+        url='/tasks/export?project_id=123e4567-e89b-12d3-a456-426614174000',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert not response.text
+
+
+@pytest_asyncio.fixture
+async def db_tasks(session, db_project, superuser) -> list[Task]:
+    tasks = [
+        Task(
+            title=f'Task {i}',
+            project_id=db_project.id,
+            created_by=superuser.id,
+            status=status,
+            priority=priority,
+            due_date=due_date,
+            is_active=is_active,
+        )
+        for i, (status, priority, due_date, is_active) in enumerate([
+            ('to_do', 'high', date(2025, 1, 10), True),
+            ('done', 'low', date(2025, 1, 5), True),
+            ('to_do', 'low', None, True),
+            ('review', 'high', date(2025, 1, 20), False),
+            ('to_do', 'medium', date(2025, 1, 5), True),
+        ])
+    ]
+    session.add_all(tasks)
+    await session.commit()
+    return tasks
+
+
+def _titles(api_client, token, url) -> list[str]:
+    response = api_client.get(
+        url=url, headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    return [task['title'] for task in response.json()['tasks']]
+
+
+def test_read_all_tasks_filters(api_client, db_tasks, superuser_token) -> None:
+    def titles(query):
+        return sorted(_titles(api_client, superuser_token, f'/tasks?{query}'))
+
+    assert titles('status=to_do&priority=low') == ['Task 2']
+    assert titles('priority=high&priority=medium') == [
+        'Task 0',
+        'Task 3',
+        'Task 4',
+    ]
+    assert titles('is_active=false') == ['Task 3']
+    assert titles('due_after=2025-01-06&due_before=2025-01-20') == [
+        'Task 0',
+        'Task 3',
+    ]
+    assert titles(f'created_by={db_tasks[0].created_by}') == [
+        f'Task {i}' for i in range(5)
+    ]
+
+
+def test_read_all_tasks_sorted_and_paginated(
+    api_client, db_tasks, superuser_token
+) -> None:
+    seen = []
+    cursor = None
+    while True:
+        url = '/tasks?sort=-due_date,status&limit=2'
+        if cursor:
+            url += f'&cursor={cursor}'
+        data = api_client.get(
+            url=url,
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        ).json()
+        seen.extend(task['title'] for task in data['tasks'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+
+    # Due dates descending, ties by status, tasks without one last
+    assert seen == ['Task 3', 'Task 0', 'Task 1', 'Task 4', 'Task 2']
+
+
+@pytest.mark.parametrize(
+    'query',
+    [
+        'due_after=2025-02-01&due_before=2025-01-01',
+        'sort=title',
+        'sort=due_date,-due_date',
+    ],
+)
+def test_read_all_tasks_invalid_filters(
+    api_client, superuser_token, query
+) -> None:
+    response = api_client.get(
+        url=f'/tasks?{query}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_read_all_tasks_cursor_from_other_sort(
+    api_client, db_tasks, superuser_token
+) -> None:
+    cursor = api_client.get(
+        url='/tasks?limit=1',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    ).json()['next_cursor']
+
+    response = api_client.get(
+        url=f'/tasks?sort=due_date,status&cursor={cursor}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_export_tasks_filters(api_client, db_tasks, superuser_token) -> None:
+    response = api_client.get(
+        url='/tasks/export?status=to_do&is_active=true',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    titles = [json.loads(line)['title'] for line in response.text.splitlines()]
+    assert sorted(titles) == ['Task 0', 'Task 2', 'Task 4']
+
+
+def test_export_tasks_has_no_sort(api_client) -> None:
+    # Exports always follow creation order
+    parameters = api_client.get('/openapi.json').json()['paths'][
+        '/tasks/export'
+    ]['get']['parameters']
+
+    assert 'sort' not in {parameter['name'] for parameter in parameters}
+
+
+def test_create_task_after_category_deleted(
+    api_client, db_project, superuser_token
+) -> None:
+    category = api_client.post(
+        url='/categories',
+        json={'name': 'Design'},
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    ).json()
+    api_client.delete(
+        url=f'/categories/{category["id"]}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    response = api_client.post(
+        url='/tasks',
+        json={
+            'title': 'New Task',
+            'project_id': str(db_project.id),
+            'category_name': 'Design',
+        },
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+    category_response = api_client.get(
+        url=f'/categories/{category["id"]}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()['category_id'] == category['id']
+    assert category_response.json()['is_active'] is True
+
+
+def test_create_tasks_bulk(api_client, db_project, superuser_token) -> None:
+    tasks = [
+        {
+            'title': f'Task {i}',
+            'project_id': str(db_project.id),
+            'category_name': 'Bulk',
+        }
+        for i in range(3)
+    ]
+    tasks.insert(
+        1,
+        {
+            'title': 'Orphan',
+            'project_id': '123e4567-e89b-12d3-a456-426614174000',
+        },
+    )
+
+    response = api_client.post(
+        url='/tasks/bulk',
+        json=tasks,
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['created'] == len(tasks) - 1
+    assert [result['index'] for result in data['results']] == [0, 1, 2, 3]
+    assert data['results'][1] == {
+        'index': 1,
+        'id': None,
+        'error': "Project doesn't exist",
+    }
+
+    response = api_client.get(
+        url=f'/tasks/{data["results"][0]["id"]}',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['title'] == 'Task 0'
+    assert response.json()['category_id'] is not None
+
+
+def test_create_tasks_bulk_invalid_item(
+    api_client, db_project, superuser_token
+) -> None:
+    response = api_client.post(
+        url='/tasks/bulk',
+        json=[{'project_id': str(db_project.id)}],
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_create_task_category_deleted_by_another_worker(
+    session, api_client, db_project, superuser_token
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    category = api_client.post(
+        url='/categories', json={'name': 'Design'}, headers=headers
+    ).json()
+    # Deleted without going through this worker, its cache keeps the id
+    await session.execute(
+        update(Category)
+        .where(Category.id == UUID(category['id']))
+        .values(is_active=False)
+    )
+    await session.commit()
+
+    response = api_client.post(
+        url='/tasks',
+        json={
+            'title': 'New Task',
+            'project_id': str(db_project.id),
+            'category_name': 'Design',
+        },
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()['category_id'] == category['id']
+    assert await session.scalar(
+        select(Category.is_active).where(Category.id == UUID(category['id']))
+    )
+
+
+def test_create_task_query_count(
+    api_client, db_project, superuser_token, assert_query_count
+) -> None:
+    # user lookup, project check, insert, refresh
+    with assert_query_count(4):
+        response = api_client.post(
+            url='/tasks',
+            json={'title': 'New Task', 'project_id': str(db_project.id)},
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+
+
+def test_create_task_cached_category_query_count(
+    api_client, db_project, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    api_client.post(
+        url='/categories', json={'name': 'Design'}, headers=headers
+    )
+
+    # The project check, which also checks the cached category is
+    # active, insert, refresh
+    with assert_query_count(3) as statements:
+        response = api_client.post(
+            url='/tasks',
+            json={
+                'title': 'New Task',
+                'project_id': str(db_project.id),
+                'category_name': 'Design',
+            },
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert 'FROM categories' in statements[0]
+
+
+def test_update_task_cached_category_query_count(
+    api_client, db_task, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    category = api_client.post(
+        url='/categories', json={'name': 'Design'}, headers=headers
+    ).json()
+
+    # The row select, which also checks the cached category is active,
+    # update, refresh
+    with assert_query_count(3) as statements:
+        response = api_client.patch(
+            url=f'/tasks/{db_task.id}',
+            json={'category_name': 'Design'},
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['category_id'] == category['id']
+    assert 'FROM categories' in statements[0]
+
+
+def test_read_all_tasks_query_count_independent_of_rows(
+    api_client, db_project, superuser_token, assert_query_count
+) -> None:
+    for i in range(10):
+        api_client.post(
+            url='/tasks',
+            json={
+                'title': f'Task {i}',
+                'project_id': str(db_project.id),
+                'category_name': f'category {i}',
+            },
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        )
+
+    # The user is cached by now, leaving the page select only
+    with assert_query_count(1):
+        response = api_client.get(
+            url='/tasks',
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()['tasks']) == 10  # noqa: PLR2004
+
+
+def test_read_all_tasks_fields(
+    api_client, db_tasks, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+
+    # The user lookup, then the page
+    with assert_query_count(2) as statements:
+        response = api_client.get(
+            url='/tasks?fields=title,status&sort=-due_date&limit=2',
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert all(task.keys() == {'title', 'status'} for task in data['tasks'])
+    assert 'description' not in statements[-1]
+
+    # The cursor is built from the sort columns left out of the response
+    next_page = api_client.get(
+        url=(
+            '/tasks?fields=title,status&sort=-due_date&limit=2'
+            f'&cursor={data["next_cursor"]}'
+        ),
+        headers=headers,
+    ).json()
+    titles = [task['title'] for task in data['tasks'] + next_page['tasks']]
+    assert len(set(titles)) == len(titles)
+
+
+def test_read_all_tasks_unknown_fields(api_client, superuser_token) -> None:
+    response = api_client.get(
+        url='/tasks?fields=title,secret',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'].startswith('Unknown fields: secret')
+
+
+def test_read_task_by_id_include(
+    api_client, db_project, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    task_id = api_client.post(
+        url='/tasks',
+        json={
+            'title': 'Task',
+            'project_id': str(db_project.id),
+            'category_name': 'design',
+        },
+        headers=headers,
+    ).json()['id']
+
+    # The task joined to its project and category
+    with assert_query_count(1):
+        response = api_client.get(
+            url=f'/tasks/{task_id}?include=project,category', headers=headers
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['project']['name'] == db_project.name
+    assert data['category']['name'] == 'design'
+    assert data['description'] is None
+
+
+def test_read_all_tasks_include(
+    api_client, db_tasks, db_project, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    api_client.get(url='/tasks', headers=headers)
+
+    with assert_query_count(1):
+        response = api_client.get(
+            url='/tasks?include=project&fields=title&status=done',
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    tasks = response.json()['tasks']
+    assert tasks
+    assert all(task.keys() == {'title', 'project'} for task in tasks)
+    assert all(task['project']['id'] == str(db_project.id) for task in tasks)
+
+
+def test_read_task_by_id_not_modified(
+    api_client, db_task, superuser_token, assert_query_count
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    etag = api_client.get(f'/tasks/{db_task.id}', headers=headers).headers[
+        'ETag'
+    ]
+
+    # Only the task timestamps are selected
+    with assert_query_count(1):
+        response = api_client.get(
+            f'/tasks/{db_task.id}', headers={**headers, 'If-None-Match': etag}
+        )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+    assert not response.content
+
+    api_client.patch(
+        f'/tasks/{db_task.id}', json={'title': 'Renamed'}, headers=headers
+    )
+    response = api_client.get(
+        f'/tasks/{db_task.id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['title'] == 'Renamed'
+    assert response.headers['ETag'] != etag
+
+
+def test_update_task_if_match(api_client, db_task, superuser_token) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    etag = api_client.get(f'/tasks/{db_task.id}', headers=headers).headers[
+        'ETag'
+    ]
+
+    response = api_client.patch(
+        f'/tasks/{db_task.id}',
+        json={'title': 'First'},
+        headers={**headers, 'If-Match': etag},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] != etag
+
+    # The copy the second writer holds is now outdated
+    response = api_client.patch(
+        f'/tasks/{db_task.id}',
+        json={'title': 'Second'},
+        headers={**headers, 'If-Match': etag},
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    assert (
+        api_client.get(f'/tasks/{db_task.id}', headers=headers).json()['title']
+        == 'First'
+    )
+
+
+def test_update_task_if_match_weak_etag(
+    api_client, db_task, superuser_token
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+    etag = api_client.get(f'/tasks/{db_task.id}', headers=headers).headers[
+        'ETag'
+    ]
+
+    # If-Match compares strongly, a weak tag never matches
+    response = api_client.patch(
+        f'/tasks/{db_task.id}',
+        json={'title': 'Renamed'},
+        headers={**headers, 'If-Match': f'W/{etag}'},
+    )
+
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+
+
+@pytest.mark.parametrize(
+    ('task_id', 'if_match', 'status'),
+    [
+        (
+            '123e4567-e89b-12d3-a456-426614174000',
+            None,
+            HTTPStatus.NOT_FOUND,
+        ),
+        (None, '"stale"', HTTPStatus.PRECONDITION_FAILED),
+    ],
+)
+def test_update_task_rejected_creates_no_category(  # noqa: PLR0913, PLR0917
+    api_client, db_task, superuser_token, task_id, if_match, status
+) -> None:
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+
+    response = api_client.patch(
+        f'/tasks/{task_id or db_task.id}',
+        json={'category_name': 'New category'},
+        headers={**headers, 'If-Match': if_match} if if_match else headers,
+    )
+
+    assert response.status_code == status
+    assert (
+        api_client.get('/categories/', headers=headers).json()['categories']
+        == []
+    )
@@ -45,6 +45,12 @@ async def test_change_password_me(api_client, user, user_token):
     assert login_response.status_code == HTTPStatus.OK
     assert 'access_token' in login_response.json()
 
+    # Tokens issued before the change are revoked
+    old_token_response = api_client.get(
+        '/users/me', headers={'Authorization': f'Bearer {user_token}'}
+    )
+    assert old_token_response.status_code == HTTPStatus.UNAUTHORIZED
+
 
 @pytest.mark.asyncio
 async def test_change_password_me_mismatch(api_client, user_token):
@@ -0,0 +1,217 @@
+import time
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, update
+
+from src.models import (
+    ARCHIVE_TABLES,
+    Category,
+    Client,
+    Project,
+    ProjectStats,
+    Task,
+)
+from src.utils.archive import archive_inactive
+from src.utils.category_utils import get_or_create_category
+from src.utils.project_stats import project_snapshot, update_project_stats
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+async def deactivate(session, model, *ids, at=LONG_AGO):
+    column = 'update_at' if model is Client else 'updated_at'
+    await session.execute(
+        update(model)
+        .where(model.id.in_(ids))
+        .values(is_active=False, **{column: at})
+    )
+    await session.commit()
+
+
+async def archived_ids(session, model):
+    archive = ARCHIVE_TABLES[model]
+    return set(await session.scalars(select(archive.c.id)))
+
+
+@pytest_asyncio.fixture
+async def tasks(session, db_project, superuser):
+    tasks = [
+        Task(
+            title=f'task {number}',
+            project_id=db_project.id,
+            created_by=superuser.id,
+        )
+        for number in range(3)
+    ]
+    session.add_all(tasks)
+    await session.commit()
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_inactive_rows(session, tasks):
+    old, recent, _ = tasks
+    await deactivate(session, Task, old.id)
+    await deactivate(session, Task, recent.id, at=datetime.now())
+
+    archived = await archive_inactive(session, retention_days=30)
+
+    assert archived['tasks'] == 1
+    assert await archived_ids(session, Task) == {old.id}
+    remaining = await session.scalars(select(Task.id))
+    assert set(remaining) == {task.id for task in tasks[1:]}
+
+
+@pytest.mark.asyncio
+async def test_archive_cutoff_on_database_clock(session, tasks, monkeypatch):
+    # Stamped in UTC like the database does, two hours short of 30 days
+    utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+    await deactivate(
+        session, Task, tasks[0].id, at=utc_now - timedelta(days=29, hours=22)
+    )
+
+    # A worker five hours ahead of UTC
+    monkeypatch.setenv('TZ', 'Etc/GMT-5')
+    time.tzset()
+    try:
+        archived = await archive_inactive(session, retention_days=30)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert archived['tasks'] == 0
+
+
+@pytest.mark.asyncio
+async def test_archive_keeps_referenced_rows(session, db_project, tasks):
+    await deactivate(session, Project, db_project.id)
+
+    archived = await archive_inactive(session, retention_days=30)
+    assert archived['projects'] == 0
+
+    await deactivate(session, Task, *(task.id for task in tasks))
+    archived = await archive_inactive(session, retention_days=30)
+
+    assert archived['tasks'] == len(tasks)
+    assert archived['projects'] == 1
+
+
+@pytest.mark.asyncio
+async def test_archive_clears_empty_project_stats(session, superuser):
+    category = await get_or_create_category(session, 'Design')
+    project = Project(
+        name='project',
+        status_state='active',
+        project_value=10.0,
+        category_id=category.id,
+        created_by=superuser.id,
+    )
+    session.add(project)
+    await update_project_stats(session, None, project_snapshot(project))
+    await session.commit()
+    # Deleting the project leaves its stats row, at zero
+    await update_project_stats(session, project_snapshot(project), None)
+    await session.commit()
+    await deactivate(session, Project, project.id)
+    await deactivate(session, Category, category.id)
+
+    archived = await archive_inactive(session, retention_days=30)
+
+    assert archived['projects'] == 1
+    assert archived['categories'] == 1
+    assert not await session.scalar(
+        select(func.count()).select_from(ProjectStats)
+    )
+
+
+@pytest.mark.asyncio
+async def test_archive_in_batches(session):
+    clients = [
+        Client(
+            name=f'client {number}',
+            client_type='company',
+            type_identifier='cnpj',
+            identifier=f'1234567890123{number}',
+        )
+        for number in range(3)
+    ]
+    session.add_all(clients)
+    await session.commit()
+    await deactivate(session, Client, *(client.id for client in clients))
+
+    archived = await archive_inactive(
+        session, retention_days=30, batch_size=2, pause_seconds=0
+    )
+
+    assert archived['clients'] == len(clients)
+
+
+@pytest.mark.asyncio
+async def test_restore_row(session, api_client, superuser_token, tasks):
+    task = tasks[0]
+    await deactivate(session, Task, task.id)
+    await archive_inactive(session, retention_days=30)
+
+    response = api_client.post(
+        f'/archive/tasks/{task.id}/restore',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Row restored'}
+    assert await archived_ids(session, Task) == set()
+    assert await session.scalar(
+        select(Task.is_active).where(Task.id == task.id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_restore_references_first(  # noqa: PLR0913, PLR0917
+    session, api_client, superuser_token, db_project, tasks
+):
+    await deactivate(session, Task, *(task.id for task in tasks))
+    await deactivate(session, Project, db_project.id)
+    await archive_inactive(session, retention_days=30)
+    headers = {'Authorization': f'Bearer {superuser_token}'}
+
+    response = api_client.post(
+        f'/archive/tasks/{tasks[0].id}/restore', headers=headers
+    )
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {
+        'detail': f"projects {db_project.id} doesn't exist, restore it first"
+    }
+
+    response = api_client.post(
+        f'/archive/projects/{db_project.id}/restore', headers=headers
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert await session.scalar(select(ProjectStats.project_count)) == 1
+
+    response = api_client.post(
+        f'/archive/tasks/{tasks[0].id}/restore', headers=headers
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_restore_unknown_row(api_client, superuser_token):
+    response = api_client.post(
+        f'/archive/users/{uuid4()}/restore',
+        headers={'Authorization': f'Bearer {superuser_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Archived row not found'}
+
+
+def test_restore_requires_superuser(api_client, user_token):
+    response = api_client.post(
+        f'/archive/users/{uuid4()}/restore',
+        headers={'Authorization': f'Bearer {user_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from src.core.cache import TTLCache
+
+
+def test_cache_hit_and_miss_counters():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    assert cache.stats() == {'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 1}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3  # noqa: PLR2004
+
+
+def test_cache_entries_expire():
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    with mock.patch('src.core.cache.monotonic', return_value=100):
+        cache.set('a', 1)
+
+    with mock.patch('src.core.cache.monotonic', return_value=111):
+        assert cache.get('a') is None
+
+
+def test_cache_invalidate():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.invalidate('a')
+
+    assert cache.get('a') is None
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = TTLCache(maxsize=2, ttl=0)
+    cache.set('a', 1)
+
+    assert cache.get('a') is None
@@ -0,0 +1,179 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from src.models import Category
+from src.utils.category_utils import (
+    CREATE_ATTEMPTS,
+    category_cache,
+    get_or_create_category,
+    get_or_create_category_id,
+    get_or_create_category_ids,
+)
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_id_creates_category(session):
+    category_id = await get_or_create_category_id(session, ' Design ')
+
+    category = await session.scalar(
+        select(Category).where(Category.id == category_id)
+    )
+    assert category.name == 'Design'
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_id_served_from_cache(session):
+    first_id = await get_or_create_category_id(session, 'Design')
+    hits = category_cache.hits
+
+    second_id = await get_or_create_category_id(session, 'Design ')
+
+    assert second_id == first_id
+    assert category_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_reactivates_deleted(session):
+    category = await get_or_create_category(session, 'Design')
+    category.is_active = False
+    await session.commit()
+    category_cache.invalidate((category.tenant_id, 'Design'))
+
+    category_id = await get_or_create_category_id(session, 'Design')
+
+    count = await session.scalar(select(func.count()).select_from(Category))
+    assert category_id == category.id
+    assert category.is_active is True
+    assert count == 1
+
+
+async def _delete_elsewhere(session, category_id):
+    # As another worker would, leaving this worker's cache as it was
+    await session.execute(
+        update(Category)
+        .where(Category.id == category_id)
+        .values(is_active=False)
+    )
+    await session.commit()
+
+
+async def _is_active(session, category_id):
+    return await session.scalar(
+        select(Category.is_active).where(Category.id == category_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_id_cached_but_deleted(session):
+    category_id = await get_or_create_category_id(session, 'Design')
+    await _delete_elsewhere(session, category_id)
+
+    assert await get_or_create_category_id(session, 'Design') == category_id
+    assert await _is_active(session, category_id) is True
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_ids_cached_but_deleted(session):
+    category_id = await get_or_create_category_id(session, 'Design')
+    await _delete_elsewhere(session, category_id)
+
+    category_ids = await get_or_create_category_ids(session, ['Design'])
+
+    assert category_ids == {'Design': category_id}
+    assert await _is_active(session, category_id) is True
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_id_empty_name(session):
+    assert await get_or_create_category_id(session, '') is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_ids_batch(session):
+    existing_id = await get_or_create_category_id(session, 'Design')
+
+    category_ids = await get_or_create_category_ids(
+        session, ['Design', ' Backend', 'Backend', '']
+    )
+
+    count = await session.scalar(select(func.count()).select_from(Category))
+    assert category_ids['Design'] == existing_id
+    assert set(category_ids) == {'Design', 'Backend'}
+    assert count == len(category_ids)
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_concurrent_create(session, db_project):
+    session.add(Category(name='Design'))
+    await session.commit()
+    scalar = session.scalar
+    lookups = []
+
+    async def first_lookup_misses(query):
+        # Simulate a concurrent request inserting right after our lookup
+        lookups.append(query)
+        return None if len(lookups) == 1 else await scalar(query)
+
+    with patch.object(session, 'scalar', first_lookup_misses):
+        category = await get_or_create_category(session, 'Design')
+
+    count = await session.scalar(select(func.count()).select_from(Category))
+    assert category.name == 'Design'
+    assert count == 1
+    # Objects the caller loaded survive the conflict
+    assert db_project.name
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_ids_concurrent_create(session):
+    session.add(Category(name='Design'))
+    await session.commit()
+    scalars = session.scalars
+    lookups = []
+
+    async def first_lookup_misses(query):
+        lookups.append(query)
+        return iter(()) if len(lookups) == 1 else await scalars(query)
+
+    with patch.object(session, 'scalars', first_lookup_misses):
+        category_ids = await get_or_create_category_ids(
+            session, ['Design', 'Backend']
+        )
+
+    count = await session.scalar(select(func.count()).select_from(Category))
+    assert set(category_ids) == {'Design', 'Backend'}
+    assert count == len(category_ids)
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_ids_retries_are_capped(session):
+    session.add(Category(name='Design'))
+    await session.commit()
+    lookups = []
+
+    async def lookup_always_misses(query):
+        lookups.append(query)
+        return iter(())
+
+    with (
+        patch.object(session, 'scalars', lookup_always_misses),
+        pytest.raises(IntegrityError),
+    ):
+        await get_or_create_category_ids(session, ['Design'])
+
+    assert len(lookups) == CREATE_ATTEMPTS
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_category_left_to_caller_commit(session):
+    category = await get_or_create_category(session, 'Design')
+    category_ids = await get_or_create_category_ids(session, ['Backend'])
+    await session.rollback()
+
+    count = await session.scalar(select(func.count()).select_from(Category))
+    assert category.id
+    assert category_ids['Backend']
+    assert count == 0
@@ -0,0 +1,150 @@
+from time import time
+from unittest import mock
+
+import pytest
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core import database
+from src.core.database import (
+    POOL_CHECKOUT_SECONDS,
+    POOL_OVERFLOW_TOTAL,
+    POOL_TIMEOUTS_TOTAL,
+    REPLICA_FALLBACKS_TOTAL,
+    SESSIONS_TOTAL,
+    InstrumentedAsyncPool,
+    engine_options,
+    open_session,
+    primary_until,
+    route_session,
+)
+from src.core.settings import settings
+
+
+def test_engine_options_sqlite():
+    options = engine_options('sqlite+aiosqlite:///./dev.db')
+
+    assert 'poolclass' not in options
+    assert options['connect_args'] == {
+        'timeout': settings.SQLITE_BUSY_TIMEOUT_SECONDS
+    }
+
+
+def test_engine_options_asyncpg():
+    with (
+        mock.patch.object(settings, 'DB_STATEMENT_TIMEOUT_MS', 5000),
+        mock.patch.object(settings, 'DB_STATEMENT_CACHE_SIZE', 0),
+    ):
+        options = engine_options('postgresql+asyncpg://u:p@localhost/db')
+
+    assert options['poolclass'] is InstrumentedAsyncPool
+    assert options['pool_size'] == settings.DB_POOL_SIZE
+    assert options['connect_args'] == {
+        'server_settings': {
+            'application_name': settings.DB_APPLICATION_NAME,
+            'statement_timeout': '5000',
+        },
+        'statement_cache_size': 0,
+        'prepared_statement_cache_size': 0,
+    }
+
+
+def test_engine_options_psycopg():
+    with mock.patch.object(settings, 'DB_STATEMENT_TIMEOUT_MS', 5000):
+        options = engine_options('postgresql+psycopg://u:p@localhost/db')
+
+    assert options['pool_pre_ping'] is settings.DB_POOL_PRE_PING
+    assert options['connect_args'] == {
+        'application_name': settings.DB_APPLICATION_NAME,
+        'options': '-c statement_timeout=5000',
+    }
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_overflow(tmp_path):
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path / "pool.db"}',
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    checkouts = sum(POOL_CHECKOUT_SECONDS.counts[()])
+    overflows = POOL_OVERFLOW_TOTAL.values[()]
+
+    async with engine.connect(), engine.connect():
+        pass
+    await engine.dispose()
+
+    assert sum(POOL_CHECKOUT_SECONDS.counts[()]) == checkouts + 2
+    assert POOL_OVERFLOW_TOTAL.values[()] == overflows + 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_timeouts(tmp_path):
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path / "pool.db"}',
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    timeouts = POOL_TIMEOUTS_TOTAL.values[()]
+
+    async with engine.connect():
+        with pytest.raises(TimeoutError):
+            await engine.connect().start()
+    await engine.dispose()
+
+    assert POOL_TIMEOUTS_TOTAL.values[()] == timeouts + 1
+
+
+def test_route_session(tmp_path):
+    replica = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "r.db"}')
+
+    assert route_session('GET', None) == 'no_replica'
+
+    with mock.patch.object(database, 'read_engine', replica):
+        assert route_session('GET', None) == 'read'
+        assert route_session('HEAD', 'garbage') == 'read'
+        assert route_session('POST', None) == 'write'
+        assert route_session('GET', primary_until()) == 'sticky'
+        # The cookie only holds for READ_YOUR_WRITES_SECONDS
+        expired = primary_until(time() - settings.READ_YOUR_WRITES_SECONDS - 1)
+        assert route_session('GET', expired) == 'read'
+
+
+@pytest.mark.asyncio
+async def test_open_session_on_replica(tmp_path):
+    replica = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "r.db"}')
+    reads = SESSIONS_TOTAL.values['replica', 'read']
+
+    with mock.patch.object(database, 'read_engine', replica):
+        async with await open_session('GET', None) as session:
+            assert session.bind is replica
+        async with await open_session('PATCH', None) as session:
+            assert session.bind is database.engine
+    await replica.dispose()
+
+    assert SESSIONS_TOTAL.values['replica', 'read'] == reads + 1
+
+
+@pytest.mark.asyncio
+async def test_open_session_falls_back_to_primary(tmp_path):
+    # The directory of the database file does not exist
+    replica = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path / "missing" / "r.db"}'
+    )
+    fallbacks = REPLICA_FALLBACKS_TOTAL.values[()]
+
+    with (
+        mock.patch.object(database, 'read_engine', replica),
+        mock.patch.object(database, '_replica_down_until', 0.0),
+    ):
+        async with await open_session('GET', None) as session:
+            assert session.bind is database.engine
+
+        # The replica is not tried again for REPLICA_RETRY_SECONDS
+        assert route_session('GET', None) == 'replica_down'
+    await replica.dispose()
+
+    assert REPLICA_FALLBACKS_TOTAL.values[()] == fallbacks + 1
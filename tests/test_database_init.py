@@ -33,7 +33,8 @@ async def test_init_db_create_superuser(session):
     """Test init_db creates superuser when it doesn't exist"""
     # Mock the password hash function to avoid actual hashing
     with mock.patch(
-        'src.core.database.get_password_hash', return_value='mocked_hash'
+        'src.core.database.get_password_hash_async',
+        return_value='mocked_hash',
     ):
         # Run init_db function which should create superuser
         result = await init_db(session)
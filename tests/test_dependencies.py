@@ -1,15 +1,25 @@
 from http import HTTPStatus
+from unittest import mock
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
 from jwt import encode
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from src.api.dependencies import (
+    PRIMARY_COOKIE,
+    bump_token_version,
     get_current_active_superuser,
+    get_current_identity,
     get_current_user,
+    get_session,
+    invalidate_cached_user,
+    user_cache,
     validate_user_access,
 )
+from src.core import database
 from src.core.settings import settings
+from src.security import create_access_token, user_token_claims
 
 
 @pytest.mark.asyncio
@@ -56,6 +66,82 @@ async def test_get_current_user_not_found(session):
     assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_without_tenant_claim(session, user):
+    """Test tokens naming no tenant are rejected on every tenant"""
+    token = create_access_token({'sub': user.email})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(session, token)
+
+    assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cached(session, user):
+    """Test the second lookup of the same subject is served from cache"""
+    token = create_access_token(user_token_claims(user))
+    hits = user_cache.hits
+
+    first = await get_current_user(session, token)
+    second = await get_current_user(session, token)
+
+    assert first.id == second.id == user.id
+    assert user_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_revoked_token_version(session, user):
+    """Test tokens issued before a version bump are rejected"""
+    token = create_access_token(user_token_claims(user))
+
+    bump_token_version(user)
+    await session.commit()
+    invalidate_cached_user(user)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(session, token)
+
+    assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_current_identity_stateless_without_database(user):
+    """Test stateless identities are built from claims alone"""
+    with mock.patch.object(settings, 'STATELESS_AUTH', True):
+        token = create_access_token(user_token_claims(user))
+        identity = await get_current_identity(None, token, user.tenant_id)
+
+    assert identity.id == user.id
+    assert identity.email == user.email
+    assert identity.is_superuser is False
+
+
+@pytest.mark.asyncio
+async def test_get_current_identity_stateless_revoked(user):
+    """Test stateless tokens older than the known version are rejected"""
+    with mock.patch.object(settings, 'STATELESS_AUTH', True):
+        token = create_access_token(user_token_claims(user))
+        bump_token_version(user)
+        invalidate_cached_user(user)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_identity(None, token, user.tenant_id)
+
+    assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_current_identity_falls_back_to_database(session, user):
+    """Test identities are loaded from the database by default"""
+    token = create_access_token(user_token_claims(user))
+
+    identity = await get_current_identity(session, token)
+
+    assert identity.id == user.id
+    assert identity.token_version == user.token_version
+
+
 def test_get_current_active_superuser_not_superuser(user):
     """Test error raised when user is not superuser"""
     # Ensure user is not a superuser
@@ -98,3 +184,32 @@ def test_validate_user_access_denied(user):
 
     assert exc_info.value.status_code == HTTPStatus.FORBIDDEN
     assert 'Access denied' in exc_info.value.detail
+
+
+async def _write_response() -> Response:
+    response = Response()
+    sessions = get_session(
+        Request({'type': 'http', 'method': 'POST', 'headers': []}), response
+    )
+    await anext(sessions)
+    await sessions.aclose()
+    return response
+
+
+@pytest.mark.asyncio
+async def test_get_session_write_sets_primary_cookie(tmp_path):
+    replica = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "r.db"}')
+
+    with mock.patch.object(database, 'read_engine', replica):
+        response = await _write_response()
+    await replica.dispose()
+
+    assert PRIMARY_COOKIE in response.headers['set-cookie']
+
+
+@pytest.mark.asyncio
+async def test_get_session_write_without_replica_sets_no_cookie():
+    """No replica to keep the client's reads away from"""
+    response = await _write_response()
+
+    assert 'set-cookie' not in response.headers
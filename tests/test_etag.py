@@ -0,0 +1,29 @@
+from datetime import datetime
+from uuid import uuid4
+
+from src.utils.etag import etag_matches, make_etag
+
+
+def test_make_etag_changes_with_updates():
+    row_id = uuid4()
+    created_at = datetime(2025, 1, 1)
+    etag = make_etag(row_id, created_at, None)
+
+    assert etag.startswith('"')
+    assert etag.endswith('"')
+    assert etag == make_etag(row_id, created_at, None)
+    assert etag != make_etag(row_id, created_at, datetime(2025, 1, 1, 0, 0, 1))
+    assert etag != make_etag(uuid4(), created_at, None)
+
+
+def test_etag_matches():
+    etag = '"abc"'
+
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", "abc"', etag)
+    assert etag_matches('W/"abc"', etag, weak=True)
+    assert not etag_matches('W/"abc"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"x"', etag)
+    assert not etag_matches('abc', etag)
+    assert not etag_matches(None, etag)
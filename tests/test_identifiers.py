@@ -0,0 +1,29 @@
+from src.models import IdentifierType
+from src.utils.identifiers import normalize_identifier, validate_identifiers
+
+
+def test_normalize_identifier():
+    assert normalize_identifier('529.982.247-25') == '52998224725'
+    assert normalize_identifier('11.222.333/0001-81') == '11222333000181'
+
+
+def test_validate_identifiers():
+    errors = validate_identifiers([
+        (IdentifierType.cpf, '52998224725'),
+        (IdentifierType.cnpj, '11222333000181'),
+        (IdentifierType.cpf, '52998224724'),
+        (IdentifierType.cnpj, '11222333000182'),
+        (IdentifierType.cpf, '11111111111'),
+        (IdentifierType.cnpj, '1122233300018'),
+        (IdentifierType.cpf, '5299822472a'),
+    ])
+
+    assert errors == [
+        None,
+        None,
+        'Invalid CPF check digits',
+        'Invalid CNPJ check digits',
+        'Invalid CPF',
+        'CNPJ must have exactly 14 digits',
+        'CPF must have exactly 11 digits',
+    ]
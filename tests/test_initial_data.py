@@ -39,3 +39,14 @@ async def test_main():
     with patch('src.initial_data.init', AsyncMock()) as mock_init:
         await main()
         mock_init.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_main_with_scale():
+    """Test the main function generates synthetic data when scaled"""
+    with (
+        patch('src.initial_data.init', AsyncMock()),
+        patch('src.initial_data.generate', AsyncMock()) as mock_generate,
+    ):
+        await main(scale=3, seed=5)
+        mock_generate.assert_called_once_with(3, 5)
@@ -0,0 +1,57 @@
+import pytest
+
+from src.core import metrics
+from src.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+
+def test_render_counter_and_gauge(registry):
+    counter = Counter('jobs_total', 'Jobs run.', ('queue',))
+    gauge = Gauge('workers', 'Busy workers.')
+    counter.inc(labels=('de"fault',))
+    counter.inc(2, labels=('de"fault',))
+    gauge.inc()
+    gauge.dec(0.5)
+
+    assert registry.render() == (
+        '# HELP jobs_total Jobs run.\n'
+        '# TYPE jobs_total counter\n'
+        'jobs_total{queue="de\\"fault"} 3.0\n'
+        '# HELP workers Busy workers.\n'
+        '# TYPE workers gauge\n'
+        'workers 0.5\n'
+    )
+
+
+def test_render_histogram_buckets_are_cumulative(registry):
+    histogram = Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3):
+        histogram.observe(value)
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 4.25',
+        'latency_seconds_count 4',
+    ]
+
+
+def test_render_runs_collectors(registry):
+    gauge = Gauge('queue_size', 'Queued jobs.')
+    registry.add_collector(lambda: gauge.set(7))
+
+    assert 'queue_size 7' in registry.render()
+
+
+def test_register_duplicate_name(registry):
+    Counter('jobs_total', 'Jobs run.')
+
+    with pytest.raises(ValueError, match='already registered'):
+        Counter('jobs_total', 'Jobs run again.')
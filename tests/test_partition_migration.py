@@ -0,0 +1,168 @@
+import asyncio
+import os
+from argparse import Namespace
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.environment import EnvironmentContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.settings import settings
+
+# A scratch database, every table of it is dropped
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+REVISION = '4b8e2d7f1c36'
+PREVIOUS_REVISION = '2c7a4f9e0b18'
+TASKS = 5
+
+pytestmark = pytest.mark.skipif(
+    not POSTGRES_URL, reason='TEST_POSTGRES_URL is not set'
+)
+
+
+@pytest.fixture
+def alembic_config(monkeypatch):
+    # migrations/env.py connects to settings.DATABASE_URL
+    monkeypatch.setattr(settings, 'DATABASE_URL', POSTGRES_URL)
+    config = Config(
+        cmd_opts=Namespace(
+            x=[
+                'tasks_partition_by=project_id',
+                'tasks_hash_partitions=4',
+                # Several batches for the few seeded tasks
+                'tasks_partition_batch_size=2',
+            ]
+        )
+    )
+    config.set_main_option(
+        'script_location', str(Path(__file__).parents[1] / 'migrations')
+    )
+
+    command.downgrade(config, 'base')
+    command.upgrade(config, PREVIOUS_REVISION)
+    yield config
+    command.downgrade(config, 'base')
+
+
+def run_sql(statement, parameters=None):
+    async def execute():
+        engine = create_async_engine(POSTGRES_URL)
+        async with engine.begin() as connection:
+            result = await connection.execute(text(statement), parameters)
+            rows = result.all() if result.returns_rows else None
+        await engine.dispose()
+        return rows
+
+    return asyncio.run(execute())
+
+
+def seed_tasks():
+    tenant_id, project_id = uuid4(), uuid4()
+    run_sql(
+        'INSERT INTO tenants (id, name, domain, is_active) '
+        "VALUES (:id, 'partitions', 'partitions.test', true)",
+        {'id': tenant_id},
+    )
+    run_sql(
+        'INSERT INTO projects (id, tenant_id, name, created_by, is_active) '
+        "VALUES (:id, :tenant_id, 'project', :id, true)",
+        {'id': project_id, 'tenant_id': tenant_id},
+    )
+    task_ids = [uuid4() for _ in range(TASKS)]
+    for task_id in task_ids:
+        run_sql(
+            'INSERT INTO tasks (id, tenant_id, project_id, created_by, '
+            'title, status, priority, is_active) VALUES (:id, :tenant_id, '
+            ":project_id, :project_id, 'seeded', 'to_do', 'low', true)",
+            {'id': task_id, 'tenant_id': tenant_id, 'project_id': project_id},
+        )
+    return tenant_id, project_id, task_ids
+
+
+def task_titles():
+    return dict(run_sql('SELECT id, title FROM tasks'))
+
+
+def is_partitioned():
+    return run_sql(
+        'SELECT count(*) FROM pg_partitioned_table '
+        "WHERE partrelid = 'tasks'::regclass"
+    )[0][0]
+
+
+def test_partition_migration_round_trip(monkeypatch, alembic_config):
+    tenant_id, project_id, task_ids = seed_tasks()
+    added_id = uuid4()
+
+    script = ScriptDirectory.from_config(alembic_config)
+    migration = script.get_revision(REVISION).module
+    backfill = migration._backfill
+
+    def write(connection, statement, **parameters):
+        connection.execute(text(statement), parameters)
+
+    def backfill_with_writes(connection, columns, batch_size):
+        # Before its copy, a row changed through the trigger
+        write(
+            connection,
+            "UPDATE tasks SET title = 'before copy' WHERE id = :id",
+            id=task_ids[0],
+        )
+        backfill(connection, columns, batch_size)
+
+        # Rows already copied, then a new one, mirrored by the trigger;
+        # a second pass must not undo them
+        write(
+            connection,
+            "UPDATE tasks SET title = 'after copy' WHERE id = :id",
+            id=task_ids[1],
+        )
+        write(connection, 'DELETE FROM tasks WHERE id = :id', id=task_ids[2])
+        write(
+            connection,
+            'INSERT INTO tasks (id, tenant_id, project_id, created_by, '
+            'title, status, priority, is_active) VALUES (:id, :tenant_id, '
+            ":project_id, :project_id, 'added', 'to_do', 'low', true)",
+            id=added_id,
+            tenant_id=tenant_id,
+            project_id=project_id,
+        )
+        backfill(connection, columns, batch_size)
+
+    monkeypatch.setattr(migration, '_backfill', backfill_with_writes)
+
+    def upgrade(revision, context):
+        return script._upgrade_revs(REVISION, revision)
+
+    with EnvironmentContext(
+        alembic_config, script, fn=upgrade, destination_rev=REVISION
+    ):
+        script.run_env()
+
+    expected = {
+        task_ids[0]: 'before copy',
+        task_ids[1]: 'after copy',
+        **{task_id: 'seeded' for task_id in task_ids[3:]},
+        added_id: 'added',
+    }
+    assert is_partitioned()
+    assert task_titles() == expected
+    assert run_sql(
+        "SELECT count(*) FROM pg_proc WHERE proname = 'tasks_sync_partitioned'"
+    ) == [(0,)]
+    assert run_sql(
+        "SELECT count(*) FROM pg_tables WHERE tablename = 'tasks_p3'"
+    ) == [(1,)]
+
+    command.downgrade(alembic_config, PREVIOUS_REVISION)
+
+    assert not is_partitioned()
+    assert task_titles() == expected
+    assert run_sql(
+        "SELECT count(*) FROM pg_tables WHERE tablename = 'tasks_p3'"
+    ) == [(0,)]
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from src.models import Task, task_partition_ddl
+from src.utils.partitions import create_task_partitions
+
+
+def test_task_partition_ddl_by_project_id():
+    statements = task_partition_ddl(
+        'project_id', date(2026, 10, 18), hash_partitions=4
+    )
+
+    assert statements[-1] == (
+        'CREATE TABLE IF NOT EXISTS tasks_p3 PARTITION OF tasks FOR VALUES '
+        'WITH (MODULUS 4, REMAINDER 3)'
+    )
+    assert len(statements) == 4  # noqa: PLR2004
+
+
+def test_task_partition_ddl_by_created_at():
+    statements = task_partition_ddl(
+        'created_at', date(2026, 12, 31), months_ahead=1
+    )
+
+    assert statements == [
+        'CREATE TABLE IF NOT EXISTS tasks_2026_12 PARTITION OF tasks '
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')",
+        'CREATE TABLE IF NOT EXISTS tasks_2027_01 PARTITION OF tasks '
+        "FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')",
+        'CREATE TABLE IF NOT EXISTS tasks_default PARTITION OF tasks DEFAULT',
+    ]
+
+
+def test_tasks_unpartitioned_by_default():
+    assert task_partition_ddl('none', date(2026, 10, 18)) == []
+    assert [column.name for column in Task.__mapper__.primary_key] == ['id']
+
+
+@pytest.mark.asyncio
+async def test_create_task_partitions_skips_unpartitioned(session):
+    assert await create_task_partitions(session) == []
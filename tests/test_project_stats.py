@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from src.models import Project, ProjectStats
+from src.utils.project_stats import (
+    project_snapshot,
+    rebuild_project_stats,
+    update_project_stats,
+)
+
+
+async def _stats(session):
+    rows = await session.scalars(
+        select(ProjectStats).where(ProjectStats.project_count > 0)
+    )
+    return sorted(
+        (
+            row.group_key,
+            row.project_count,
+            row.value_count,
+            row.value_total,
+        )
+        for row in rows
+    )
+
+
+@pytest.mark.asyncio
+async def test_incremental_stats_match_rebuild(session, superuser):
+    projects = [
+        Project(
+            name=f'project {i}',
+            created_by=superuser.id,
+            status_state=status,
+            project_value=value,
+            target_date=target_date,
+        )
+        for i, (status, value, target_date) in enumerate([
+            ('active', 100.0, date(2025, 3, 4)),
+            ('active', 250.5, date(2025, 3, 30)),
+            (None, None, None),
+        ])
+    ]
+    for project in projects:
+        session.add(project)
+        await update_project_stats(session, None, project_snapshot(project))
+    await session.commit()
+
+    before = project_snapshot(projects[0])
+    projects[0].status_state = 'done'
+    await update_project_stats(session, before, project_snapshot(projects[0]))
+    before = project_snapshot(projects[1])
+    projects[1].is_active = False
+    await update_project_stats(session, before, project_snapshot(projects[1]))
+    await session.commit()
+
+    incremental = await _stats(session)
+    await rebuild_project_stats(session)
+
+    assert incremental == await _stats(session)
+    assert incremental == [
+        ('|done|2025-03-01', 1, 1, 100.0),
+        ('||', 1, 0, 0.0),
+    ]
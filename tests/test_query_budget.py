@@ -0,0 +1,62 @@
+import pytest
+from loguru import logger
+from sqlalchemy import select
+
+from src.api.instrumentation import check_queries
+from src.core.database import track_queries
+from src.core.settings import settings
+from src.models import Project, User
+
+
+@pytest.fixture
+def warnings():
+    messages = []
+    handler_id = logger.add(messages.append, level='WARNING')
+    yield messages
+    logger.remove(handler_id)
+
+
+@pytest.mark.asyncio
+async def test_track_queries_groups_statements_by_text(session, superuser):
+    with track_queries() as queries:
+        for _ in range(3):
+            await session.scalar(select(User).where(User.id == superuser.id))
+        await session.scalar(select(Project))
+
+    assert queries.count == 4  # noqa: PLR2004
+    assert [count for _, count in queries.repeated(3)] == [3]
+    assert queries.repeated(4) == []
+
+
+def test_check_queries_budget_exceeded(monkeypatch, warnings):
+    monkeypatch.setattr(settings, 'QUERY_BUDGET', 2)
+    with track_queries() as queries:
+        queries.count = 3
+
+    check_queries(('GET', '/tasks/'), queries)
+
+    assert len(warnings) == 1
+    assert 'Query budget exceeded on GET /tasks/: 3' in warnings[0]
+
+
+def test_check_queries_repeated_statement(monkeypatch, warnings):
+    monkeypatch.setattr(settings, 'QUERY_REPEAT_THRESHOLD', 5)
+    with track_queries() as queries:
+        queries.count = 5
+        queries.statements['SELECT categories.name\nFROM categories'] = 5
+
+    check_queries(('GET', '/projects/'), queries)
+
+    assert len(warnings) == 1
+    assert 'Possible N+1 on GET /projects/' in warnings[0]
+    assert 'SELECT categories.name FROM categories' in warnings[0]
+
+
+def test_check_queries_within_budget(warnings):
+    with track_queries() as queries:
+        queries.count = 1
+        queries.statements['SELECT 1'] = 1
+
+    check_queries(('GET', '/tasks/'), queries)
+
+    assert warnings == []
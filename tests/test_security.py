@@ -1,7 +1,12 @@
+import pytest
 from jwt import decode
 
 from src.core.settings import settings
-from src.security import create_access_token
+from src.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 
 
 def test_jwt():
@@ -14,3 +19,11 @@ def test_jwt():
 
     assert decoded['test'] == data['test']
     assert 'exp' in decoded
+
+
+@pytest.mark.asyncio
+async def test_password_hash_async_roundtrip():
+    hashed = await get_password_hash_async('secret')
+
+    assert await verify_password_async('secret', hashed) is True
+    assert await verify_password_async('wrong', hashed) is False
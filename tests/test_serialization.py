@@ -0,0 +1,84 @@
+import json
+from collections import namedtuple
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from src.core.settings import settings
+from src.models import Category, Client, Project, Task, User
+from src.schemas.categories import CategoryList
+from src.schemas.clients import ClientListRequest, ClientResponse
+from src.schemas.projects import ProjectRequestGetList
+from src.schemas.tasks import TaskRequestGetList
+from src.schemas.users import UserList, UserPublic
+from src.utils.serialization import PageSerializer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('validate', [True, False])
+async def test_page_serializer_matches_response_model(
+    session, db_project, superuser, validate
+):
+    session.add_all([
+        Task(
+            title='título',
+            description=None,
+            project_id=db_project.id,
+            created_by=superuser.id,
+        ),
+        Category(name='catégorie'),
+    ])
+    await session.commit()
+
+    for model, schema, key in [
+        (Task, TaskRequestGetList, 'tasks'),
+        (Project, ProjectRequestGetList, 'projects'),
+        (User, UserList, 'users'),
+        (Category, CategoryList, 'categories'),
+    ]:
+        item = schema.model_fields[key].annotation.__args__[0]
+        pages = PageSerializer(model, item, key)
+
+        rows = (await session.execute(pages.select())).all()
+        objects = (
+            await session.scalars(select(model).options(undefer('*')))
+        ).all()
+
+        expected = schema.model_validate({
+            key: objects,
+            'next_cursor': 'abc',
+        }).model_dump_json()
+        assert json.loads(
+            pages.dump(rows, 'abc', validate=validate)
+        ) == json.loads(expected)
+
+
+@pytest.mark.asyncio
+async def test_page_serializer_validates_unless_fast(
+    session, superuser, monkeypatch
+):
+    pages = PageSerializer(User, UserPublic, 'users')
+    row = (await session.execute(pages.select())).first()._asdict()
+    # Shaped like a Core row, with an email the schema rejects
+    bad_rows = [namedtuple('Row', row)(**{**row, 'email': 'not an email'})]
+
+    monkeypatch.setattr(settings, 'FAST_LIST_SERIALIZATION', False)
+    with pytest.raises(ValidationError):
+        pages.dump(bad_rows, None)
+
+    monkeypatch.setattr(settings, 'FAST_LIST_SERIALIZATION', True)
+    assert json.loads(pages.dump(bad_rows, None))['users']
+
+
+@pytest.mark.asyncio
+async def test_page_serializer_leaves_out_extra_columns(session, db_client):
+    pages = PageSerializer(Client, ClientResponse, 'clients')
+
+    rows = (await session.execute(pages.select('created_at', 'id'))).all()
+
+    assert len(rows[0]) == len(ClientResponse.model_fields) + 1
+    page = ClientListRequest.model_validate_json(pages.dump(rows, None))
+    assert page.clients[0].id == db_client.id
+    assert 'created_at' not in json.loads(pages.dump(rows, None))['clients'][0]
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import func, select
+
+from src.models import Client, Project, Task, User
+from src.utils.identifiers import validate_identifiers
+from src.utils.synthetic_data import (
+    TASK_ID_SAMPLE_SIZE,
+    generate_data,
+    scale_volumes,
+)
+
+
+def test_scale_volumes():
+    assert scale_volumes(2) == {
+        'users': 20,
+        'clients': 200,
+        'projects': 100,
+        'tasks': 2000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_generate_data(session):
+    volumes = scale_volumes(2)
+
+    ids = await generate_data(session, volumes, seed=1)
+
+    for model, table in (
+        (User, 'users'),
+        (Client, 'clients'),
+        (Project, 'projects'),
+        (Task, 'tasks'),
+    ):
+        count = await session.scalar(select(func.count()).select_from(model))
+        assert count == volumes[table]
+
+    clients = (await session.execute(select(Client))).scalars().all()
+    assert not any(
+        validate_identifiers(
+            (client.type_identifier, client.identifier) for client in clients
+        )
+    )
+    assert len(ids['task_ids']) == TASK_ID_SAMPLE_SIZE
+
+    # Every user shares the hash computed once
+    passwords = await session.scalars(select(User.password).distinct())
+    assert len(passwords.all()) == 1
@@ -0,0 +1,192 @@
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select, update
+
+from src.models import TENANT_KEY, Client, Tenant, User
+from src.security import get_password_hash
+from src.utils.tenants import get_tenant_id, tenant_cache
+
+ACME = {'X-Tenant-Domain': 'acme'}
+
+
+@asynccontextmanager
+async def scoped_to(session, tenant_id):
+    previous = session.info[TENANT_KEY]
+    session.info[TENANT_KEY] = tenant_id
+    try:
+        yield session
+    finally:
+        session.info[TENANT_KEY] = previous
+
+
+@pytest_asyncio.fixture
+async def acme(session):
+    tenant = Tenant(name='Acme', domain='acme')
+    session.add(tenant)
+    await session.commit()
+
+    async with scoped_to(session, tenant.id):
+        session.add(
+            User(
+                email='admin@acme.com',
+                password=get_password_hash('acme'),
+                is_superuser=True,
+            )
+        )
+        session.add(
+            Client(
+                name='acme client',
+                client_type='company',
+                type_identifier='cnpj',
+                identifier='12345678901234',
+            )
+        )
+        await session.commit()
+
+    return tenant
+
+
+@pytest.fixture
+def acme_token(api_client, acme):
+    response = api_client.post(
+        '/token',
+        data={'username': 'admin@acme.com', 'password': 'acme'},
+        headers=ACME,
+    )
+
+    return response.json()['access_token']
+
+
+@pytest.mark.asyncio
+async def test_queries_only_see_the_session_tenant(session, db_client, acme):
+    identifiers = await session.scalars(select(Client.identifier))
+    assert list(identifiers) == [db_client.identifier]
+
+    async with scoped_to(session, acme.id):
+        names = await session.scalars(select(Client.name))
+        assert list(names) == ['acme client']
+
+    total = await session.scalar(
+        select(func.count())
+        .select_from(Client)
+        .execution_options(all_tenants=True)
+    )
+    assert total == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_updates_only_reach_the_session_tenant(session, db_client, acme):
+    await session.execute(update(Client).values(name='renamed'))
+    await session.commit()
+
+    async with scoped_to(session, acme.id):
+        assert await session.scalar(select(Client.name)) == 'acme client'
+
+
+@pytest.mark.asyncio
+async def test_tenant_lookup_is_cached(session, acme):
+    tenant_cache.clear()
+
+    assert await get_tenant_id(session, 'acme') == acme.id
+    hits = tenant_cache.hits
+    assert await get_tenant_id(session, 'acme') == acme.id
+    assert tenant_cache.hits == hits + 1
+    assert await get_tenant_id(session, 'unknown') is None
+
+
+def test_list_is_scoped_to_header_tenant(
+    api_client, superuser_token, db_client, acme_token
+):
+    response = api_client.get(
+        '/clients/',
+        headers={'Authorization': f'Bearer {acme_token}', **ACME},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [client['name'] for client in response.json()['clients']] == [
+        'acme client'
+    ]
+
+
+def test_same_email_on_two_tenants(api_client, acme_token):
+    response = api_client.post(
+        '/superuser/',
+        json={'email': 'admin@admin.com', 'password': 'secret'},
+        headers={'Authorization': f'Bearer {acme_token}', **ACME},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+
+
+def test_token_rejected_on_another_tenant(api_client, superuser_token, acme):
+    response = api_client.get(
+        '/clients/',
+        headers={'Authorization': f'Bearer {superuser_token}', **ACME},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_unknown_tenant(api_client):
+    response = api_client.post(
+        '/token',
+        data={'username': 'admin@admin.com', 'password': 'admin'},
+        headers={'X-Tenant-Domain': 'unknown'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Tenant not found'}
+
+
+@pytest.mark.parametrize(
+    ('path', 'table'),
+    [
+        ('/tasks/', 'tasks'),
+        ('/tasks/?status=to_do', 'tasks'),
+        ('/tasks/?project_id={project_id}', 'tasks'),
+        ('/tasks/?due_after=2025-01-01', 'tasks'),
+        ('/projects/', 'projects'),
+        ('/clients/', 'clients'),
+        ('/categories/', 'categories'),
+        ('/superuser/', 'users'),
+    ],
+)
+@pytest.mark.asyncio
+async def test_list_queries_use_tenant_indexes(  # noqa: PLR0913, PLR0917
+    session, api_client, superuser_token, db_project, path, table
+):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, *args):
+        if statement.startswith('SELECT') and f'FROM {table}' in statement:
+            statements.append((statement, parameters))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, 'after_cursor_execute', record)
+    try:
+        response = api_client.get(
+            path.format(project_id=db_project.id),
+            headers={'Authorization': f'Bearer {superuser_token}'},
+        )
+    finally:
+        event.remove(engine, 'after_cursor_execute', record)
+
+    assert response.status_code == HTTPStatus.OK
+    statement, parameters = statements[-1]
+    connection = await session.connection()
+    plan = ' '.join(
+        row[-1]
+        for row in await connection.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {statement}', parameters
+        )
+    )
+
+    # Only the tenant's rows are read, through an index leading with
+    # tenant_id. SQLite sorts on a text key of the timestamps (see
+    # src.utils.pagination), so which such index it picks varies.
+    assert plan.startswith(f'SEARCH {table} USING '), plan
+    assert '(tenant_id=?' in plan, plan
+    assert 'SCAN' not in plan, plan